@@ -0,0 +1,204 @@
+"""
+Benchmarks for Exercise 1: Generic Types Basics
+
+Run with: python -m benchmarks.bench_ex01
+
+Compares the list-backed Stack with the array-backed stack make_stack()
+returns for numeric types: memory held per element (tracemalloc), and
+pushing/popping one at a time versus push_many/pop_many. Then measures
+throughput of N producer and N consumer threads sharing a Stack behind an
+external lock against a ConcurrentStack. Finally reports time and peak
+RSS growth for inverting a large id map with swap_dict and the invert_*
+helpers, each run in a fresh process, and compares a list of Pair objects
+with PairColumns.
+"""
+
+import multiprocessing
+import resource
+import threading
+import time
+import tracemalloc
+
+from exercises.ex01_generics_basics import (
+    ConcurrentStack,
+    Pair,
+    PairColumns,
+    Stack,
+    invert_dict,
+    invert_in_place,
+    invert_multi,
+    make_stack,
+    swap_dict,
+)
+
+N = 1_000_000
+ITEMS_PER_THREAD = 100_000
+ID_MAP_SIZE = 2_000_000
+PAIRS = 1_000_000
+
+
+def measure_memory(stack, values):
+    """Bytes held per element, including the element objects themselves."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    stack.push_many(values)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / N
+
+
+def time_one_at_a_time(stack, values):
+    start = time.perf_counter()
+    for value in values:
+        stack.push(value)
+    while stack.pop() is not None:
+        pass
+    return time.perf_counter() - start
+
+
+def time_bulk(stack, values):
+    start = time.perf_counter()
+    stack.push_many(values)
+    stack.pop_many(len(values))
+    return time.perf_counter() - start
+
+
+class LockedStack:
+    """A Stack with every call wrapped in one shared lock."""
+
+    def __init__(self):
+        self._stack = Stack()
+        self._lock = threading.Lock()
+
+    def push(self, item):
+        with self._lock:
+            self._stack.push(item)
+
+    def pop(self, timeout=0):
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                item = self._stack.pop()
+            if item is not None or time.monotonic() >= deadline:
+                return item
+            time.sleep(0.0001)
+
+
+def throughput(stack, pairs):
+    def produce():
+        for i in range(ITEMS_PER_THREAD):
+            stack.push(i + 1)
+
+    received = []
+
+    def consume():
+        count = 0
+        while stack.pop(timeout=0.2) is not None:
+            count += 1
+        received.append(count)
+
+    threads = [threading.Thread(target=produce) for _ in range(pairs)]
+    threads += [threading.Thread(target=consume) for _ in range(pairs)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # Consumers idle for their final timeout before giving up.
+    elapsed = time.perf_counter() - start - 0.2
+    assert sum(received) == pairs * ITEMS_PER_THREAD
+    return pairs * ITEMS_PER_THREAD / elapsed
+
+
+def id_pairs():
+    return ((f"user-{i}", i) for i in range(ID_MAP_SIZE))
+
+
+INVERSIONS = {
+    "swap_dict(d)": (True, swap_dict),
+    "invert_dict(d)": (True, invert_dict),
+    "invert_multi(d)": (True, invert_multi),
+    "invert_in_place(d)": (True, invert_in_place),
+    "invert_dict(stream)": (False, invert_dict),
+}
+
+
+def _peak_rss_kib():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _run_inversion(name, results):
+    needs_dict, invert = INVERSIONS[name]
+    source = dict(id_pairs()) if needs_dict else id_pairs()
+    before = _peak_rss_kib()
+    start = time.perf_counter()
+    result = invert(source)
+    elapsed = time.perf_counter() - start
+    results.put((elapsed, _peak_rss_kib() - before, _peak_rss_kib()))
+    del result
+
+
+def measure_inversion(name):
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_run_inversion, args=(name, results))
+    process.start()
+    outcome = results.get()
+    process.join()
+    return outcome
+
+
+def measure_pairs(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    pairs = build()
+    elapsed = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    swapped = pairs.swap() if isinstance(pairs, PairColumns) else [p.swap() for p in pairs]
+    swap_time = time.perf_counter() - start
+    del swapped
+    return memory / PAIRS, elapsed, swap_time
+
+
+def main():
+    print(f"{N} elements")
+    print(f"{'stack':<18} {'bytes/elem':>10} {'push/pop':>9} {'bulk':>7}")
+    for label, factory, make_values in (
+        ("Stack[int]", Stack, lambda: range(N)),
+        ("make_stack(int)", lambda: make_stack(int), lambda: range(N)),
+        ("Stack[float]", Stack, lambda: (i * 0.5 for i in range(N))),
+        ("make_stack(float)", lambda: make_stack(float), lambda: (i * 0.5 for i in range(N))),
+    ):
+        memory = measure_memory(factory(), make_values())
+        values = list(make_values())
+        one = time_one_at_a_time(factory(), values)
+        bulk = time_bulk(factory(), values)
+        print(f"{label:<18} {memory:>10.1f} {one:>8.3f}s {bulk:>6.3f}s")
+
+    print(f"\nproducer/consumer pairs, {ITEMS_PER_THREAD} items per producer (items/s)")
+    print(f"{'pairs':<6} {'locked Stack':>13} {'ConcurrentStack':>16}")
+    for pairs in (1, 2, 4, 8):
+        locked = throughput(LockedStack(), pairs)
+        concurrent = throughput(ConcurrentStack(), pairs)
+        print(f"{pairs:<6} {locked:>13,.0f} {concurrent:>16,.0f}")
+
+    print(f"\ninverting a {ID_MAP_SIZE}-entry str -> int map")
+    print(f"{'variant':<22} {'time':>7} {'RSS growth':>11} {'peak RSS':>9}")
+    for name in INVERSIONS:
+        elapsed, growth_kib, peak_kib = measure_inversion(name)
+        print(f"{name:<22} {elapsed:>6.2f}s {growth_kib / 1024:>7.0f} MiB {peak_kib / 1024:>5.0f} MiB")
+
+    print(f"\n{PAIRS} (int, float) pairs")
+    print(f"{'storage':<14} {'bytes/pair':>10} {'build':>7} {'swap':>9}")
+    for label, build in (
+        ("list[Pair]", lambda: [Pair(i, i * 0.5) for i in range(PAIRS)]),
+        ("PairColumns", lambda: PairColumns(range(PAIRS), (i * 0.5 for i in range(PAIRS)))),
+    ):
+        per_pair, elapsed, swap_time = measure_pairs(build)
+        print(f"{label:<14} {per_pair:>10.1f} {elapsed:>6.3f}s {swap_time:>8.6f}s")
+
+
+if __name__ == "__main__":
+    main()
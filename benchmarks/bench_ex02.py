@@ -0,0 +1,80 @@
+"""
+Benchmarks for Exercise 2: TypeVar Constraints and Bounds
+
+Run with: python -m benchmarks.bench_ex02
+
+Compares the chunked SortedContainer against the original implementation,
+which appended, re-sorted and then bubble-sorted the whole list on every add.
+The original is O(n^2) per insert, so it is only timed up to LEGACY_LIMIT.
+"""
+
+import random
+import time
+
+from exercises.ex02_typevar_constraints import Score, SortedContainer
+
+SIZES = (1_000, 10_000, 100_000)
+LEGACY_LIMIT = 1_000
+
+
+class LegacySortedContainer:
+    """The pre-index SortedContainer, kept verbatim for comparison."""
+
+    def __init__(self):
+        self._items = []
+
+    def add(self, item):
+        self._items.append(item)
+        self._items.sort(key=lambda x: (x.compare_to(self._items[0]) if self._items else 0))
+        self._sort()
+
+    def _sort(self):
+        n = len(self._items)
+        for i in range(n):
+            for j in range(0, n - i - 1):
+                if self._items[j].compare_to(self._items[j + 1]) > 0:
+                    self._items[j], self._items[j + 1] = self._items[j + 1], self._items[j]
+
+
+def _time(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def bench_size(n):
+    rng = random.Random(n)
+    scores = [Score(rng.randrange(n * 10)) for _ in range(n)]
+
+    def add_one_by_one():
+        sc = SortedContainer()
+        for s in scores:
+            sc.add(s)
+
+    def add_bulk():
+        SortedContainer().add_many(scores)
+
+    def add_legacy():
+        sc = LegacySortedContainer()
+        for s in scores:
+            sc.add(s)
+
+    results = {
+        "add": _time(add_one_by_one),
+        "add_many": _time(add_bulk),
+    }
+    if n <= LEGACY_LIMIT:
+        results["legacy add"] = _time(add_legacy)
+    return results
+
+
+def main():
+    print(f"{'items':>8}  {'add':>10}  {'add_many':>10}  {'legacy add':>12}")
+    for n in SIZES:
+        r = bench_size(n)
+        legacy = f"{r['legacy add']:>11.3f}s" if "legacy add" in r else f"{'skipped':>12}"
+        print(f"{n:>8}  {r['add']:>9.3f}s  {r['add_many']:>9.3f}s  {legacy}")
+
+
+if __name__ == "__main__":
+    main()
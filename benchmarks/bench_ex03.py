@@ -0,0 +1,161 @@
+"""
+Benchmarks for Exercise 3: Protocols
+
+Run with: python -m benchmarks.bench_ex03
+
+Compares isinstance() against a runtime_checkable Protocol with the cached
+conforms_to() check, for classes that do and do not match, and times
+maybe_close() over a mixed batch of objects. Then compares closing
+handles with a blocking close() one by one against close_all(), and
+growing a file by rewriting it against appending to the chunk list.
+Finally renders shuffled and grouped frames of shapes with render_all()
+and render_batch(), checking that both give the same text.
+"""
+
+import io
+import random
+import time
+from typing import Protocol, runtime_checkable
+
+from exercises.ex03_protocols import (
+    Closeable,
+    Circle,
+    Connection,
+    FileHandle,
+    InMemoryFile,
+    Product,
+    Rectangle,
+    SimpleValue,
+    close_all,
+    conforms_to,
+    maybe_close,
+    render_all,
+    render_batch,
+)
+
+N = 200_000
+HANDLES = 1_000
+CLOSE_LATENCY = 0.001
+APPENDS = 10_000
+SHAPES = 1_000_000
+
+
+@runtime_checkable
+class HasName(Protocol):
+    @property
+    def name(self) -> str: ...
+
+
+@runtime_checkable
+class HasCreate(Protocol):
+    def create(self) -> object: ...
+
+
+class Factory:
+    @classmethod
+    def create(cls):
+        return cls()
+
+
+class BlockingHandle:
+    def close(self) -> None:
+        time.sleep(CLOSE_LATENCY)
+
+
+class StringFile:
+    """InMemoryFile as it was: one str, replaced on every write."""
+
+    def __init__(self):
+        self._content = ""
+
+    def read(self):
+        return self._content
+
+    def write(self, data):
+        self._content = data
+
+
+def grow_by_rewrite(chunk, reads):
+    f = StringFile()
+    for i in range(APPENDS):
+        f.write(f.read() + chunk)
+        if i % reads == 0:
+            f.read()[i:i + 10]
+    return len(f.read())
+
+
+def grow_by_append(chunk, reads):
+    f = InMemoryFile()
+    for i in range(APPENDS):
+        f.append(chunk)
+        if i % reads == 0:
+            f.seek(i)
+            f.read(10)
+    return len(f)
+
+
+def _time(check, obj, protocol):
+    start = time.perf_counter()
+    for _ in range(N):
+        check(obj, protocol)
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{N} checks per case")
+    print(f"{'case':<26} {'isinstance':>11} {'conforms_to':>12} {'speedup':>8}")
+    for label, obj, protocol in (
+        ("FileHandle / Closeable", FileHandle("/tmp/x"), Closeable),
+        ("SimpleValue / Closeable", SimpleValue(1), Closeable),
+        ("Product / HasName", Product("widget", 1.0), HasName),
+        ("Factory / HasCreate", Factory(), HasCreate),
+    ):
+        assert isinstance(obj, protocol) == conforms_to(obj, protocol)
+        plain = _time(isinstance, obj, protocol)
+        cached = _time(conforms_to, obj, protocol)
+        print(f"{label:<26} {plain:>10.3f}s {cached:>11.3f}s {plain / cached:>7.1f}x")
+
+    objs = [(FileHandle("/tmp/x"), Connection("db"), SimpleValue(1))[i % 3] for i in range(N)]
+    start = time.perf_counter()
+    closed = sum(maybe_close(obj) for obj in objs)
+    print(f"maybe_close over {N} objects: {time.perf_counter() - start:.3f}s ({closed} closed)")
+
+    print(f"\nclosing {HANDLES} handles, {CLOSE_LATENCY * 1000:.0f}ms each")
+    handles = [BlockingHandle() for _ in range(HANDLES)]
+    start = time.perf_counter()
+    for handle in handles:
+        maybe_close(handle)
+    print(f"{'sequential':<18} {time.perf_counter() - start:.3f}s")
+    for workers in (8, 32):
+        report = close_all(handles, max_workers=workers)
+        print(f"{f'close_all({workers})':<18} {report.elapsed:.3f}s")
+
+    print(f"\n{APPENDS} appends of 100 chars, with an offset read every 100")
+    for label, grow in (("write(read() + chunk)", grow_by_rewrite), ("append(chunk)", grow_by_append)):
+        start = time.perf_counter()
+        size = grow("x" * 100, 100)
+        print(f"{label:<22} {time.perf_counter() - start:.3f}s ({size} chars)")
+
+    rng = random.Random(0)
+    shapes = [
+        Circle(rng.randrange(100)) if rng.random() < 0.5 else Rectangle(rng.randrange(100), rng.randrange(100))
+        for _ in range(SHAPES)
+    ]
+    # Both sides build the same string, in the same order, and it is checked.
+    # Shuffled frames alternate classes every couple of shapes; grouped frames
+    # draw all shapes of one class together, as a layer-by-layer renderer does.
+    frames = (("shuffled", shapes), ("grouped", sorted(shapes, key=lambda s: type(s).__name__)))
+    for name, frame_shapes in frames:
+        print(f"\nrendering {SHAPES} {name} shapes into one string")
+        start = time.perf_counter()
+        expected = "".join([line + "\n" for line in render_all(frame_shapes)])
+        print(f"{'render_all + join':<22} {time.perf_counter() - start:.3f}s ({len(expected)} chars)")
+        start = time.perf_counter()
+        out = io.StringIO()
+        render_batch(frame_shapes, out)
+        frame = out.getvalue()
+        print(f"{'render_batch':<22} {time.perf_counter() - start:.3f}s ({len(frame)} chars)")
+        assert frame == expected
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmarks for Exercise 4: Callable and Overload
+
+Run with: python -m benchmarks.bench_ex04
+
+Runs map -> filter -> map over N records with the eager map_list and
+filter_list, which build a list per stage, and with a fused Pipeline,
+both collected into a list and consumed in chunks. Reports time and
+peak traced memory (tracemalloc) for each. Then times a CPU-bound
+map_list serially against a process pool, and a sleeping (I/O-like)
+function serially against a thread pool, for several worker counts.
+Finally compares a STAGES-deep chain of nested closures (the original
+compose) with the flattened Composed, called per item and via map_many.
+"""
+
+import time
+import tracemalloc
+
+from exercises.ex04_callable_and_overload import Pipeline, compose, filter_list, map_list
+
+N = 1_000_000
+CHUNK = 10_000
+CPU_ITEMS = 2_000
+IO_ITEMS = 200
+IO_LATENCY = 0.002
+STAGES = 50
+COMPOSE_ITEMS = 100_000
+
+
+def parse(record):
+    return record * 3
+
+
+def keep(value):
+    return value % 2 == 0
+
+
+def finish(value):
+    return value + 1
+
+
+def eager(records):
+    return len(map_list(finish, filter_list(keep, map_list(parse, records))))
+
+
+def collected(records):
+    return len(Pipeline(records).map(parse).filter(keep).map(finish).collect())
+
+
+def chunked(records):
+    count = 0
+    for chunk in Pipeline(records).map(parse).filter(keep).map(finish).chunks(CHUNK):
+        count += len(chunk)
+    return count
+
+
+def digest(seed):
+    """A CPU-bound transform: iterate a small hash for a while."""
+    value = seed
+    for _ in range(2_000):
+        value = (value * 1_103_515_245 + 12_345) % 2**31
+    return value
+
+
+def fetch(seed):
+    time.sleep(IO_LATENCY)
+    return seed
+
+
+def timed(func, items, **options):
+    start = time.perf_counter()
+    map_list(func, items, **options)
+    return time.perf_counter() - start
+
+
+def nested_compose(f, g):
+    """The original compose: one closure, and one extra frame, per level."""
+    def composed(x):
+        return f(g(x))
+    return composed
+
+
+def add1(x):
+    return x + 1
+
+
+def build_chain(combine):
+    chain = add1
+    for _ in range(STAGES - 1):
+        chain = combine(add1, chain)
+    return chain
+
+
+def time_calls(run):
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    assert result[-1] == COMPOSE_ITEMS - 1 + STAGES
+    return elapsed
+
+
+def measure(run, records):
+    start = time.perf_counter()
+    run(records)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    count = run(records)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main():
+    records = range(N)
+    print(f"map -> filter -> map over {N} records")
+    print(f"{'variant':<30} {'time':>7} {'peak memory':>12}")
+    for name, run in (
+        ("map_list/filter_list", eager),
+        ("Pipeline.collect()", collected),
+        (f"Pipeline.chunks({CHUNK})", chunked),
+    ):
+        count, elapsed, peak = measure(run, records)
+        assert count == N // 2
+        print(f"{name:<30} {elapsed:>6.3f}s {peak / 2**20:>8.1f} MiB")
+
+    cpu_items = list(range(CPU_ITEMS))
+    io_items = list(range(IO_ITEMS))
+    print(f"\nmap_list over {CPU_ITEMS} CPU-bound and {IO_ITEMS} sleeping items")
+    print(f"{'workers':<8} {'CPU (processes)':>16} {'I/O (threads)':>14}")
+    print(f"{'serial':<8} {timed(digest, cpu_items):>15.3f}s {timed(fetch, io_items):>13.3f}s")
+    for workers in (2, 4, 8):
+        cpu = timed(digest, cpu_items, workers=workers, mode="process")
+        io = timed(fetch, io_items, workers=workers, chunk_size=1, mode="thread")
+        print(f"{workers:<8} {cpu:>15.3f}s {io:>13.3f}s")
+
+    nested = build_chain(nested_compose)
+    flat = build_chain(compose)
+    items = list(range(COMPOSE_ITEMS))
+    print(f"\n{STAGES}-stage compose chain over {COMPOSE_ITEMS} items")
+    for name, run in (
+        ("nested closures", lambda: [nested(x) for x in items]),
+        ("Composed, per item", lambda: [flat(x) for x in items]),
+        ("Composed.map_many", lambda: flat.map_many(items)),
+    ):
+        print(f"{name:<30} {time_calls(run):>6.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmarks for Exercise 5: ParamSpec and Concatenate
+
+Run with: python -m benchmarks.bench_ex05
+
+Measures the per-call overhead of with_connection backed by a
+ConnectionPool against the original connect-per-call behaviour. The
+stand-in connection sleeps for CONNECT_LATENCY seconds when opened.
+
+Then times the per-call overhead of retry() and RetryPolicy around a call
+that succeeds first time, and simulates an outage: OUTAGE_CALLS calls to a dependency that always
+fails, counting how many requests reach it with the plain retry(5)
+against a RetryPolicy sharing a 10% RetryBudget. Backoff waits are
+recorded by a fake clock rather than slept.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+import time
+
+from exercises.ex05_paramspec import (
+    Connection,
+    ConnectionPool,
+    RetryBudget,
+    RetryPolicy,
+    retry,
+    with_connection,
+)
+
+CONNECT_LATENCY = 0.002
+CALLS = 500
+THREADS = 8
+OUTAGE_CALLS = 1_000
+OVERHEAD_CALLS = 200_000
+
+
+class SlowConnection(Connection):
+    def __init__(self, url: str):
+        time.sleep(CONNECT_LATENCY)
+        super().__init__(url)
+
+
+def connect_per_call(func):
+    """The original with_connection: a fresh connection for every call."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        conn = SlowConnection("fake://database")
+        return func(conn, *args, **kwargs)
+    return wrapper
+
+
+def run(query, threads):
+    start = time.perf_counter()
+    if threads == 1:
+        for i in range(CALLS):
+            query(i)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(query, range(CALLS)))
+    return (time.perf_counter() - start) / CALLS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def identity(x):
+    return x
+
+
+def outage(decorate):
+    requests = [0]
+
+    def down():
+        requests[0] += 1
+        raise ConnectionError("dependency unavailable")
+
+    call = decorate(down)
+    for _ in range(OUTAGE_CALLS):
+        try:
+            call()
+        except ConnectionError:
+            pass
+    return requests[0]
+
+
+def main():
+    def body(conn, n):
+        return conn.execute(f"SELECT {n}")
+
+    print(f"connect latency {CONNECT_LATENCY * 1e3:.1f} ms, {CALLS} calls")
+    print(f"{'mode':<22} {'threads':>7} {'per call':>10}")
+    for threads in (1, THREADS):
+        legacy = connect_per_call(body)
+        pool = ConnectionPool(lambda: SlowConnection("fake://database"), max_size=THREADS)
+        pooled = with_connection(pool=pool)(body)
+        print(f"{'connect per call':<22} {threads:>7} {run(legacy, threads) * 1e6:>8.1f}us")
+        print(f"{'pooled':<22} {threads:>7} {run(pooled, threads) * 1e6:>8.1f}us")
+        stats = pool.stats()
+        print(f"  pool: size={stats.size} waits={stats.waits} wait_time={stats.wait_time * 1e3:.1f}ms")
+
+    print(f"\n{OVERHEAD_CALLS} calls that succeed first time")
+    wrappers = (
+        ("undecorated", identity),
+        ("retry(3)", retry(3)(identity)),
+        ("RetryPolicy(3)", RetryPolicy(3)(identity)),
+        ("RetryPolicy(3, deadline=1)", RetryPolicy(3, deadline=1.0)(identity)),
+    )
+    for label, func in wrappers:
+        start = time.perf_counter()
+        for i in range(OVERHEAD_CALLS):
+            func(i)
+        print(f"{label:<28} {time.perf_counter() - start:.3f}s")
+
+    print(f"\noutage: {OUTAGE_CALLS} calls, dependency always failing")
+    print(f"{'retry':<28} {'requests':>9} {'amplification':>14}")
+    plain = outage(retry(5))
+    print(f"{'retry(5)':<28} {plain:>9} {plain / OUTAGE_CALLS:>13.2f}x")
+    clock = FakeClock()
+    budget = RetryBudget(ratio=0.1, clock=clock)
+    policy = RetryPolicy(5, budget=budget, clock=clock, sleep=clock.sleep)
+    guarded = outage(retry(policy=policy))
+    print(f"{'RetryPolicy + 10% budget':<28} {guarded:>9} {guarded / OUTAGE_CALLS:>13.2f}x")
+    stats = policy.stats()
+    print(f"  retries={stats.retries} give_ups={stats.give_ups} "
+          f"budget_denials={stats.budget_denials} sleep_time={stats.sleep_time:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
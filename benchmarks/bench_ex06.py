@@ -0,0 +1,96 @@
+"""
+Benchmarks for Exercise 6: TypedDict and Type Guards
+
+Run with: python -m benchmarks.bench_ex06
+
+Compares the compiled TypedDict validators behind is_point2d,
+is_user_profile and is_image_message with straightforward hand-written
+guards, over a mix of valid and invalid dicts.
+"""
+
+import random
+import time
+
+from exercises.ex06_typeddict_and_guards import (
+    is_image_message,
+    is_point2d,
+    is_user_profile,
+)
+
+N = 1_000_000
+
+
+def hand_is_point2d(value):
+    return (
+        isinstance(value, dict)
+        and "x" in value
+        and "y" in value
+        and isinstance(value["x"], int)
+        and not isinstance(value["x"], bool)
+        and isinstance(value["y"], int)
+        and not isinstance(value["y"], bool)
+    )
+
+
+def hand_is_user_profile(value):
+    if not isinstance(value, dict):
+        return False
+    if not isinstance(value.get("id"), int) or isinstance(value.get("id"), bool):
+        return False
+    if not isinstance(value.get("name"), str):
+        return False
+    if "email" in value and not isinstance(value["email"], str):
+        return False
+    if "age" in value and (not isinstance(value["age"], int) or isinstance(value["age"], bool)):
+        return False
+    return True
+
+
+def hand_is_image_message(value):
+    return (
+        isinstance(value, dict)
+        and value.get("type") == "image"
+        and isinstance(value.get("url"), str)
+        and ("alt_text" not in value or isinstance(value["alt_text"], str))
+    )
+
+
+def make_data(rng):
+    points = [
+        {"x": rng.randrange(100), "y": rng.randrange(100)} if rng.random() < 0.9 else {"x": "1", "y": 2}
+        for _ in range(N)
+    ]
+    users = [
+        {"id": i, "name": "user", "email": "u@example.com"} if rng.random() < 0.9 else {"id": str(i), "name": "u"}
+        for i in range(N)
+    ]
+    messages = [
+        {"type": "image", "url": "http://x", "alt_text": "cat"} if rng.random() < 0.5 else {"type": "text", "content": "hi"}
+        for _ in range(N)
+    ]
+    return points, users, messages
+
+
+def _time(guard, data):
+    start = time.perf_counter()
+    count = sum(1 for item in data if guard(item))
+    return time.perf_counter() - start, count
+
+
+def main():
+    points, users, messages = make_data(random.Random(0))
+    print(f"{N} dicts per guard")
+    print(f"{'guard':<18} {'hand-written':>13} {'compiled':>10}")
+    for name, hand, compiled, data in (
+        ("is_point2d", hand_is_point2d, is_point2d, points),
+        ("is_user_profile", hand_is_user_profile, is_user_profile, users),
+        ("is_image_message", hand_is_image_message, is_image_message, messages),
+    ):
+        hand_time, hand_count = _time(hand, data)
+        compiled_time, compiled_count = _time(compiled, data)
+        assert hand_count == compiled_count
+        print(f"{name:<18} {hand_time:>12.3f}s {compiled_time:>9.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmarks for Exercise 8: NewType, TypeAlias, Annotated, and cast
+
+Run with: python -m benchmarks.bench_ex08
+
+Compares calculate_area called per polygon against the packed batch API,
+with and without NumPy.
+"""
+
+import random
+import time
+
+from exercises.ex08_newtypes_aliases_annotated import PackedPolygons, calculate_area, np
+
+POLYGONS = 100_000
+VERTICES = 20
+
+
+def _time(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    rng = random.Random(0)
+    polygons = [
+        [(rng.uniform(-1e3, 1e3), rng.uniform(-1e3, 1e3)) for _ in range(VERTICES)]
+        for _ in range(POLYGONS)
+    ]
+    print(f"{POLYGONS} polygons x {VERTICES} vertices")
+
+    elapsed, _ = _time(lambda: [calculate_area(p) for p in polygons])
+    print(f"{'calculate_area loop':<24} {elapsed:>8.3f}s")
+
+    elapsed, packed = _time(lambda: PackedPolygons.from_polygons(polygons))
+    print(f"{'pack':<24} {elapsed:>8.3f}s")
+
+    elapsed, _ = _time(lambda: packed.areas(use_numpy=False))
+    print(f"{'areas (pure Python)':<24} {elapsed:>8.3f}s")
+
+    if np is not None:
+        elapsed, _ = _time(lambda: packed.areas(use_numpy=True))
+        print(f"{'areas (NumPy)':<24} {elapsed:>8.3f}s")
+    else:
+        print(f"{'areas (NumPy)':<24} {'skipped':>9}")
+
+
+if __name__ == "__main__":
+    main()
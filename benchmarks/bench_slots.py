@@ -0,0 +1,64 @@
+"""
+Benchmarks for Exercises 1, 3 and 7: __slots__ value classes
+
+Run with: python -m benchmarks.bench_slots
+
+The small value classes in these exercises declare __slots__, so their
+instances carry no per-instance __dict__. This measures bytes per instance
+with tracemalloc, against a subclass of each that adds __dict__ back, the
+way the classes were before.
+"""
+
+import gc
+import tracemalloc
+
+from exercises import ex01_generics_basics as ex01
+from exercises import ex03_protocols as ex03
+from exercises import ex07_classvar_final_self as ex07
+
+N = 100_000
+
+CASES = [
+    ("ex01.Box", ex01.Box, (1,)),
+    ("ex01.Pair", ex01.Pair, ("a", 1)),
+    ("ex03.Circle", ex03.Circle, (1.5,)),
+    ("ex03.Rectangle", ex03.Rectangle, (2.0, 3.0)),
+    ("ex03.Point", ex03.Point, (1.0, 2.0)),
+    ("ex03.User", ex03.User, ("alice", "alice@example.com")),
+    ("ex03.Product", ex03.Product, ("widget", 9.99)),
+    ("ex07.Shape", ex07.Shape, (1.0, 2.0)),
+    ("ex07.Circle", ex07.Circle, (1.0, 2.0, 3.0)),
+    ("ex07.Rectangle", ex07.Rectangle, (1.0, 2.0, 3.0, 4.0)),
+]
+
+
+def with_dict(cls):
+    """A subclass with no __slots__ of its own, so instances get a __dict__."""
+    return type(cls.__name__, (cls,), {})
+
+
+def bytes_per_instance(cls, args):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [cls(*args) for _ in range(N)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list itself holds one pointer per instance.
+    per_instance = (after - before) / N - 8
+    del instances
+    return per_instance
+
+
+def main():
+    print(f"bytes per instance, {N} instances each (argument objects are shared)")
+    print(f"{'class':<16} {'__dict__':>9} {'__slots__':>10} {'saved':>7}")
+    for name, cls, args in CASES:
+        assert not hasattr(cls(*args), "__dict__")
+        slotted = bytes_per_instance(cls, args)
+        plain = bytes_per_instance(with_dict(cls), args)
+        print(f"{name:<16} {plain:>9.0f} {slotted:>10.0f} {1 - slotted / plain:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
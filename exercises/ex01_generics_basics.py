@@ -18,14 +18,19 @@ Run tests with: pytest tests/test_ex01.py -v
 Run type checker with: mypy exercises/ex01_generics_basics.py
 """
 
-from typing import TypeVar, Generic
+from typing import Any, Callable, Iterable, Iterator, Literal, Mapping, MutableSequence, NamedTuple, TypeVar, Generic, cast
+from array import array
+from collections import deque
+from itertools import islice
+import threading
+import time
 
 # =============================================================================
 # PART 1: Using TypeVar for Generic Functions
 # =============================================================================
 
-# TODO: Define a TypeVar named 'T' that can be any type
-# Hint: T = TypeVar('T')
+T = TypeVar('T')
+U = TypeVar('U')
 
 
 def first_element(items):
@@ -68,7 +73,8 @@ def identity(value):
 # PART 2: Generic Functions with Multiple Type Variables
 # =============================================================================
 
-# TODO: Define additional TypeVars K and V for key and value types
+K = TypeVar('K')
+V = TypeVar('V')
 
 
 def swap_dict(d):
@@ -85,6 +91,118 @@ def swap_dict(d):
     return {v: k for k, v in d.items()}
 
 
+# -----------------------------------------------------------------------------
+# Inverting large mappings
+# -----------------------------------------------------------------------------
+
+# swap_dict() needs the whole source dict in memory next to the result, and
+# when two keys share a value only the last survives, silently. The helpers
+# below can take a stream of (key, value) pairs instead of a dict, and they
+# report how many entries collided.
+
+
+class Inversion(NamedTuple, Generic[K, V]):
+    inverse: dict[V, K]
+    collisions: int  # source entries whose value was already taken
+
+
+def invert_items(pairs: Iterable[tuple[K, V]]) -> Iterator[tuple[V, K]]:
+    """Lazily turn (key, value) pairs into (value, key) pairs."""
+    for key, value in pairs:
+        yield value, key
+
+
+def invert_dict(
+    source: Mapping[K, V] | Iterable[tuple[K, V]], *, keep: Literal["first", "last"] = "last"
+) -> Inversion[K, V]:
+    """
+    Invert a mapping, or a stream of (key, value) pairs, into a new dict.
+
+    When several keys share a value, keep="last" (what swap_dict does) or
+    keep="first" decides which key is kept; either way the others are
+    counted in `collisions`. A stream is consumed one pair at a time, so the
+    source never has to be a dict.
+
+    Examples:
+        invert_dict({"a": 1, "b": 2, "c": 1}) -> Inversion({1: "c", 2: "b"}, 1)
+        invert_dict(rows, keep="first")
+    """
+    if keep not in ("first", "last"):
+        raise ValueError("keep must be 'first' or 'last'")
+    if isinstance(source, Mapping):
+        if keep == "last":
+            inverse = dict(zip(source.values(), source.keys()))
+            return Inversion(inverse, len(source) - len(inverse))
+        pairs: Iterable[tuple[K, V]] = source.items()
+    else:
+        pairs = source
+    inverse = {}
+    count = 0
+    if keep == "last":
+        for key, value in pairs:
+            inverse[value] = key
+            count += 1
+    else:
+        setdefault = inverse.setdefault
+        for key, value in pairs:
+            setdefault(value, key)
+            count += 1
+    return Inversion(inverse, count - len(inverse))
+
+
+def invert_multi(source: Mapping[K, V] | Iterable[tuple[K, V]]) -> dict[V, list[K]]:
+    """
+    Invert into value -> list of every key that had it, in source order.
+
+    Example:
+        invert_multi({"a": 1, "b": 2, "c": 1}) -> {1: ["a", "c"], 2: ["b"]}
+    """
+    pairs = source.items() if isinstance(source, Mapping) else source
+    inverse: dict[V, list[K]] = {}
+    for key, value in pairs:
+        keys = inverse.get(value)
+        if keys is None:
+            inverse[value] = [key]
+        else:
+            keys.append(key)
+    return inverse
+
+
+def invert_in_place(d: dict[Any, Any], *, keep: Literal["first", "last"] = "last") -> int:
+    """
+    Invert d in place and return the number of collisions.
+
+    This only works when no value is also a key; in that case ValueError
+    is raised and d is left untouched. The entries are drained with
+    popitem() into a new dict, which is then copied back, so no list of
+    keys is built. Peak memory is still about the same as for
+    invert_dict(), since d keeps its table until the copy back; use this
+    when other code holds d.
+
+    Example:
+        ids = {"alice": 1, "bob": 2}
+        invert_in_place(ids) -> 0, and ids == {1: "alice", 2: "bob"}
+    """
+    if keep not in ("first", "last"):
+        raise ValueError("keep must be 'first' or 'last'")
+    if any(value in d for value in d.values()):
+        raise ValueError("cannot invert in place: some values are also keys")
+    # popitem() drains from the end, so the first key popped for a value is
+    # the last one in d.
+    inverse: dict[Any, Any] = {}
+    collisions = 0
+    popitem = d.popitem
+    while d:
+        key, value = popitem()
+        if value in inverse:
+            collisions += 1
+            if keep == "last":
+                continue
+        inverse[value] = key
+    d.update(reversed(inverse.items()))
+    return collisions
+
+
 def make_pair(first, second):
     """
     Create a tuple from two values of potentially different types.
@@ -122,6 +240,8 @@ class Box:
     2. Add proper type hints to __init__, get, and set methods
     """
 
+    __slots__ = ("_value",)
+
     def __init__(self, value):
         self._value = value
 
@@ -150,6 +270,8 @@ class Pair:
     3. Note: swap() should return a NEW Pair with swapped types
     """
 
+    __slots__ = ("first", "second")
+
     def __init__(self, first, second):
         self.first = first
         self.second = second
@@ -159,12 +281,200 @@ class Pair:
         return Pair(self.second, self.first)
 
 
+# -----------------------------------------------------------------------------
+# Columnar pairs
+# -----------------------------------------------------------------------------
+
+# Millions of Pair objects cost an object (and two references) per pair.
+# PairColumns keeps all the firsts in one column and all the seconds in
+# another; a column of only ints or only floats is an array.array, so its
+# values are not separate objects either.
+
+_COLUMN_TYPECODES: dict[type, str] = {int: "q", float: "d"}
+# Values are taken this many at a time while a column is built, so the
+# input never has to be held in full alongside the column.
+_COLUMN_CHUNK = 4096
+
+
+def _new_column(sample: Any) -> MutableSequence[Any]:
+    """An empty column: an array if sample is an int or a float, else a list."""
+    typecode = _COLUMN_TYPECODES.get(type(sample))
+    if typecode is None:
+        return []
+    return array(typecode)
+
+
+def _extend_column(column: MutableSequence[Any], values: list[Any]) -> MutableSequence[Any]:
+    """Add values to column, switching it to a list if they do not fit its array."""
+    if isinstance(column, array):
+        if set(map(type, values)) == {int if column.typecode == "q" else float}:
+            try:
+                column.fromlist(values)  # adds nothing if any value overflows
+                return column
+            except OverflowError:
+                pass
+        # The column is no longer homogeneous: fall back to a list.
+        column = column.tolist()
+    column.extend(values)
+    return column
+
+
+def _column(values: Iterable[Any]) -> MutableSequence[Any]:
+    """Store values in an array when they are all ints or all floats."""
+    iterator = iter(values)
+    column: MutableSequence[Any] | None = None
+    while chunk := list(islice(iterator, _COLUMN_CHUNK)):
+        if column is None:
+            column = _new_column(chunk[0])
+        column = _extend_column(column, chunk)
+        if not isinstance(column, array):
+            column.extend(iterator)
+    return [] if column is None else column
+
+
+class _Columns:
+    __slots__ = ("firsts", "seconds")
+
+    def __init__(self, firsts: MutableSequence[Any], seconds: MutableSequence[Any]) -> None:
+        self.firsts = firsts
+        self.seconds = seconds
+
+
+class PairView:
+    """
+    Row `index` of a PairColumns, read through first and second like a Pair.
+
+    It is not a Pair: its values live in the columns, so they cannot be set.
+    swap() returns a new Pair.
+    """
+
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns: "PairColumns[Any, Any]", index: int) -> None:
+        self._columns = columns
+        self._index = index
+
+    @property
+    def first(self) -> Any:
+        return self._columns.firsts[self._index]
+
+    @property
+    def second(self) -> Any:
+        return self._columns.seconds[self._index]
+
+    def swap(self) -> Pair:
+        """Return a new Pair with first and second swapped."""
+        return Pair(self.second, self.first)
+
+    def __repr__(self) -> str:
+        return f"PairView({self.first!r}, {self.second!r})"
+
+
+class PairColumns(Generic[T, U]):
+    """
+    Pairs stored as two parallel columns.
+
+    Examples:
+        pairs = PairColumns([1, 2, 3], ["a", "b", "c"])  # ints stored in an array
+        pairs[0].first -> 1
+        pairs.swap()[0].first -> "a"  (no copy)
+        [(p.first, p.second) for p in pairs] -> [(1, "a"), (2, "b"), (3, "c")]
+    """
+
+    __slots__ = ("_data", "_swapped")
+
+    def __init__(self, firsts: Iterable[T] = (), seconds: Iterable[U] = ()) -> None:
+        first_column = _column(firsts)
+        second_column = _column(seconds)
+        if len(first_column) != len(second_column):
+            raise ValueError("firsts and seconds must have the same length")
+        self._data = _Columns(first_column, second_column)
+        self._swapped = False
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[tuple[T, U]]) -> "PairColumns[T, U]":
+        """Build from (first, second) tuples, streaming them into the columns."""
+        iterator = iter(pairs)
+        firsts: MutableSequence[Any] = []
+        seconds: MutableSequence[Any] = []
+        while chunk := list(islice(iterator, _COLUMN_CHUNK)):
+            chunk_firsts = [first for first, _ in chunk]
+            chunk_seconds = [second for _, second in chunk]
+            if not firsts:
+                firsts = _new_column(chunk_firsts[0])
+                seconds = _new_column(chunk_seconds[0])
+            firsts = _extend_column(firsts, chunk_firsts)
+            seconds = _extend_column(seconds, chunk_seconds)
+        return cls._from_data(_Columns(firsts, seconds), False)
+
+    @classmethod
+    def _from_data(cls, data: _Columns, swapped: bool) -> "PairColumns[Any, Any]":
+        """Wrap existing columns without copying them."""
+        pairs_columns = cls.__new__(cls)
+        pairs_columns._data = data
+        pairs_columns._swapped = swapped
+        return pairs_columns
+
+    @property
+    def firsts(self) -> MutableSequence[T]:
+        """The live first column (an array.array when typed); do not resize it."""
+        return self._data.seconds if self._swapped else self._data.firsts
+
+    @property
+    def seconds(self) -> MutableSequence[U]:
+        """The live second column (an array.array when typed); do not resize it."""
+        return self._data.firsts if self._swapped else self._data.seconds
+
+    def __len__(self) -> int:
+        return len(self._data.firsts)
+
+    def __getitem__(self, index: int) -> PairView:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("pair index out of range")
+        return PairView(self, index)
+
+    def __iter__(self) -> Iterator[PairView]:
+        for index in range(len(self)):
+            yield PairView(self, index)
+
+    def items(self) -> Iterator[tuple[T, U]]:
+        """Iterate (first, second) tuples without creating views."""
+        return zip(self.firsts, self.seconds)
+
+    def append(self, first: T, second: U) -> None:
+        data = self._data
+        if self._swapped:
+            first, second = second, first  # type: ignore[assignment]
+        data.firsts = self._append(data.firsts, first)
+        data.seconds = self._append(data.seconds, second)
+
+    @staticmethod
+    def _append(column: MutableSequence[Any], value: Any) -> MutableSequence[Any]:
+        if isinstance(column, array):
+            if type(value) is (int if column.typecode == "q" else float):
+                try:
+                    column.append(value)
+                    return column
+                except OverflowError:
+                    pass
+            # The column is no longer homogeneous: fall back to a list.
+            column = column.tolist()
+        column.append(value)
+        return column
+
+    def swap(self) -> "PairColumns[U, T]":
+        """Return a view with the columns exchanged; O(1), shares the storage."""
+        return type(self)._from_data(self._data, not self._swapped)
+
+
 # =============================================================================
 # PART 4: Challenge - Generic Stack
 # =============================================================================
 
 
-class Stack:
+class Stack(Generic[T]):
     """
     A generic stack (LIFO) data structure.
 
@@ -176,28 +486,271 @@ class Stack:
         s.peek() -> 1
         s.is_empty() -> False
 
-    TODO:
-    1. Make this class generic
-    2. Add proper type hints
-    3. push() should only accept items of the stack's type
-    4. pop() and peek() should return the stack's type or None if empty
+    For int and float elements, make_stack() returns an ArrayStack that
+    stores them unboxed.
     """
 
-    def __init__(self):
-        self._items = []
+    def __init__(self) -> None:
+        self._items: MutableSequence[T] = []
 
-    def push(self, item):
+    def push(self, item: T) -> None:
         self._items.append(item)
 
-    def pop(self):
+    def push_many(self, items: Iterable[T]) -> None:
+        """Push every item in order, so the last one ends up on top."""
+        self._items.extend(items)
+
+    def pop(self) -> T | None:
         if not self._items:
             return None
         return self._items.pop()
 
-    def peek(self):
+    def pop_many(self, n: int) -> list[T]:
+        """Pop up to n items, returned in pop order (top of the stack first)."""
+        if n <= 0:
+            return []
+        taken = self._items[-n:]
+        del self._items[-n:]
+        return list(reversed(taken))
+
+    def peek(self) -> T | None:
         if not self._items:
             return None
         return self._items[-1]
 
-    def is_empty(self):
+    def is_empty(self) -> bool:
         return len(self._items) == 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class ArrayStack(Stack[T]):
+    """
+    A Stack stored in an array.array, for int ("q") or float ("d") elements.
+
+    Each element takes 8 bytes in the array instead of a pointer to a
+    separate object. The stack supports the buffer protocol, so
+    numpy.asarray(stack) or memoryview(stack) reads the elements without
+    copying. While such a view is alive the stack cannot grow or shrink:
+    push and pop raise BufferError.
+
+    Elements of an "q" stack must fit in a signed 64-bit integer. Pushing
+    a larger int raises OverflowError and leaves the stack unchanged; use
+    a plain Stack for unbounded ints.
+    """
+
+    def __init__(self, typecode: str) -> None:
+        self._items = cast(MutableSequence[T], array(typecode))
+
+    @property
+    def typecode(self) -> str:
+        return cast(array, self._items).typecode
+
+    def push_many(self, items: Iterable[T]) -> None:
+        """Push every item in order; if any item is rejected, push none of them."""
+        items_array = cast(array, self._items)
+        if isinstance(items, list):
+            items_array.fromlist(items)
+            return
+        size = len(items_array)
+        try:
+            items_array.extend(items)
+        except BaseException:
+            if len(items_array) > size:
+                del items_array[size:]
+            raise
+
+    def pop_many(self, n: int) -> list[T]:
+        if n <= 0:
+            return []
+        items_array = cast(array, self._items)
+        taken = items_array[-n:].tolist()
+        del items_array[-n:]
+        taken.reverse()
+        return taken
+
+    def __buffer__(self, flags: int) -> memoryview:
+        return memoryview(cast(array, self._items))
+
+    def view(self) -> memoryview:
+        """Return a zero-copy view of the elements, bottom of the stack first."""
+        return memoryview(self)
+
+
+_ARRAY_TYPECODES: dict[type, str] = {int: "q", float: "d"}
+
+
+def make_stack(item_type: type[T]) -> Stack[T]:
+    """
+    Create an empty Stack for items of item_type.
+
+    int and float get an ArrayStack; every other type gets a plain Stack.
+    An int ArrayStack holds values in [-2**63, 2**63) only; pass the ints
+    through Stack() directly if they may be larger.
+
+    Examples:
+        make_stack(float) -> ArrayStack with typecode "d"
+        make_stack(str) -> Stack
+    """
+    typecode = _ARRAY_TYPECODES.get(item_type)
+    if typecode is None:
+        return Stack()
+    return ArrayStack(typecode)
+
+
+# -----------------------------------------------------------------------------
+# Concurrent variants
+# -----------------------------------------------------------------------------
+
+# deque.append() and deque.pop() are atomic, so ConcurrentStack needs no
+# lock for either. Only a pop() that has to wait for an item takes one, and
+# push() only touches it when a popper is waiting. Counters track these
+# contended paths only.
+
+
+class ContentionStats(NamedTuple):
+    waits: int
+    timeouts: int
+    wait_time: float
+
+
+class ConcurrentStack(Stack[T]):
+    """
+    A thread-safe Stack backed by a deque.
+
+    pop(timeout) can wait for an item: timeout=0 returns None at once when
+    the stack is empty (the Stack behaviour), a positive timeout waits up to
+    that many seconds, and timeout=None waits as long as it takes.
+    """
+
+    def __init__(self) -> None:
+        self._items: deque[T] = deque()
+        self._not_empty = threading.Condition(threading.Lock())
+        self._waiting = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_time = 0.0
+
+    def push(self, item: T) -> None:
+        self._items.append(item)
+        if self._waiting:
+            with self._not_empty:
+                self._not_empty.notify()
+
+    def push_many(self, items: Iterable[T]) -> None:
+        self._items.extend(items)
+        if self._waiting:
+            with self._not_empty:
+                self._not_empty.notify_all()
+
+    def pop(self, timeout: float | None = 0) -> T | None:
+        try:
+            return self._items.pop()
+        except IndexError:
+            if timeout is not None and timeout <= 0:
+                return None
+        return self._wait_and_pop(timeout)
+
+    def _wait_and_pop(self, timeout: float | None) -> T | None:
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        with self._not_empty:
+            self._waiting += 1
+            self._waits += 1
+            try:
+                while True:
+                    # Re-check after registering: a push that saw no waiters
+                    # has already appended its item.
+                    try:
+                        return self._items.pop()
+                    except IndexError:
+                        pass
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self._timeouts += 1
+                        return None
+                    self._not_empty.wait(remaining)
+            finally:
+                self._waiting -= 1
+                self._wait_time += time.monotonic() - start
+
+    def pop_many(self, n: int) -> list[T]:
+        taken: list[T] = []
+        pop = self._items.pop
+        try:
+            for _ in range(n):
+                taken.append(pop())
+        except IndexError:
+            pass
+        return taken
+
+    def peek(self) -> T | None:
+        try:
+            return self._items[-1]
+        except IndexError:
+            return None
+
+    def stats(self) -> ContentionStats:
+        with self._not_empty:
+            return ContentionStats(self._waits, self._timeouts, self._wait_time)
+
+
+class CASStats(NamedTuple):
+    attempts: int
+    failures: int
+
+
+class ConcurrentBox(Generic[T]):
+    """
+    A thread-safe Box with compare-and-set.
+
+    get() is a plain attribute read. set() and compare_and_set() take a
+    small per-box lock, so a compare-and-set never interleaves with another
+    write. update() retries compare_and_set() until it wins; failed attempts
+    are counted as contention.
+
+    Examples:
+        box = ConcurrentBox(0)
+        box.compare_and_set(0, 1) -> True
+        box.compare_and_set(0, 2) -> False
+        box.update(lambda v: v + 1) -> 2
+    """
+
+    __slots__ = ("_value", "_lock", "_attempts", "_failures")
+
+    def __init__(self, value: T) -> None:
+        self._value = value
+        self._lock = threading.Lock()
+        self._attempts = 0
+        self._failures = 0
+
+    def get(self) -> T:
+        return self._value
+
+    def set(self, value: T) -> None:
+        with self._lock:
+            self._value = value
+
+    def compare_and_set(self, expected: T, new: T) -> bool:
+        """Store new if the current value is (or equals) expected."""
+        with self._lock:
+            self._attempts += 1
+            current = self._value
+            if current is expected or current == expected:
+                self._value = new
+                return True
+            self._failures += 1
+            return False
+
+    def update(self, func: Callable[[T], T]) -> T:
+        """Atomically replace the value with func(value) and return the new value."""
+        while True:
+            current = self._value
+            new = func(current)
+            if self.compare_and_set(current, new):
+                return new
+
+    def stats(self) -> CASStats:
+        with self._lock:
+            return CASStats(self._attempts, self._failures)
@@ -12,8 +12,12 @@ Run tests with: pytest tests/test_ex02.py -v
 Run type checker with: mypy exercises/ex02_typevar_constraints.py
 """
 
-from typing import TypeVar, Generic
+from typing import Callable, ClassVar, Iterable, Iterator, NamedTuple, TypeVar, Generic
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort_right
+from collections import OrderedDict
+from functools import cmp_to_key
+import time
 
 # =============================================================================
 # PART 1: Constrained TypeVars
@@ -173,14 +177,25 @@ class Name(Comparable):
         return f"Name({self.name!r})"
 
 
-# TODO: Create a TypeVar 'C' bounded by Comparable
+C = TypeVar('C', bound=Comparable)
 
 
-class SortedContainer:
+def _compare(a: Comparable, b: Comparable) -> int:
+    return a.compare_to(b)
+
+
+# Adapts compare_to() to the key= protocol used by bisect and list.sort.
+_sort_key = cmp_to_key(_compare)
+
+
+class SortedContainer(Generic[C]):
     """
     A container that keeps items sorted using their compare_to method.
 
-    This should be generic over any Comparable subtype.
+    Items are stored as a list of sorted chunks (at most 2 * load items each)
+    plus a parallel list holding the last item of every chunk. An insert
+    bisects the chunk maxima, then bisects inside a single chunk, so it costs
+    O(log n) comparisons and only shifts one small chunk in memory.
 
     Examples:
         sc = SortedContainer[Score]()
@@ -189,46 +204,134 @@ class SortedContainer:
         sc.add(Score(70))
         sc.get_all()  # [Score(30), Score(50), Score(70)]
 
-    TODO:
-    1. Make this generic with a bounded TypeVar
-    2. Add type hints to all methods
+        sc.add_many([Score(10), Score(90)])
+        list(sc.irange(Score(30), Score(70)))  # [Score(30), Score(50), Score(70)]
+
+    Equal items keep their insertion order.
     """
 
-    def __init__(self):
-        self._items = []
-
-    def add(self, item):
-        """Add an item and keep the list sorted."""
-        self._items.append(item)
-        # Simple insertion sort for clarity
-        self._items.sort(key=lambda x: (x.compare_to(self._items[0]) if self._items else 0))
-        # Actually, let's do a proper sort
-        self._sort()
-
-    def _sort(self):
-        """Sort items using compare_to."""
-        # Bubble sort for simplicity
-        n = len(self._items)
-        for i in range(n):
-            for j in range(0, n - i - 1):
-                if self._items[j].compare_to(self._items[j + 1]) > 0:
-                    self._items[j], self._items[j + 1] = self._items[j + 1], self._items[j]
-
-    def get_min(self):
+    DEFAULT_LOAD: ClassVar[int] = 1000
+
+    def __init__(self, items: Iterable[C] = (), *, load: int = DEFAULT_LOAD):
+        if load < 1:
+            raise ValueError("load must be positive")
+        self._load = load
+        self._chunks: list[list[C]] = []
+        self._maxes: list[C] = []
+        self._len = 0
+        self.add_many(items)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[C]:
+        for chunk in self._chunks:
+            yield from chunk
+
+    def add(self, item: C) -> None:
+        """Add an item and keep the container sorted."""
+        if not self._chunks:
+            self._chunks.append([item])
+            self._maxes.append(item)
+            self._len = 1
+            return
+
+        pos = bisect_right(self._maxes, _sort_key(item), key=_sort_key)
+        if pos == len(self._chunks):
+            # Larger than (or equal to) everything: append to the last chunk.
+            pos -= 1
+            self._chunks[pos].append(item)
+            self._maxes[pos] = item
+        else:
+            insort_right(self._chunks[pos], item, key=_sort_key)
+        self._len += 1
+
+        if len(self._chunks[pos]) > 2 * self._load:
+            self._split(pos)
+
+    def add_many(self, items: Iterable[C]) -> None:
+        """
+        Add several items at once.
+
+        Small batches are inserted one by one; large batches are merged with
+        a single sort, which is much cheaper than repeated inserts.
+        """
+        new_items = list(items)
+        if not new_items:
+            return
+        if len(new_items) * 8 < self._len:
+            for item in new_items:
+                self.add(item)
+            return
+
+        merged = self.get_all()
+        merged.extend(new_items)
+        merged.sort(key=_sort_key)
+        load = self._load
+        self._chunks = [merged[i:i + load] for i in range(0, len(merged), load)]
+        self._maxes = [chunk[-1] for chunk in self._chunks]
+        self._len = len(merged)
+
+    def _split(self, pos: int) -> None:
+        """Split an overfull chunk in two."""
+        chunk = self._chunks[pos]
+        tail = chunk[self._load:]
+        del chunk[self._load:]
+        self._chunks.insert(pos + 1, tail)
+        self._maxes[pos] = chunk[-1]
+        self._maxes.insert(pos + 1, tail[-1])
+
+    def get_min(self) -> C | None:
         """Get the minimum item, or None if empty."""
-        if not self._items:
+        if not self._chunks:
             return None
-        return self._items[0]
+        return self._chunks[0][0]
 
-    def get_max(self):
+    def get_max(self) -> C | None:
         """Get the maximum item, or None if empty."""
-        if not self._items:
+        if not self._maxes:
             return None
-        return self._items[-1]
+        return self._maxes[-1]
 
-    def get_all(self):
+    def get_all(self) -> list[C]:
         """Get all items in sorted order."""
-        return list(self._items)
+        return [item for chunk in self._chunks for item in chunk]
+
+    def irange(self, low: C | None = None, high: C | None = None) -> Iterator[C]:
+        """
+        Iterate over items with low <= item <= high, in sorted order.
+
+        Either bound may be None to leave that side open.
+        """
+        if not self._chunks:
+            return
+
+        if low is None:
+            chunk_idx, item_idx = 0, 0
+        else:
+            low_key = _sort_key(low)
+            chunk_idx = bisect_left(self._maxes, low_key, key=_sort_key)
+            if chunk_idx == len(self._chunks):
+                return
+            item_idx = bisect_left(self._chunks[chunk_idx], low_key, key=_sort_key)
+
+        if high is None:
+            stop_chunk, stop_idx = len(self._chunks) - 1, len(self._chunks[-1])
+        else:
+            high_key = _sort_key(high)
+            stop_chunk = bisect_right(self._maxes, high_key, key=_sort_key)
+            if stop_chunk == len(self._chunks):
+                stop_chunk -= 1
+                stop_idx = len(self._chunks[-1])
+            else:
+                stop_idx = bisect_right(self._chunks[stop_chunk], high_key, key=_sort_key)
+
+        while chunk_idx < stop_chunk:
+            yield from self._chunks[chunk_idx][item_idx:]
+            chunk_idx += 1
+            item_idx = 0
+        if chunk_idx == stop_chunk:
+            yield from self._chunks[chunk_idx][item_idx:stop_idx]
 
 
 # =============================================================================
@@ -262,41 +365,274 @@ class XmlValue(Serializable):
         return f"<{self.tag}>{self.content}</{self.tag}>"
 
 
-# TODO: Create appropriate TypeVar(s) for the Cache class
+S = TypeVar('S', bound=Serializable)
+
+
+class EvictionPolicy(ABC):
+    """
+    Decides which cache key to drop next.
+
+    The cache reports every insert, access and removal; the policy keeps
+    whatever bookkeeping it needs to answer victim() in O(1).
+    """
+
+    @abstractmethod
+    def on_insert(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def on_access(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def on_remove(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def victim(self) -> str:
+        """Return the key that should be evicted next."""
+        pass
+
+    def is_expired(self, key: str) -> bool:
+        """Return True if the entry must no longer be served."""
+        return False
+
+    def expired(self, limit: int) -> list[str]:
+        """Return up to limit expired keys, oldest first."""
+        return []
+
+
+class LRUPolicy(EvictionPolicy):
+    """Evict the least recently used key."""
+
+    def __init__(self) -> None:
+        self._order: OrderedDict[str, None] = OrderedDict()
+
+    def on_insert(self, key: str) -> None:
+        self._order[key] = None
+        self._order.move_to_end(key)
 
+    def on_access(self, key: str) -> None:
+        self._order.move_to_end(key)
 
-class Cache:
+    def on_remove(self, key: str) -> None:
+        del self._order[key]
+
+    def victim(self) -> str:
+        return next(iter(self._order))
+
+
+class LFUPolicy(EvictionPolicy):
+    """
+    Evict the least frequently used key.
+
+    Keys are bucketed by access count; ties are broken by evicting the key
+    that reached that count first.
+    """
+
+    def __init__(self) -> None:
+        self._counts: dict[str, int] = {}
+        self._buckets: dict[int, OrderedDict[str, None]] = {}
+        self._min_count = 0
+
+    def _unlink(self, key: str) -> int:
+        count = self._counts[key]
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+        return count
+
+    def _link(self, key: str, count: int) -> None:
+        self._counts[key] = count
+        self._buckets.setdefault(count, OrderedDict())[key] = None
+
+    def on_insert(self, key: str) -> None:
+        if key in self._counts:
+            self._unlink(key)
+        self._link(key, 1)
+        self._min_count = 1
+
+    def on_access(self, key: str) -> None:
+        count = self._unlink(key)
+        self._link(key, count + 1)
+        if count == self._min_count and count not in self._buckets:
+            self._min_count = count + 1
+
+    def on_remove(self, key: str) -> None:
+        count = self._unlink(key)
+        del self._counts[key]
+        if count == self._min_count and count not in self._buckets and self._buckets:
+            self._min_count = min(self._buckets)
+
+    def victim(self) -> str:
+        return next(iter(self._buckets[self._min_count]))
+
+
+class TTLPolicy(EvictionPolicy):
+    """
+    Expire entries a fixed number of seconds after they were stored.
+
+    When the cache is full, the entry closest to expiry (the oldest one)
+    is evicted first. The clock is injectable for testing.
     """
-    A simple cache that stores Serializable values.
 
-    The cache should:
-    1. Be generic over any Serializable subtype
-    2. Return the same subtype that was stored
+    def __init__(self, ttl: float, clock: Callable[[], float] = time.monotonic):
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.ttl = ttl
+        self._clock = clock
+        self._expires: OrderedDict[str, float] = OrderedDict()
+
+    def on_insert(self, key: str) -> None:
+        self._expires[key] = self._clock() + self.ttl
+        self._expires.move_to_end(key)
+
+    def on_access(self, key: str) -> None:
+        pass
+
+    def on_remove(self, key: str) -> None:
+        del self._expires[key]
+
+    def victim(self) -> str:
+        return next(iter(self._expires))
+
+    def is_expired(self, key: str) -> bool:
+        return self._clock() >= self._expires[key]
+
+    def expired(self, limit: int) -> list[str]:
+        # Every entry lives for the same ttl, so insertion order is expiry order.
+        now = self._clock()
+        keys: list[str] = []
+        for key, expires in self._expires.items():
+            if len(keys) >= limit or expires > now:
+                break
+            keys.append(key)
+        return keys
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+
+
+# How many expired entries Cache.put() drops per call.
+_PURGE_PER_PUT = 2
+
+
+class _CacheEntry(Generic[S]):
+    __slots__ = ("value", "serialized", "size")
+
+    def __init__(self, value: S, serialized: str | None, size: int):
+        self.value = value
+        self.serialized = serialized
+        self.size = size
+
+
+class Cache(Generic[S]):
+    """
+    A cache that stores Serializable values.
+
+    The cache is generic over any Serializable subtype and returns the same
+    subtype that was stored.
 
     Examples:
         cache = Cache[JsonValue]()
         cache.put("config", JsonValue({"debug": True}))
-        val = cache.get("config")  # Should be JsonValue, not just Serializable
+        val = cache.get("config")  # JsonValue, not just Serializable
 
-    TODO:
-    1. Make this generic with an appropriate bounded TypeVar
-    2. Add type hints
-    """
+        # At most 64 KiB of serialized payload, least recently used evicted
+        bounded = Cache[JsonValue](max_bytes=64 * 1024, policy=LRUPolicy())
 
-    def __init__(self):
-        self._store = {}
+    The serialized form is computed at most once per put() and reused by
+    get_serialized(). If max_bytes is set, size is the UTF-8 length of the
+    serialized payload, so values are serialized eagerly on put(). Mutating
+    a value after storing it is not detected; put() it again instead.
+
+    Expired entries (see TTLPolicy) are dropped when looked up, when room
+    is needed for a new entry, and a few at a time on every put(), oldest
+    first. Each put() drops up to _PURGE_PER_PUT of them, more than it adds,
+    so expired entries cannot pile up even without max_bytes.
+    """
 
-    def put(self, key, value):
-        """Store a value with the given key."""
-        self._store[key] = value
+    def __init__(self, max_bytes: int | None = None, policy: EvictionPolicy | None = None):
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("max_bytes must be non-negative")
+        self.max_bytes = max_bytes
+        self._policy = policy if policy is not None else LRUPolicy()
+        self._store: dict[str, _CacheEntry[S]] = {}
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def put(self, key: str, value: S) -> None:
+        """Store a value with the given key, evicting others if needed."""
+        serialized = None
+        size = 0
+        if self.max_bytes is not None:
+            serialized = value.serialize()
+            size = len(serialized.encode("utf-8"))
+            if size > self.max_bytes:
+                raise ValueError(
+                    f"Value for {key!r} is {size} bytes, larger than max_bytes={self.max_bytes}"
+                )
+
+        if key in self._store:
+            self._remove(key)
+        for stale in self._policy.expired(_PURGE_PER_PUT):
+            self._remove(stale)
+            self._evictions += 1
+        if self.max_bytes is not None:
+            while self._size + size > self.max_bytes:
+                self._remove(self._policy.victim())
+                self._evictions += 1
+
+        self._store[key] = _CacheEntry(value, serialized, size)
+        self._size += size
+        self._policy.on_insert(key)
+
+    def _remove(self, key: str) -> None:
+        entry = self._store.pop(key)
+        self._size -= entry.size
+        self._policy.on_remove(key)
+
+    def _lookup(self, key: str) -> _CacheEntry[S] | None:
+        entry = self._store.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        if self._policy.is_expired(key):
+            self._remove(key)
+            self._evictions += 1
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._policy.on_access(key)
+        return entry
 
-    def get(self, key):
+    def get(self, key: str) -> S | None:
         """Get a value by key, or None if not found."""
-        return self._store.get(key)
+        entry = self._lookup(key)
+        if entry is None:
+            return None
+        return entry.value
 
-    def get_serialized(self, key):
+    def get_serialized(self, key: str) -> str | None:
         """Get the serialized form of a value, or None if not found."""
-        value = self._store.get(key)
-        if value is None:
+        entry = self._lookup(key)
+        if entry is None:
             return None
-        return value.serialize()
+        if entry.serialized is None:
+            entry.serialized = entry.value.serialize()
+        return entry.serialized
+
+    def stats(self) -> CacheStats:
+        """Return hit/miss/eviction counters and current occupancy."""
+        return CacheStats(self._hits, self._misses, self._evictions, len(self._store), self._size)
@@ -17,7 +17,11 @@ Run tests with: pytest tests/test_ex04.py -v
 Run type checker with: mypy exercises/ex04_callable_and_overload.py
 """
 
-from typing import Callable, overload, TypeVar, Literal
+from typing import Any, Callable, Generic, Iterable, Iterator, overload, Protocol, TypeVar, Literal, cast
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, wraps
+from itertools import islice
+import os
 
 # =============================================================================
 # PART 1: Basic Callable Types
@@ -90,20 +94,103 @@ T = TypeVar('T')
 U = TypeVar('U')
 
 
-def map_list(func, items):
+# Below this many items, map_list(workers=...) on a process pool stays
+# in-process: starting processes and pickling chunks costs more than it saves.
+SERIAL_THRESHOLD = 1_000
+
+
+class MapItemError(Exception):
+    """Raised by map_list(workers=...) when func fails on the item at index."""
+
+    def __init__(self, index: int, error: BaseException):
+        super().__init__(index, error)
+        self.index = index
+        self.error = error
+
+    def __str__(self) -> str:
+        return f"item {self.index}: {self.error!r}"
+
+
+def _map_chunk(func: Callable[[T], U], start: int, chunk: list[T]) -> list[U]:
+    """Map func over one chunk, reporting a failure by its index in the whole list."""
+    results = []
+    for offset, item in enumerate(chunk):
+        try:
+            results.append(func(item))
+        except Exception as e:
+            raise MapItemError(start + offset, e) from e
+    return results
+
+
+def map_list(
+    func: Callable[[T], U],
+    items: list[T],
+    *,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    mode: Literal["thread", "process"] = "thread",
+    executor: Executor | None = None,
+) -> list[U]:
     """
     Apply a function to each item in a list.
 
     Examples:
         map_list(str.upper, ["a", "b"]) -> ["A", "B"]
         map_list(lambda x: x * 2, [1, 2, 3]) -> [2, 4, 6]
-
-    TODO: Add type hints using TypeVars.
-    - func transforms T -> U
-    - items is list[T]
-    - return is list[U]
+        map_list(checksum, paths, workers=8) -> one checksum per path, in order
+
+    With workers, items are split into chunks of chunk_size (by default
+    about four chunks per worker) and mapped on a pool of that many
+    threads, which suits I/O-bound funcs. CPU-bound funcs can opt in to
+    processes with mode="process"; func and the items must then be
+    picklable, so lambdas and closures will not do. Results keep the
+    order of items. If func raises, map_list raises MapItemError with the
+    index of the first failing item, and chunks that have not started are
+    cancelled. Inputs that fit in a single chunk, or for a process pool
+    are shorter than SERIAL_THRESHOLD, are mapped in-process with the
+    same error behaviour.
+
+    Each call starts and shuts down its own pool. To reuse one across
+    calls, pass it as executor; mode is then ignored, the executor is
+    left running, and workers (os.cpu_count() if not given) only sets
+    the default chunk_size.
     """
-    return [func(item) for item in items]
+    if workers is None and executor is None:
+        return [func(item) for item in items]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    elif workers < 1:
+        raise ValueError("workers must be positive")
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(items) // (workers * 4)))
+    elif chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    processes = isinstance(executor, ProcessPoolExecutor) if executor is not None else mode == "process"
+    small = processes and len(items) < SERIAL_THRESHOLD
+    if workers == 1 or small or len(items) <= chunk_size:
+        return _map_chunk(func, 0, items)
+
+    pool: Executor
+    if executor is not None:
+        pool = executor
+    elif processes:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+    futures: list[Future[list[U]]] = []
+    try:
+        for start in range(0, len(items), chunk_size):
+            futures.append(pool.submit(_map_chunk, func, start, items[start:start + chunk_size]))
+        results: list[U] = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+    finally:
+        if executor is None:
+            pool.shutdown(cancel_futures=True)
+        else:
+            for future in futures:
+                future.cancel()
 
 
 def filter_list(predicate, items):
@@ -122,7 +209,61 @@ def filter_list(predicate, items):
     return [item for item in items if predicate(item)]
 
 
-def compose(f, g):
+A = TypeVar('A')
+B = TypeVar('B')
+C = TypeVar('C')
+
+
+class Composed(Generic[A, C]):
+    """
+    A flat chain of single-argument functions, applied first to last.
+
+    Composing a Composed splices its functions in rather than wrapping it,
+    so a chain of any depth runs in one loop and one frame per call.
+    """
+
+    __slots__ = ("_funcs",)
+
+    _funcs: tuple[Callable[[Any], Any], ...]
+
+    def __init__(self, *funcs: Callable[[Any], Any]):
+        flat: list[Callable[[Any], Any]] = []
+        for func in funcs:
+            if isinstance(func, Composed):
+                flat.extend(func._funcs)
+            else:
+                flat.append(func)
+        self._funcs = tuple(flat)
+
+    @property
+    def funcs(self) -> tuple[Callable[[Any], Any], ...]:
+        """The flattened functions, in the order they are applied."""
+        return self._funcs
+
+    def __call__(self, x: A) -> C:
+        value: Any = x
+        for func in self._funcs:
+            value = func(value)
+        return cast(C, value)
+
+    def map_many(self, items: Iterable[A]) -> list[C]:
+        """
+        Apply the chain to every item and return the results in a list.
+
+        The functions are inlined into one generated comprehension (see
+        Pipeline), so each item costs only the calls themselves, with no
+        trip through __call__ or its loop. Chains longer than _FUSE_LIMIT
+        run as several such loops, so every chain reuses at most
+        _FUSE_LIMIT distinct compiled loops from Pipeline's bounded cache.
+        """
+        return cast(list[C], _run_fused(items, ("map",) * len(self._funcs), self._funcs, True))
+
+    def __repr__(self) -> str:
+        names = ", ".join(getattr(f, "__name__", repr(f)) for f in self._funcs)
+        return f"Composed({names})"
+
+
+def compose(f: Callable[[B], C], g: Callable[[A], B]) -> Composed[A, C]:
     """
     Compose two functions: compose(f, g)(x) == f(g(x))
 
@@ -131,15 +272,139 @@ def compose(f, g):
         double = lambda x: x * 2
         add1_then_double = compose(double, add1)
         add1_then_double(5) -> 12  # double(add1(5)) = double(6) = 12
+        add1_then_double.map_many([1, 2]) -> [4, 6]
+
+    Nested compositions are flattened: compose(f, compose(g, h)) applies
+    h, g, f in one loop instead of nesting a call per level.
+    """
+    return Composed(g, f)
+
+
+# -----------------------------------------------------------------------------
+# Lazy pipelines
+# -----------------------------------------------------------------------------
+#
+# Chaining map_list/filter_list builds a full list per stage. A Pipeline only
+# records its stages; when consumed, adjacent stages are fused into a single
+# generated comprehension, so map -> filter -> map runs as one loop with no
+# intermediate lists and no per-stage generator frames.
 
-    TODO: Add type hints with three TypeVars (A, B, C).
-    - g: A -> B
-    - f: B -> C
-    - return: A -> C
+_FusedLoop = Callable[..., Any]
+# Most stages fused into one expression; nesting much deeper hits the parser's limits.
+_FUSE_LIMIT = 64
+# Compiled loops are kept for this many of the most recently used stage
+# sequences; each pipeline shape compiles one pair.
+_FUSED_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=_FUSED_CACHE_SIZE)
+def _fuse(kinds: tuple[str, ...]) -> tuple[_FusedLoop, _FusedLoop]:
+    """
+    Compile the collect and iterate loops for a sequence of stage kinds.
+
+    kinds holds "map" or "filter" per stage. Map stages nest into the
+    current expression; a filter binds the value so far with := and tests
+    it in an `if` clause. For ("map", "filter", "map") this generates:
+
+        [s2(v) for item in items if s1(v := s0(item))]
+    """
+    expr = "item"
+    conditions = []
+    for i, kind in enumerate(kinds):
+        if kind == "map":
+            expr = f"s{i}({expr})"
+        elif expr in ("item", "v"):
+            conditions.append(f" if s{i}({expr})")
+        else:
+            conditions.append(f" if s{i}(v := {expr})")
+            expr = "v"
+    params = "".join(f", s{i}" for i in range(len(kinds)))
+    clause = f"{expr} for item in items{''.join(conditions)}"
+    namespace: dict[str, Any] = {}
+    exec(
+        f"def collect(items{params}):\n    return [{clause}]\n"
+        f"def iterate(items{params}):\n    return ({clause})\n",
+        namespace,
+    )
+    return namespace["collect"], namespace["iterate"]
+
+
+def _run_fused(
+    items: Iterable[Any],
+    kinds: tuple[str, ...],
+    funcs: tuple[Callable[[Any], Any], ...],
+    collect: bool,
+) -> Any:
+    """
+    Run stages over items as fused loops, returning a list or an iterator.
+
+    Stages are fused _FUSE_LIMIT at a time; the loops for earlier groups
+    are generators feeding the next, so nothing is materialized between them.
+    """
+    last = (len(kinds) - 1) // _FUSE_LIMIT * _FUSE_LIMIT if kinds else 0
+    for start in range(0, last, _FUSE_LIMIT):
+        end = start + _FUSE_LIMIT
+        items = _fuse(kinds[start:end])[1](items, *funcs[start:end])
+    return _fuse(kinds[last:])[0 if collect else 1](items, *funcs[last:])
+
+
+class Pipeline(Generic[T]):
+    """
+    A lazy chain of map and filter stages over an iterable.
+
+    Examples:
+        Pipeline(range(10)).map(lambda x: x * 3).filter(lambda x: x % 2 == 0).collect()
+            -> [0, 6, 12, 18, 24]
+        list(Pipeline(["a", "b", "c"]).map(str.upper).chunks(2)) -> [["A", "B"], ["C"]]
+
+    map() and filter() return a new Pipeline and never touch the items;
+    nothing runs until the pipeline is iterated or a terminal (collect,
+    chunks) is called. A pipeline over an iterator can be consumed once.
     """
-    def composed(x):
-        return f(g(x))
-    return composed
+
+    __slots__ = ("_source", "_kinds", "_funcs")
+
+    def __init__(self, items: Iterable[T]):
+        self._source: Iterable[Any] = items
+        self._kinds: tuple[str, ...] = ()
+        self._funcs: tuple[Callable[[Any], Any], ...] = ()
+
+    def _extend(self, kind: str, func: Callable[[Any], Any]) -> "Pipeline[Any]":
+        pipeline: Pipeline[Any] = Pipeline(self._source)
+        pipeline._kinds = self._kinds + (kind,)
+        pipeline._funcs = self._funcs + (func,)
+        return pipeline
+
+    def map(self, func: Callable[[T], U]) -> "Pipeline[U]":
+        """Add a stage that transforms every item with func."""
+        return self._extend("map", func)
+
+    def filter(self, predicate: Callable[[T], bool]) -> "Pipeline[T]":
+        """Add a stage that keeps only the items predicate accepts."""
+        return self._extend("filter", predicate)
+
+    def __iter__(self) -> Iterator[T]:
+        if not self._kinds:
+            return iter(self._source)
+        return cast(Iterator[T], _run_fused(self._source, self._kinds, self._funcs, False))
+
+    def collect(self) -> list[T]:
+        """Run the pipeline and return every result in a list."""
+        if not self._kinds:
+            return list(self._source)
+        return cast(list[T], _run_fused(self._source, self._kinds, self._funcs, True))
+
+    def chunks(self, size: int) -> Iterator[list[T]]:
+        """
+        Run the pipeline lazily, yielding results in lists of up to size items.
+
+        Only one chunk is held in memory at a time.
+        """
+        if size < 1:
+            raise ValueError(f"chunk size must be positive, got {size}")
+        results = iter(self)
+        while chunk := list(islice(results, size)):
+            yield chunk
 
 
 # =============================================================================
@@ -271,7 +536,15 @@ def get_item(data, index, default=None):
 # =============================================================================
 
 
-def retry(max_attempts):
+class RetryDecorator(Protocol):
+    """Anything that wraps a function in retries, such as Exercise 5's RetryPolicy."""
+
+    def __call__(self, func: Callable[..., T], /) -> Callable[..., T]: ...
+
+
+def retry(
+    max_attempts: int | None = None, *, policy: RetryDecorator | None = None
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """
     A decorator that retries a function up to max_attempts times.
 
@@ -281,28 +554,37 @@ def retry(max_attempts):
             # might fail sometimes
             pass
 
-    TODO: Add complete type hints to this decorator.
-
-    This is challenging! The decorator:
-    - Takes max_attempts: int
-    - Returns a decorator that takes a Callable
-    - That decorator returns a Callable with the same signature
+    Callable[..., T] keeps the return type; Exercise 5 shows how ParamSpec
+    keeps the parameters too.
 
-    Hint: The inner function should preserve the type of the decorated function.
-    You might want to use TypeVar for the return type at minimum.
+    retry(n) tries again straight away, on any Exception. During an outage
+    that hammers the failing dependency, so production callers should pass
+    a policy instead, such as a RetryPolicy from Exercise 5 with backoff,
+    jitter, a deadline, exception filters and optionally a shared
+    RetryBudget:
 
-    For a simpler version, just ensure the return type is preserved.
-    For advanced: look into ParamSpec (we'll cover this in a future exercise).
+        @retry(policy=RetryPolicy(4, base_delay=0.1, retry_on=(TimeoutError,)))
+        def fetch(url: str) -> bytes: ...
     """
-    def decorator(func):
-        def wrapper(*args, **kwargs):
-            last_exception = None
-            for attempt in range(max_attempts):
+    if policy is not None:
+        if max_attempts is not None:
+            raise ValueError("pass max_attempts or a policy, not both")
+        return policy
+    if max_attempts is None:
+        raise ValueError("retry needs max_attempts or a policy")
+    if max_attempts < 1:
+        raise ValueError("max_attempts must be positive")
+    attempts = max_attempts
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            for _ in range(attempts - 1):
                 try:
                     return func(*args, **kwargs)
-                except Exception as e:
-                    last_exception = e
-            raise last_exception
+                except Exception:
+                    pass
+            return func(*args, **kwargs)
         return wrapper
     return decorator
 
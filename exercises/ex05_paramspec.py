@@ -21,8 +21,31 @@ Run tests with: pytest tests/test_ex05.py -v
 Run type checker with: mypy exercises/ex05_paramspec.py
 """
 
-from typing import Callable, TypeVar, ParamSpec, Concatenate
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Concatenate,
+    Coroutine,
+    Hashable,
+    Iterator,
+    Literal,
+    NamedTuple,
+    ParamSpec,
+    Protocol,
+    TypeVar,
+    cast,
+    overload,
+)
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from functools import wraps
+import asyncio
+import inspect
+import math
+import random
+import threading
 import time
 
 # =============================================================================
@@ -34,13 +57,19 @@ import time
 
 P = ParamSpec('P')
 T = TypeVar('T')
+U = TypeVar('U')
+T_co = TypeVar('T_co', covariant=True)
+T_contra = TypeVar('T_contra', contravariant=True)
+U_co = TypeVar('U_co', covariant=True)
 
 
-def log_call(func):
+def log_call(func: Callable[P, T]) -> Callable[P, T]:
     """
     A decorator that logs when a function is called.
 
-    This should preserve the FULL signature of the decorated function.
+    This preserves the FULL signature of the decorated function. Coroutine
+    functions get a coroutine wrapper, so the log line is printed when the
+    call is awaited.
 
     Example:
         @log_call
@@ -50,22 +79,31 @@ def log_call(func):
         greet("Alice")  # Logs: "Calling greet"
                         # Returns: "Hello, Alice"
 
-        # Type checker should know: greet(name: str) -> str
+        # Type checker knows: greet(name: str) -> str
         # NOT: greet(*args, **kwargs) -> str
-
-    TODO: Add type hints using ParamSpec.
-    - func: Callable[P, T]
-    - return: Callable[P, T]
-    - Use @wraps(func) to preserve function metadata
     """
+    if inspect.iscoroutinefunction(func):
+        async_func = cast(Callable[P, Awaitable[Any]], func)
+
+        @wraps(func)
+        async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+            print(f"Calling {func.__name__}")
+            return await async_func(*args, **kwargs)
+        return cast(Callable[P, T], async_wrapper)
+
     @wraps(func)
-    def wrapper(*args, **kwargs):
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
         print(f"Calling {func.__name__}")
         return func(*args, **kwargs)
     return wrapper
 
 
-def time_it(func):
+@overload
+def time_it(func: Callable[P, Coroutine[Any, Any, T]]) -> Callable[P, Coroutine[Any, Any, tuple[T, float]]]: ...  # type: ignore[overload-overlap]
+@overload
+def time_it(func: Callable[P, T]) -> Callable[P, tuple[T, float]]: ...
+
+def time_it(func: Callable[P, Any]) -> Callable[P, Any]:
     """
     A decorator that measures execution time.
 
@@ -81,14 +119,20 @@ def time_it(func):
         # result = 3, elapsed ≈ 0.1
 
     Note: This changes the return type! The decorated function returns
-    tuple[T, float] instead of just T.
-
-    TODO: Add type hints.
-    - func: Callable[P, T]
-    - return: Callable[P, tuple[T, float]]
+    tuple[T, float] instead of just T. For coroutine functions the elapsed
+    time covers awaiting the coroutine, not just creating it.
     """
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> tuple[Any, float]:
+            start = time.perf_counter()
+            result = await func(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            return (result, elapsed)
+        return async_wrapper
+
     @wraps(func)
-    def wrapper(*args, **kwargs):
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> tuple[Any, float]:
         start = time.perf_counter()
         result = func(*args, **kwargs)
         elapsed = time.perf_counter() - start
@@ -101,44 +145,511 @@ def time_it(func):
 # =============================================================================
 
 
-def retry(max_attempts):
+class RetryStats(NamedTuple):
+    calls: int
+    attempts: int
+    retries: int
+    give_ups: int
+    budget_denials: int
+    sleep_time: float
+
+
+class RetryBudget:
+    """
+    A token bucket that caps retries to a share of base traffic.
+
+    Every call deposits `ratio` tokens and every retry spends a whole one,
+    so across all policies sharing the budget retries stay near `ratio` of
+    calls however many of them fail at once. Another `min_per_second`
+    tokens accrue with time so that a quiet caller can still retry. The
+    bucket starts full and holds at most `max_tokens`.
+
+    Example:
+        budget = RetryBudget(ratio=0.1)  # retries add at most ~10% load
+        search = retry(policy=RetryPolicy(4, budget=budget))(search)
+        lookup = retry(policy=RetryPolicy(2, budget=budget))(lookup)
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.1,
+        min_per_second: float = 1.0,
+        max_tokens: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if ratio < 0 or min_per_second < 0:
+            raise ValueError("ratio and min_per_second must be non-negative")
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be at least 1")
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = max_tokens
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last update. Caller holds the lock."""
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.max_tokens, self._tokens + elapsed * self.min_per_second)
+
+    def deposit(self) -> None:
+        """Record one call."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take a token for one retry, or return False if none is left."""
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+class RetryPolicy:
+    """
+    When, how often and how long to wait before retrying a failed call.
+
+    - max_attempts: total tries per call, including the first
+    - base_delay, multiplier, max_delay: the wait before retry n is capped
+      at min(max_delay, base_delay * multiplier ** (n - 1))
+    - jitter: wait a uniformly random time up to that cap ("full jitter"),
+      so callers that failed together do not retry together
+    - deadline: give up rather than wait past this many seconds since the
+      call started
+    - retry_on, retry_if: only exceptions that are instances of retry_on
+      and, if given, pass retry_if are retried; others propagate at once
+    - budget: a RetryBudget, usually shared, that must grant every retry
+    - clock, sleep, rng: time source, blocking sleep and random source,
+      injectable for testing (coroutine functions wait with asyncio.sleep)
+    - record_stats: keep the totals that stats() reports; turning this off
+      saves taking a lock on every call
+
+    A policy is itself a decorator for sync and async functions, and
+    stats() reports totals over every call it has made. The clock is only
+    read for policies with a deadline.
+
+    Example:
+        policy = RetryPolicy(5, base_delay=0.05, deadline=2.0, retry_on=(ConnectionError,))
+
+        @policy
+        def fetch(url: str) -> bytes: ...
+
+        policy.stats()  # RetryStats(calls=..., attempts=..., ...)
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        *,
+        base_delay: float = 0.1,
+        multiplier: float = 2.0,
+        max_delay: float = 10.0,
+        jitter: bool = True,
+        deadline: float | None = None,
+        retry_on: type[Exception] | tuple[type[Exception], ...] = Exception,
+        retry_if: Callable[[Exception], bool] | None = None,
+        budget: RetryBudget | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random,
+        record_stats: bool = True,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be positive")
+        if base_delay < 0 or max_delay < 0 or multiplier < 0:
+            raise ValueError("delays and multiplier must be non-negative")
+        if deadline is not None and deadline <= 0:
+            raise ValueError("deadline must be positive or None")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.multiplier = multiplier
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.deadline = deadline
+        self.retry_on = retry_on
+        self.retry_if = retry_if
+        self.budget = budget
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng
+        self.record_stats = record_stats
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._retries = 0
+        self._give_ups = 0
+        self._budget_denials = 0
+        self._sleep_time = 0.0
+
+    def backoff(self, retry: int) -> float:
+        """The longest wait before the retry-th retry (1-based), before jitter."""
+        try:
+            delay = self.base_delay * self.multiplier ** (retry - 1)
+        except OverflowError:
+            return self.max_delay
+        return min(self.max_delay, delay)
+
+    def _begin(self) -> float:
+        """Count a new call and return its start time (0.0 when there is no deadline)."""
+        if self.budget is not None:
+            self.budget.deposit()
+        if self.record_stats:
+            with self._lock:
+                self._calls += 1
+        if self.deadline is None:
+            return 0.0
+        return self._clock()
+
+    def _next_delay(self, attempt: int, exc: Exception, started: float) -> float | None:
+        """Decide what follows a failed attempt: the wait before the next one, or None to give up."""
+        delay: float | None = None
+        denied = False
+        if (
+            attempt < self.max_attempts
+            and isinstance(exc, self.retry_on)
+            and (self.retry_if is None or self.retry_if(exc))
+        ):
+            delay = self.backoff(attempt)
+            if self.jitter:
+                delay *= self._rng()
+            if self.deadline is not None and self._clock() + delay - started > self.deadline:
+                delay = None
+            elif self.budget is not None and not self.budget.try_spend():
+                delay = None
+                denied = True
+        if self.record_stats:
+            with self._lock:
+                if delay is None:
+                    self._give_ups += 1
+                    self._budget_denials += int(denied)
+                else:
+                    self._retries += 1
+                    self._sleep_time += delay
+        return delay
+
+    def call(self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Call func with args, retrying as the policy allows."""
+        started = self._begin()
+        try:
+            return func(*args, **kwargs)
+        except Exception as exc:
+            error = exc
+        return self._retry(error, started, func, args, kwargs)
+
+    def _retry(
+        self, error: Exception, started: float, func: Callable[..., T], args: tuple, kwargs: dict[str, Any]
+    ) -> T:
+        """Carry on after the first attempt failed with error."""
+        attempt = 1
+        while True:
+            delay = self._next_delay(attempt, error, started)
+            if delay is None:
+                raise error
+            if delay > 0:
+                self._sleep(delay)
+            attempt += 1
+            try:
+                return func(*args, **kwargs)
+            except Exception as exc:
+                error = exc
+
+    async def call_async(self, func: Callable[P, Awaitable[T]], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Await func with args, retrying as the policy allows without blocking the loop."""
+        started = self._begin()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await func(*args, **kwargs)
+            except Exception as exc:
+                delay = self._next_delay(attempt, exc, started)
+                if delay is None:
+                    raise
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    def __call__(self, func: Callable[P, T]) -> Callable[P, T]:
+        if inspect.iscoroutinefunction(func):
+            async_func = cast(Callable[P, Awaitable[Any]], func)
+
+            @wraps(func)
+            async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+                return await self.call_async(async_func, *args, **kwargs)
+            return cast(Callable[P, T], async_wrapper)
+
+        # Same as call(), inlined: a call that succeeds first time is the
+        # common case, and this keeps it to one extra frame.
+        begin = self._begin
+        retry_after = self._retry
+
+        @wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            started = begin()
+            try:
+                return func(*args, **kwargs)
+            except Exception as exc:
+                error = exc
+            return retry_after(error, started, func, args, kwargs)
+        return wrapper
+
+    def stats(self) -> RetryStats:
+        """Totals over every call so far. Every attempt but a call's first follows a retry."""
+        if not self.record_stats:
+            raise RuntimeError("this policy does not record stats")
+        with self._lock:
+            return RetryStats(
+                self._calls,
+                self._calls + self._retries,
+                self._retries,
+                self._give_ups,
+                self._budget_denials,
+                self._sleep_time,
+            )
+
+
+def retry(
+    max_attempts: int | None = None,
+    delay: float = 0.0,
+    backoff: float = 2.0,
+    *,
+    policy: RetryPolicy | None = None,
+) -> Callable[[Callable[P, T]], Callable[P, T]]:
     """
     A decorator that retries a function up to max_attempts times.
 
     This is the same as Exercise 4, but now with proper ParamSpec typing!
 
+    Between attempts it waits `delay` seconds, multiplying the wait by
+    `backoff` after each failure. Coroutine functions wait with
+    asyncio.sleep, so the event loop keeps running during the backoff.
+    For jitter, deadlines, exception filters, retry budgets and metrics,
+    pass a RetryPolicy instead of max_attempts.
+
     Example:
         @retry(3)
         def fetch_data(url: str, timeout: int = 30) -> dict:
             ...
 
-        # Type checker should know:
+        # Type checker knows:
         # fetch_data(url: str, timeout: int = 30) -> dict
 
-    TODO: Add complete type hints using ParamSpec.
-    The decorated function should preserve its exact signature.
+        @retry(5, delay=0.1)
+        async def fetch_async(url: str) -> bytes:
+            ...
+
+        @retry(policy=RetryPolicy(5, deadline=2.0, budget=shared_budget))
+        def fetch_guarded(url: str) -> bytes:
+            ...
+    """
+    if policy is None:
+        if max_attempts is None:
+            raise ValueError("retry needs max_attempts or a policy")
+        policy = RetryPolicy(
+            max_attempts,
+            base_delay=delay,
+            multiplier=backoff,
+            max_delay=math.inf,
+            jitter=False,
+            record_stats=False,
+        )
+    elif max_attempts is not None:
+        raise ValueError("pass max_attempts or a policy, not both")
+    return policy
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
+class CachedFunction(Protocol[P, T_co]):
+    """A memoized callable as returned by cache_result."""
+
+    cache_info: Callable[[], CacheInfo]
+    cache_clear: Callable[[], None]
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> T_co: ...
+
+
+_MISSING: Any = object()
+
+
+class _Abandoned(Exception):
+    """The caller computing a cached value stopped without a result."""
+
+
+class _ResultCache:
+    """
+    LRU/TTL storage behind cache_result.
+
+    `inflight` maps keys currently being computed to a Future that the
+    computing caller resolves, so concurrent misses wait for it instead of
+    computing again. Sync callers block on the Future; async callers await
+    it through asyncio.wrap_future, shielded so that cancelling one waiter
+    does not cancel the Future the others share.
     """
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            last_exception = None
-            for _ in range(max_attempts):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    last_exception = e
-            if last_exception is not None:
-                raise last_exception
-            raise RuntimeError("No attempts made")
-        return wrapper
-    return decorator
 
+    def __init__(self, maxsize: int | None, ttl: float | None, clock: Callable[[], float]):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: dict[Hashable, Future[Any]] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def _get(self, key: Hashable) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return _MISSING
+        value, expires_at = item
+        if expires_at <= self._clock():
+            del self._data[key]
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def claim(self, key: Hashable) -> tuple[Any, Future[Any] | None, bool]:
+        """
+        Look up a key.
+
+        Returns (value, None, False) on a hit, (_MISSING, future, False) if
+        another caller is already computing the key, and (_MISSING, future,
+        True) if this caller must compute it and then resolve() or reject().
+        """
+        with self._lock:
+            value = self._get(key)
+            if value is not _MISSING:
+                self._hits += 1
+                return value, None, False
+            pending = self._inflight.get(key)
+            if pending is not None:
+                self._hits += 1
+                return _MISSING, pending, False
+            future: Future[Any] = Future()
+            self._inflight[key] = future
+            self._misses += 1
+            return _MISSING, future, True
+
+    def resolve(self, key: Hashable, future: Future[Any], value: Any) -> None:
+        expires_at = self._clock() + self.ttl if self.ttl is not None else math.inf
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            if self.maxsize is not None and len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            del self._inflight[key]
+        future.set_result(value)
+
+    def reject(self, key: Hashable, future: Future[Any], exc: BaseException) -> None:
+        """
+        Hand exc to the waiters, unless it is not an Exception (cancellation,
+        KeyboardInterrupt, ...). That only concerns the computing caller, so
+        the waiters are told to claim the key again instead.
+        """
+        with self._lock:
+            del self._inflight[key]
+        future.set_exception(exc if isinstance(exc, Exception) else _Abandoned())
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._data))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+_POSITIONAL_KINDS = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+
+
+def _make_key_builder(func: Callable[..., Any]) -> Callable[[tuple[Any, ...], dict[str, Any]], Hashable]:
+    """
+    Build a function that turns call arguments into a normalized cache key.
 
-def cache_result(func):
+    Arguments are bound to the signature with defaults applied, so f(1, b=2),
+    f(1, 2) and (if b defaults to 2) f(1) all produce the same key. Calls that
+    pass every parameter positionally skip the binding step entirely.
+    """
+    try:
+        sig = inspect.signature(func)
+    except (TypeError, ValueError):
+        def fallback_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable:
+            return (args, tuple(sorted(kwargs.items())))
+        return fallback_key
+
+    params = sig.parameters.values()
+    if all(p.kind in _POSITIONAL_KINDS for p in params):
+        arity = len(sig.parameters)
+
+        def positional_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable:
+            if not kwargs and len(args) == arity:
+                return args
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return bound.args
+        return positional_key
+
+    def bound_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable:
+        bound = sig.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return (bound.args, tuple(sorted(bound.kwargs.items())))
+    return bound_key
+
+
+@overload
+def cache_result(func: Callable[P, T]) -> CachedFunction[P, T]: ...
+@overload
+def cache_result(
+    *,
+    maxsize: int | None = None,
+    ttl: float | None = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> Callable[[Callable[P, T]], CachedFunction[P, T]]: ...
+
+def cache_result(
+    func: Callable[P, T] | None = None,
+    *,
+    maxsize: int | None = None,
+    ttl: float | None = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> CachedFunction[P, T] | Callable[[Callable[P, T]], CachedFunction[P, T]]:
     """
-    A simple memoization decorator.
+    A thread-safe memoization decorator.
+
+    Caches results based on arguments (assumes hashable args). Can be used
+    bare or with options:
+    - maxsize: keep at most this many results, evicting the least recently
+      used one (None means unbounded)
+    - ttl: results older than this many seconds are recomputed
+    - clock: time source for ttl, injectable for testing
+
+    Arguments are normalized against the function's signature, so f(1, b=2)
+    and f(1, 2) share an entry. When several threads miss on the same key at
+    once, only the first computes; the others wait for its result (or its
+    exception, which is not cached). If the computing call is cancelled or
+    interrupted instead, one of the waiters takes over the computation.
 
-    Caches results based on arguments (assumes hashable args).
+    Coroutine functions are supported: the awaited result is cached, never
+    the coroutine object, and concurrent awaits of a missing key share one
+    computation.
 
     Example:
         @cache_result
@@ -148,18 +659,347 @@ def cache_result(func):
 
         expensive(5)  # Prints "Computing 5", returns 10
         expensive(5)  # No print, returns 10 (cached)
+        expensive.cache_info()  # CacheInfo(hits=1, misses=1, maxsize=None, currsize=1)
 
-    TODO: Add type hints using ParamSpec.
+        @cache_result(maxsize=1024, ttl=60.0)
+        def lookup(user_id: int) -> dict: ...
     """
-    cache: dict = {}
+    if maxsize is not None and maxsize < 1:
+        raise ValueError("maxsize must be positive or None")
+    if ttl is not None and ttl <= 0:
+        raise ValueError("ttl must be positive or None")
+
+    def decorator(func: Callable[P, T]) -> CachedFunction[P, T]:
+        cache = _ResultCache(maxsize, ttl, clock)
+        make_key = _make_key_builder(func)
+        wrapper: Callable[P, Any]
+
+        if inspect.iscoroutinefunction(func):
+            async_func = cast(Callable[P, Awaitable[Any]], func)
+
+            @wraps(func)
+            async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+                key = make_key(args, kwargs)
+                while True:
+                    value, future, owner = cache.claim(key)
+                    if future is None:
+                        return value
+                    if owner:
+                        break
+                    try:
+                        return await asyncio.shield(asyncio.wrap_future(future))
+                    except _Abandoned:
+                        pass
+                try:
+                    result = await async_func(*args, **kwargs)
+                except BaseException as exc:
+                    cache.reject(key, future, exc)
+                    raise
+                cache.resolve(key, future, result)
+                return result
+            wrapper = async_wrapper
+        else:
+            @wraps(func)
+            def sync_wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+                key = make_key(args, kwargs)
+                while True:
+                    value, future, owner = cache.claim(key)
+                    if future is None:
+                        return cast(T, value)
+                    if owner:
+                        break
+                    try:
+                        return cast(T, future.result())
+                    except _Abandoned:
+                        pass
+                try:
+                    result = func(*args, **kwargs)
+                except BaseException as exc:
+                    cache.reject(key, future, exc)
+                    raise
+                cache.resolve(key, future, result)
+                return result
+            wrapper = sync_wrapper
+
+        cached = cast(CachedFunction[P, T], wrapper)
+        cached.cache_info = cache.info
+        cached.cache_clear = cache.clear
+        return cached
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling through while a circuit breaker is open."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Circuit is open; retry in {retry_after:.3f}s")
+        self.retry_after = retry_after
+
+
+class BreakerStats(NamedTuple):
+    state: BreakerState
+    failures: int
+    calls: int
+    rejected: int
+    opened: int
+    half_opened: int
+    closed: int
 
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        key = (args, tuple(sorted(kwargs.items())))
-        if key not in cache:
-            cache[key] = func(*args, **kwargs)
-        return cache[key]
-    return wrapper
+
+def _check_breaker_options(failure_threshold: int, reset_timeout: float, half_open_max_calls: int) -> None:
+    if failure_threshold < 1 or half_open_max_calls < 1:
+        raise ValueError("failure_threshold and half_open_max_calls must be positive")
+    if reset_timeout < 0:
+        raise ValueError("reset_timeout must be non-negative")
+
+
+class CircuitBreaker:
+    """
+    Stops calling a dependency that keeps failing, and probes it to recover.
+
+    - closed: calls go through; failure_threshold consecutive failures open
+      the circuit
+    - open: calls fail fast with CircuitOpenError for reset_timeout seconds,
+      after which the next call, or reading state or stats(), moves the
+      circuit to half-open
+    - half_open: up to half_open_max_calls probe calls go through at once
+      and the rest are rejected; that many successes close the circuit and
+      any failure opens it again
+
+    Only exceptions that are instances of failure_on count as failures;
+    others pass through and leave the state as it was, counting neither as
+    a failure nor as a success (a half-open probe's slot is freed for
+    another probe). Calls started before a transition do not count towards the
+    new state. clock is injectable for testing. A breaker is thread-safe
+    and can guard several functions that share a dependency.
+
+    Example:
+        breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30.0)
+
+        @breaker
+        def fetch(url: str) -> bytes: ...
+
+        breaker.stats()  # BreakerStats(state='closed', failures=0, ...)
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        *,
+        failure_on: type[Exception] | tuple[type[Exception], ...] = Exception,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        _check_breaker_options(failure_threshold, reset_timeout, half_open_max_calls)
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.failure_on = failure_on
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state: BreakerState = "closed"
+        # Bumped on every transition so late results from an earlier state are ignored.
+        self._generation = 0
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self._calls = 0
+        self._rejected = 0
+        self._transitions = {"open": 0, "half_open": 0, "closed": 0}
+
+    def _transition(self, state: BreakerState) -> None:
+        """Move to state. Caller holds the lock."""
+        self._state = state
+        self._generation += 1
+        self._transitions[state] += 1
+        self._failures = 0
+        self._probes = 0
+        self._probe_successes = 0
+        if state == "open":
+            self._opened_at = self._clock()
+
+    def _expire(self) -> float:
+        """
+        Move an open circuit whose timeout has passed to half-open. Caller
+        holds the lock. Returns the seconds left while it stays open.
+        """
+        if self._state != "open":
+            return 0.0
+        remaining = self._opened_at + self.reset_timeout - self._clock()
+        if remaining <= 0:
+            self._transition("half_open")
+        return remaining
+
+    @property
+    def state(self) -> BreakerState:
+        with self._lock:
+            self._expire()
+            return self._state
+
+    def _admit(self) -> int:
+        """Let a call through or raise CircuitOpenError; returns the generation it ran in."""
+        with self._lock:
+            remaining = self._expire()
+            if self._state == "open":
+                self._rejected += 1
+                raise CircuitOpenError(remaining)
+            if self._state == "half_open":
+                if self._probes >= self.half_open_max_calls:
+                    self._rejected += 1
+                    raise CircuitOpenError(0.0)
+                self._probes += 1
+            self._calls += 1
+            return self._generation
+
+    def _record(self, generation: int, failed: bool) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            if self._state == "half_open":
+                if failed:
+                    self._transition("open")
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_max_calls:
+                        self._transition("closed")
+            elif failed:
+                self._failures += 1
+                if self._failures >= self.failure_threshold:
+                    self._transition("open")
+            else:
+                self._failures = 0
+
+    def _abandon(self, generation: int) -> None:
+        """Free the probe slot of a call that ended without a verdict: cancelled, or raised outside failure_on."""
+        with self._lock:
+            if generation == self._generation and self._state == "half_open":
+                self._probes -= 1
+
+    def call(self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Call func through the breaker."""
+        generation = self._admit()
+        try:
+            result = func(*args, **kwargs)
+        except self.failure_on:
+            self._record(generation, True)
+            raise
+        except Exception:
+            self._abandon(generation)
+            raise
+        except BaseException:
+            self._abandon(generation)
+            raise
+        self._record(generation, False)
+        return result
+
+    async def call_async(self, func: Callable[P, Awaitable[T]], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Await func through the breaker."""
+        generation = self._admit()
+        try:
+            result = await func(*args, **kwargs)
+        except self.failure_on:
+            self._record(generation, True)
+            raise
+        except Exception:
+            self._abandon(generation)
+            raise
+        except BaseException:
+            self._abandon(generation)
+            raise
+        self._record(generation, False)
+        return result
+
+    def __call__(self, func: Callable[P, T]) -> "BreakerFunction[P, T]":
+        wrapper: Callable[P, Any]
+        if inspect.iscoroutinefunction(func):
+            async_func = cast(Callable[P, Awaitable[Any]], func)
+
+            @wraps(func)
+            async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+                return await self.call_async(async_func, *args, **kwargs)
+            wrapper = async_wrapper
+        else:
+            @wraps(func)
+            def sync_wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+                return self.call(func, *args, **kwargs)
+            wrapper = sync_wrapper
+
+        guarded = cast(BreakerFunction[P, T], wrapper)
+        guarded.breaker = self
+        return guarded
+
+    def reset(self) -> None:
+        """Close the circuit now, e.g. after fixing the dependency by hand."""
+        with self._lock:
+            if self._state != "closed":
+                self._transition("closed")
+            self._failures = 0
+
+    def stats(self) -> BreakerStats:
+        with self._lock:
+            self._expire()
+            return BreakerStats(
+                self._state,
+                self._failures,
+                self._calls,
+                self._rejected,
+                self._transitions["open"],
+                self._transitions["half_open"],
+                self._transitions["closed"],
+            )
+
+
+class BreakerFunction(Protocol[P, T_co]):
+    """A callable guarded by a CircuitBreaker, as returned by circuit_breaker."""
+
+    breaker: CircuitBreaker
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> T_co: ...
+
+
+def circuit_breaker(
+    failure_threshold: int = 5,
+    reset_timeout: float = 30.0,
+    half_open_max_calls: int = 1,
+    *,
+    failure_on: type[Exception] | tuple[type[Exception], ...] = Exception,
+    clock: Callable[[], float] = time.monotonic,
+) -> Callable[[Callable[P, T]], BreakerFunction[P, T]]:
+    """
+    A decorator that fails fast while the function keeps failing.
+
+    After failure_threshold consecutive failures, calls raise
+    CircuitOpenError without running the function for reset_timeout
+    seconds. Then up to half_open_max_calls probe calls are let through:
+    if they all succeed the circuit closes, if one fails it opens again.
+    See CircuitBreaker for the details; the decorated function exposes
+    its breaker as .breaker. Coroutine functions are supported.
+
+    Combined with retry, put the breaker inside so every attempt is
+    counted, and keep CircuitOpenError out of the policy's retry_on.
+
+    Example:
+        @circuit_breaker(failure_threshold=3, reset_timeout=10.0)
+        def charge(card: str, amount: int) -> str: ...
+
+        charge.breaker.state  # "closed", "open" or "half_open"
+    """
+    _check_breaker_options(failure_threshold, reset_timeout, half_open_max_calls)
+
+    def decorator(func: Callable[P, T]) -> BreakerFunction[P, T]:
+        breaker = CircuitBreaker(
+            failure_threshold, reset_timeout, half_open_max_calls, failure_on=failure_on, clock=clock
+        )
+        return breaker(func)
+    return decorator
 
 
 # =============================================================================
@@ -208,7 +1048,255 @@ def with_user(func):
     return wrapper
 
 
-def with_connection(func):
+class Connection:
+    """A fake database connection for demonstration."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.closed = False
+
+    def execute(self, query: str) -> list[str]:
+        if self.closed:
+            raise RuntimeError("Connection is closed")
+        return [f"Result for: {query}"]
+
+    def is_alive(self) -> bool:
+        """Cheap liveness check, used by ConnectionPool on checkout."""
+        return not self.closed
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class PoolStats(NamedTuple):
+    size: int
+    in_use: int
+    idle: int
+    acquisitions: int
+    waits: int
+    wait_time: float
+
+
+class ConnectionPool:
+    """
+    A bounded, thread-safe pool of connections.
+
+    At most max_size connections are open at once. acquire() hands out the
+    most recently released idle connection that passes the health check,
+    opens a new one while the pool is below max_size, and otherwise blocks
+    until another caller releases one. acquire_async() runs the same steps
+    on a private executor of at most max_size threads, so neither the
+    factory nor the health check ever runs on the event loop.
+
+    Example:
+        pool = ConnectionPool(lambda: Connection("postgres://db"), max_size=4)
+        with pool.connection(timeout=1.0) as conn:
+            conn.execute("SELECT 1")
+        pool.stats()  # PoolStats(size=1, in_use=0, idle=1, ...)
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Connection],
+        max_size: int = 10,
+        health_check: Callable[[Connection], bool] | None = None,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be positive")
+        self._factory = factory
+        self.max_size = max_size
+        self._health_check = health_check if health_check is not None else Connection.is_alive
+        self._cond = threading.Condition()
+        self._idle: deque[Connection] = deque()
+        self._in_use: set[Connection] = set()
+        self._size = 0
+        self._closed = False
+        self._acquisitions = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _reserve(self, deadline: float | None) -> Connection | None:
+        """
+        Wait for an idle connection or a free slot. Caller holds the lock.
+
+        Returns the idle connection, or None if a slot was reserved for a
+        new connection that the caller must open. Only calls that actually
+        block count as waits.
+        """
+        if not self._idle and self._size >= self.max_size and not self._closed:
+            started = time.perf_counter()
+            if deadline is not None and deadline <= started:
+                raise TimeoutError(f"No connection available within the timeout (max_size={self.max_size})")
+            self._waits += 1
+            try:
+                while not self._idle and self._size >= self.max_size and not self._closed:
+                    remaining = None if deadline is None else deadline - time.perf_counter()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"No connection available within the timeout (max_size={self.max_size})")
+                    self._cond.wait(remaining)
+            finally:
+                self._wait_time += time.perf_counter() - started
+        if self._closed:
+            raise RuntimeError("Pool is closed")
+        if self._idle:
+            return self._idle.pop()
+        self._size += 1
+        return None
+
+    def _discard(self) -> None:
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def acquire(self, timeout: float | None = None) -> Connection:
+        """
+        Check out a connection.
+
+        timeout=None waits indefinitely, timeout=0 never waits. Raises
+        TimeoutError if no connection became available in time.
+        """
+        return self._acquire(None if timeout is None else time.perf_counter() + timeout)
+
+    def _acquire(self, deadline: float | None) -> Connection:
+        while True:
+            with self._cond:
+                conn = self._reserve(deadline)
+            if conn is None:
+                try:
+                    conn = self._factory()
+                except BaseException:
+                    self._discard()
+                    raise
+                break
+            try:
+                healthy = self._health_check(conn)
+            except BaseException:
+                self._discard()
+                conn.close()
+                raise
+            if healthy:
+                break
+            conn.close()
+            self._discard()
+
+        with self._cond:
+            self._in_use.add(conn)
+            self._acquisitions += 1
+        return conn
+
+    def try_acquire(self) -> Connection | None:
+        """Check out a connection if one is available right now, else return None."""
+        try:
+            return self.acquire(timeout=0)
+        except TimeoutError:
+            return None
+
+    async def acquire_async(self, timeout: float | None = None) -> Connection:
+        """
+        Check out a connection without blocking the event loop.
+
+        The whole checkout, including opening a new connection, runs on the
+        pool's executor. Its max_size threads are enough: when all of them
+        are waiting, every connection is checked out and later callers
+        would have to wait anyway. A connection that arrives after the
+        caller was cancelled or timed out is released again.
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Pool is closed")
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_size, thread_name_prefix="ConnectionPool")
+            job = self._executor.submit(self._acquire, deadline)
+        pending = asyncio.wrap_future(job)
+        try:
+            if timeout is not None and timeout > 0:
+                # Also bounds the time spent queued behind other waiters.
+                return await asyncio.wait_for(asyncio.shield(pending), timeout)
+            return await asyncio.shield(pending)
+        except (asyncio.CancelledError, TimeoutError):
+            if not job.cancel():
+                pending.add_done_callback(self._release_late)
+            raise
+
+    def _release_late(self, done: asyncio.Future[Connection]) -> None:
+        if not done.cancelled() and done.exception() is None:
+            self.release(done.result())
+
+    def release(self, conn: Connection) -> None:
+        """Return a connection to the pool."""
+        with self._cond:
+            if conn not in self._in_use:
+                raise ValueError("Connection was not acquired from this pool")
+            self._in_use.remove(conn)
+            if self._closed:
+                self._size -= 1
+                conn.close()
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout: float | None = None) -> Iterator[Connection]:
+        """Acquire a connection for the duration of a with-block."""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        """Close idle connections now and in-use ones as they are released."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._idle.pop().close()
+                self._size -= 1
+            self._cond.notify_all()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            # Queued checkouts still run and fail with "Pool is closed".
+            executor.shutdown(wait=False)
+
+    def stats(self) -> PoolStats:
+        with self._cond:
+            return PoolStats(
+                self._size,
+                len(self._in_use),
+                len(self._idle),
+                self._acquisitions,
+                self._waits,
+                self._wait_time,
+            )
+
+
+_default_pool: ConnectionPool | None = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_pool() -> ConnectionPool:
+    """Return the process-wide pool used by with_connection when none is given."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ConnectionPool(lambda: Connection("fake://database"))
+        return _default_pool
+
+
+@overload
+def with_connection(func: Callable[Concatenate[Connection, P], T]) -> Callable[P, T]: ...
+@overload
+def with_connection(
+    *, pool: ConnectionPool | None = None, timeout: float | None = None
+) -> Callable[[Callable[Concatenate[Connection, P], T]], Callable[P, T]]: ...
+
+def with_connection(
+    func: Callable[Concatenate[Connection, P], T] | None = None,
+    *,
+    pool: ConnectionPool | None = None,
+    timeout: float | None = None,
+) -> Callable[P, T] | Callable[[Callable[Concatenate[Connection, P], T]], Callable[P, T]]:
     """
     A decorator that injects a database connection as the first argument.
 
@@ -224,29 +1312,41 @@ def with_connection(func):
     This is the opposite of with_user - we're REMOVING a parameter from
     the public signature by providing it automatically.
 
-    TODO: Add type hints using Concatenate.
-    - Original func: Callable[Concatenate[Connection, P], T]
-    - Returned func: Callable[P, T]
+    The connection is checked out of `pool` (get_default_pool() if not
+    given) for the duration of the call and released afterwards, waiting
+    at most `timeout` seconds for one to become free:
 
-    The Connection parameter is "consumed" by the decorator.
-    """
+        @with_connection(pool=ConnectionPool(make_conn, max_size=4), timeout=2.0)
+        def query_orders(conn: Connection, user_id: int) -> list[str]: ...
 
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        # In real code, you'd get this from a connection pool
-        conn = Connection("fake://database")
-        return func(conn, *args, **kwargs)
-    return wrapper
-
-
-class Connection:
-    """A fake database connection for demonstration."""
+    Coroutine functions hold the connection for as long as the call is
+    awaited and check it out with pool.acquire_async(), so the event loop
+    is never blocked.
+    """
+    def decorator(func: Callable[Concatenate[Connection, P], T]) -> Callable[P, T]:
+        if inspect.iscoroutinefunction(func):
+            async_func = cast(Callable[Concatenate[Connection, P], Awaitable[Any]], func)
+
+            @wraps(func)
+            async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+                source = pool if pool is not None else get_default_pool()
+                conn = await source.acquire_async(timeout)
+                try:
+                    return await async_func(conn, *args, **kwargs)
+                finally:
+                    source.release(conn)
+            return cast(Callable[P, T], async_wrapper)
 
-    def __init__(self, url: str):
-        self.url = url
+        @wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            source = pool if pool is not None else get_default_pool()
+            with source.connection(timeout) as conn:
+                return func(conn, *args, **kwargs)
+        return wrapper
 
-    def execute(self, query: str) -> list[str]:
-        return [f"Result for: {query}"]
+    if func is not None:
+        return decorator(func)
+    return decorator
 
 
 # =============================================================================
@@ -254,7 +1354,7 @@ class Connection:
 # =============================================================================
 
 
-def validate_args(validator):
+def validate_args(validator: Callable[[Any], bool]) -> Callable[[Callable[P, T]], Callable[P, T]]:
     """
     A decorator factory that validates all arguments before calling the function.
 
@@ -269,25 +1369,46 @@ def validate_args(validator):
         process(1, 2)   # OK, returns 3
         process(-1, 2)  # Raises ValueError
 
-    TODO: Add type hints.
-    - validator is a Callable that takes any value and returns bool
-    - The decorated function preserves its signature
+    For coroutine functions the ValueError is raised when the call is awaited.
     """
-    def decorator(func):
+    def check(args: tuple[Any, ...], kwargs: dict[str, Any]) -> None:
+        for arg in args:
+            if not validator(arg):
+                raise ValueError(f"Validation failed for {arg}")
+        for key, value in kwargs.items():
+            if not validator(value):
+                raise ValueError(f"Validation failed for {key}={value}")
+
+    def decorator(func: Callable[P, T]) -> Callable[P, T]:
+        if inspect.iscoroutinefunction(func):
+            async_func = cast(Callable[P, Awaitable[Any]], func)
+
+            @wraps(func)
+            async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+                check(args, kwargs)
+                return await async_func(*args, **kwargs)
+            return cast(Callable[P, T], async_wrapper)
+
         @wraps(func)
-        def wrapper(*args, **kwargs):
-            for arg in args:
-                if not validator(arg):
-                    raise ValueError(f"Validation failed for {arg}")
-            for key, value in kwargs.items():
-                if not validator(value):
-                    raise ValueError(f"Validation failed for {key}={value}")
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            check(args, kwargs)
             return func(*args, **kwargs)
         return wrapper
     return decorator
 
 
-def transform_result(transformer):
+class ResultTransformer(Protocol[T_contra, U_co]):
+    """The decorator returned by transform_result."""
+
+    @overload
+    def __call__(
+        self, func: Callable[P, Coroutine[Any, Any, T_contra]]
+    ) -> Callable[P, Coroutine[Any, Any, U_co]]: ...
+    @overload
+    def __call__(self, func: Callable[P, T_contra]) -> Callable[P, U_co]: ...
+
+
+def transform_result(transformer: Callable[[T], U]) -> ResultTransformer[T, U]:
     """
     A decorator that transforms the result of a function.
 
@@ -298,20 +1419,23 @@ def transform_result(transformer):
 
         greet("world")  # Returns "HELLO, WORLD"
 
-    TODO: Add type hints.
-    - transformer: Callable[[T], U]
-    - func: Callable[P, T]
-    - result: Callable[P, U]
-
-    This decorator changes the return type!
+    This decorator changes the return type! For coroutine functions the
+    transformer is applied to the awaited result.
     """
-    def decorator(func):
+    def decorator(func: Callable[P, Any]) -> Callable[P, Any]:
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> U:
+                result = await func(*args, **kwargs)
+                return transformer(result)
+            return async_wrapper
+
         @wraps(func)
-        def wrapper(*args, **kwargs):
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> U:
             result = func(*args, **kwargs)
             return transformer(result)
         return wrapper
-    return decorator
+    return cast(ResultTransformer[T, U], decorator)
 
 
 # =============================================================================
@@ -26,7 +26,27 @@ Run tests with: pytest tests/test_ex06.py -v
 Run type checker with: mypy exercises/ex06_typeddict_and_guards.py
 """
 
-from typing import TypedDict, NotRequired, Required, TypeGuard, Any
+from typing import (
+    TypedDict,
+    NotRequired,
+    Required,
+    TypeGuard,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Literal,
+    Union,
+    cast,
+    get_args,
+    get_origin,
+    get_type_hints,
+    is_typeddict,
+)
+from array import array
+from collections import Counter
+from operator import itemgetter
+from types import UnionType
 
 
 # =============================================================================
@@ -36,14 +56,9 @@ from typing import TypedDict, NotRequired, Required, TypeGuard, Any
 # TypedDict creates a dict type with specific keys and value types.
 # All keys are required by default.
 
-# TODO: Define a TypedDict called 'Point2D' with:
-#       - x: int
-#       - y: int
-#
-# Example:
-#   class Point2D(TypedDict):
-#       x: int
-#       y: int
+class Point2D(TypedDict):
+    x: int
+    y: int
 
 
 def distance_from_origin(point):
@@ -80,18 +95,11 @@ def translate_point(point, dx, dy):
 # Use NotRequired for keys that may or may not be present.
 # Use Required to mark keys as required in a total=False TypedDict.
 
-# TODO: Define a TypedDict called 'UserProfile' with:
-#       - id: int (required)
-#       - name: str (required)
-#       - email: NotRequired[str] (optional)
-#       - age: NotRequired[int] (optional)
-#
-# Hint:
-#   class UserProfile(TypedDict):
-#       id: int
-#       name: str
-#       email: NotRequired[str]
-#       age: NotRequired[int]
+class UserProfile(TypedDict):
+    id: int
+    name: str
+    email: NotRequired[str]
+    age: NotRequired[int]
 
 
 def get_display_name(user):
@@ -145,22 +153,22 @@ def create_user(user_id, name, email=None, age=None):
 
 # TypedDicts can contain other TypedDicts for complex structures.
 
-# TODO: Define these TypedDicts for an API response:
-#
-# class Address(TypedDict):
-#     street: str
-#     city: str
-#     country: str
-#
-# class Company(TypedDict):
-#     name: str
-#     address: Address
-#
-# class Employee(TypedDict):
-#     id: int
-#     name: str
-#     company: Company
-#     remote: NotRequired[bool]
+class Address(TypedDict):
+    street: str
+    city: str
+    country: str
+
+
+class Company(TypedDict):
+    name: str
+    address: Address
+
+
+class Employee(TypedDict):
+    id: int
+    name: str
+    company: Company
+    remote: NotRequired[bool]
 
 
 def get_employee_city(employee):
@@ -231,7 +239,186 @@ def create_employee(emp_id, name, company_name, street, city, country, remote=No
 # After: if is_string(x):  # type checker now knows x is str
 
 
-def is_point2d(value):
+# -----------------------------------------------------------------------------
+# Compiled validators
+# -----------------------------------------------------------------------------
+
+# Checking a TypedDict by hand means re-deciding, on every call, which keys
+# are required and what each value must be. compile_validator() reads the
+# annotations once and generates a straight-line function for the type:
+#
+#   def validate_Point2D(value):
+#       if not isinstance(value, dict):
+#           return False
+#       v0 = value.get('x')
+#       if not (type(v0) is int or _is_int(v0)):
+#           return False
+#       ...
+#       return True
+#
+# A missing required key reads as None, which the check rejects; only keys
+# whose type admits None compare against a _MISSING sentinel. Optional keys
+# are checked only when present.
+#
+# Supported annotations: int, float, str, bool, None, Any/object, Literal,
+# unions, list[X], dict[K, V], nested TypedDicts and plain classes. Extra
+# keys are allowed, as in TypedDict itself. bool is not accepted for int.
+
+_MISSING: Any = object()
+_VALIDATORS: dict[Any, Callable[[object], bool]] = {}
+
+
+def _is_int(value: object) -> TypeGuard[int]:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _bind(namespace: dict[str, Any], obj: object) -> str:
+    """Store obj in the generated code's namespace and return its name."""
+    name = f"_c{len(namespace)}"
+    namespace[name] = obj
+    return name
+
+
+def _check_expr(tp: Any, var: str, namespace: dict[str, Any]) -> str:
+    """Return a Python expression that is true when `var` matches `tp`."""
+    if tp is Any or tp is object:
+        return "True"
+    if tp is None or tp is type(None):
+        return f"{var} is None"
+    if tp is bool:
+        return f"type({var}) is bool"
+    if tp is int:
+        return f"(type({var}) is int or _is_int({var}))"
+    if tp is float:
+        return f"(isinstance({var}, float) or _is_int({var}))"
+    if tp is str:
+        return f"isinstance({var}, str)"
+    if is_typeddict(tp):
+        return f"{_bind(namespace, compile_validator(tp))}({var})"
+
+    origin = get_origin(tp)
+    args = get_args(tp)
+    if origin is Literal:
+        by_type: dict[type, list[Any]] = {}
+        for literal in args:
+            by_type.setdefault(type(literal), []).append(literal)
+        parts = []
+        for literal_type, values in by_type.items():
+            if literal_type is type(None):
+                parts.append(f"{var} is None")
+                continue
+            # Inline builtin literals as constants; bind anything else (enums).
+            builtin = literal_type in (str, int, bytes, bool)
+            type_name = literal_type.__name__ if builtin else _bind(namespace, literal_type)
+            if len(values) == 1:
+                constant = repr(values[0]) if builtin else _bind(namespace, values[0])
+                parts.append(f"(type({var}) is {type_name} and {var} == {constant})")
+            else:
+                choices = _bind(namespace, frozenset(values))
+                parts.append(f"(type({var}) is {type_name} and {var} in {choices})")
+        return "(" + " or ".join(parts) + ")"
+    if origin is Union or origin is UnionType:
+        return "(" + " or ".join(_check_expr(arg, var, namespace) for arg in args) + ")"
+    if origin is list:
+        if not args:
+            return f"isinstance({var}, list)"
+        item_check = _bind(namespace, _compile_check(args[0]))
+        return f"(isinstance({var}, list) and all(map({item_check}, {var})))"
+    if origin is dict:
+        if not args:
+            return f"isinstance({var}, dict)"
+        key_check = _bind(namespace, _compile_check(args[0]))
+        value_check = _bind(namespace, _compile_check(args[1]))
+        return (
+            f"(isinstance({var}, dict) and all(map({key_check}, {var}))"
+            f" and all(map({value_check}, {var}.values())))"
+        )
+    if isinstance(tp, type):
+        return f"isinstance({var}, {_bind(namespace, tp)})"
+    raise TypeError(f"Cannot compile a validator for {tp!r}")
+
+
+def _compile_check(tp: Any) -> Callable[[object], bool]:
+    """Compile a one-argument checker for any supported annotation."""
+    namespace: dict[str, Any] = {"_is_int": _is_int}
+    expr = _check_expr(tp, "v", namespace)
+    exec(f"def check(v):\n    return {expr}", namespace)
+    return cast(Callable[[object], bool], namespace["check"])
+
+
+def _accepts_none(tp: Any) -> bool:
+    """Whether the check for `tp` lets None through, read from the annotation alone."""
+    if tp is Any or tp is object or tp is None or tp is type(None):
+        return True
+    origin = get_origin(tp)
+    if origin is Literal:
+        return None in get_args(tp)
+    if origin is Union or origin is UnionType:
+        return any(_accepts_none(arg) for arg in get_args(tp))
+    return False
+
+
+def _compile_typeddict(td: Any) -> Callable[[object], bool]:
+    hints = get_type_hints(td)
+    required = td.__required_keys__
+    namespace: dict[str, Any] = {"_MISSING": _MISSING, "_is_int": _is_int}
+    name = f"validate_{td.__name__}"
+    lines = [
+        f"def {name}(value):",
+        "    if not isinstance(value, dict):",
+        "        return False",
+    ]
+    for index, (key, tp) in enumerate(hints.items()):
+        var = f"v{index}"
+        check = _check_expr(tp, var, namespace)
+        if key not in required:
+            lines.append(f"    if {key!r} in value:")
+            lines.append(f"        {var} = value[{key!r}]")
+            lines.append(f"        if not {check}:")
+            lines.append("            return False")
+        elif _accepts_none(tp):
+            lines.append(f"    {var} = value.get({key!r}, _MISSING)")
+            lines.append(f"    if {var} is _MISSING or not {check}:")
+            lines.append("        return False")
+        else:
+            # The check rejects None, so a missing key read as None fails it.
+            lines.append(f"    {var} = value.get({key!r})")
+            lines.append(f"    if not {check}:")
+            lines.append("        return False")
+    lines.append("    return True")
+    exec("\n".join(lines), namespace)
+    return cast(Callable[[object], bool], namespace[name])
+
+
+def compile_validator(td: Any) -> Callable[[object], bool]:
+    """
+    Return a fast validation function for a TypedDict, compiled once per type.
+
+    Example:
+        validate = compile_validator(Employee)
+        validate({"id": 1, "name": "A", "company": {...}}) -> True
+    """
+    try:
+        return _VALIDATORS[td]
+    except KeyError:
+        pass
+    if not is_typeddict(td):
+        raise TypeError(f"{td!r} is not a TypedDict")
+    # Self-referencing TypedDicts see this forwarder while being compiled.
+    _VALIDATORS[td] = lambda value: _VALIDATORS[td](value)
+    try:
+        validator = _compile_typeddict(td)
+    except BaseException:
+        del _VALIDATORS[td]
+        raise
+    _VALIDATORS[td] = validator
+    return validator
+
+
+_validate_point2d = compile_validator(Point2D)
+
+
+def is_point2d(value: object) -> TypeGuard[Point2D]:
     """
     Check if a value is a valid Point2D dictionary.
 
@@ -242,16 +429,14 @@ def is_point2d(value):
         is_point2d({"x": 1}) -> False
         is_point2d({"x": "1", "y": 2}) -> False
         is_point2d([1, 2]) -> False
-
-    TODO:
-    1. Add return type TypeGuard[Point2D]
-    2. Add parameter type hint (use object or Any)
-    3. Implement the validation logic
     """
-    pass  # TODO: Implement
+    return _validate_point2d(value)
+
 
+_validate_user_profile = compile_validator(UserProfile)
 
-def is_user_profile(value):
+
+def is_user_profile(value: object) -> TypeGuard[UserProfile]:
     """
     Check if a value is a valid UserProfile dictionary.
 
@@ -263,10 +448,8 @@ def is_user_profile(value):
         is_user_profile({"id": 1, "name": "Alice", "email": "a@b.com"}) -> True
         is_user_profile({"id": "1", "name": "Alice"}) -> False (id must be int)
         is_user_profile({"name": "Alice"}) -> False (missing id)
-
-    TODO: Add TypeGuard return type and implement validation.
     """
-    pass  # TODO: Implement
+    return _validate_user_profile(value)
 
 
 # =============================================================================
@@ -286,9 +469,8 @@ def process_points(data):
 
     TODO:
     1. Add type hints: takes list[Any], returns list[Point2D]
-    2. Use is_point2d to filter valid points
     """
-    pass  # TODO: Implement
+    return [item for item in data if is_point2d(item)]
 
 
 def safe_get_distance(data):
@@ -304,9 +486,139 @@ def safe_get_distance(data):
 
     TODO:
     1. Add type hints: takes Any, returns float | None
-    2. Use is_point2d to guard before calculating
     """
-    pass  # TODO: Implement
+    if is_point2d(data):
+        return distance_from_origin(data)
+    return None
+
+
+# -----------------------------------------------------------------------------
+# Columnar batches of points
+# -----------------------------------------------------------------------------
+
+# Handling millions of points one dict at a time allocates a dict per point
+# per step. Point2DBatch keeps the coordinates in two int64 columns instead,
+# and only builds dicts when asked for them.
+
+try:
+    import numpy as np  # type: ignore[import-not-found, unused-ignore]
+except ImportError:
+    np = None  # type: ignore[assignment, unused-ignore]
+
+_INT64_MIN = -(2 ** 63)
+_INT64_MAX = 2 ** 63 - 1
+
+
+def _check_shift(column: Any, delta: int) -> None:
+    """Raise OverflowError if adding delta would take a NumPy int64 column out of range."""
+    if not _INT64_MIN <= delta <= _INT64_MAX:
+        raise OverflowError(f"shift {delta} does not fit in int64")
+    if len(column) and (
+        (delta > 0 and column.max() > _INT64_MAX - delta) or (delta < 0 and column.min() < _INT64_MIN - delta)
+    ):
+        raise OverflowError(f"shifting by {delta} overflows int64")
+
+
+class Point2DBatch:
+    """
+    Many Point2D values stored as two array('q') columns.
+
+    Results match the per-dict functions: distances() agrees with
+    distance_from_origin and translate() with translate_point. With NumPy,
+    distances are computed in float64, which is exact for coordinates up
+    to 2**26 in magnitude.
+
+    Example:
+        batch = Point2DBatch.from_points([{"x": 3, "y": 4}, {"x": 0, "y": 0}])
+        batch.distances() -> array('d', [5.0, 0.0])
+        batch.translate(1, 1).to_points() -> [{"x": 4, "y": 5}, {"x": 1, "y": 1}]
+    """
+
+    def __init__(self, xs: array | None = None, ys: array | None = None):
+        self.xs = xs if xs is not None else array("q")
+        self.ys = ys if ys is not None else array("q")
+        if self.xs.typecode != "q" or self.ys.typecode != "q":
+            raise TypeError("columns must be array('q')")
+        if len(self.xs) != len(self.ys):
+            raise ValueError("columns must have the same length")
+
+    @classmethod
+    def from_points(cls, points: Iterable[Any], *, skip_invalid: bool = False) -> "Point2DBatch":
+        """
+        Build a batch from Point2D dicts in a single pass.
+
+        Invalid entries, including coordinates that do not fit in int64,
+        raise ValueError, or are dropped with skip_invalid=True (matching
+        process_points).
+        """
+        xs = array("q")
+        ys = array("q")
+        for index, point in enumerate(points):
+            if isinstance(point, dict):
+                x = point.get("x")
+                y = point.get("y")
+                if (
+                    _is_int(x)
+                    and _is_int(y)
+                    and _INT64_MIN <= x <= _INT64_MAX
+                    and _INT64_MIN <= y <= _INT64_MAX
+                ):
+                    xs.append(x)
+                    ys.append(y)
+                    continue
+            if not skip_invalid:
+                raise ValueError(f"Invalid Point2D at index {index}: {point!r}")
+        return cls(xs, ys)
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def __getitem__(self, index: int) -> Point2D:
+        return {"x": self.xs[index], "y": self.ys[index]}
+
+    def __iter__(self) -> Iterator[Point2D]:
+        for x, y in zip(self.xs, self.ys):
+            yield {"x": x, "y": y}
+
+    def to_points(self) -> list[Point2D]:
+        return list(self)
+
+    def as_numpy(self) -> tuple[Any, Any]:
+        """Return zero-copy int64 NumPy views of the x and y columns."""
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        return np.frombuffer(self.xs, dtype=np.int64), np.frombuffer(self.ys, dtype=np.int64)
+
+    def distances(self, use_numpy: bool | None = None) -> array:
+        """Distance from the origin of every point, as array('d')."""
+        if use_numpy is None:
+            use_numpy = np is not None
+        if use_numpy:
+            x, y = self.as_numpy()
+            x = x.astype(np.float64)
+            y = y.astype(np.float64)
+            return array("d", np.sqrt(x * x + y * y).tobytes())
+        return array("d", [(x ** 2 + y ** 2) ** 0.5 for x, y in zip(self.xs, self.ys)])
+
+    def translate(self, dx: int, dy: int, use_numpy: bool | None = None) -> "Point2DBatch":
+        """
+        Return a new batch with every point moved by (dx, dy).
+
+        Raises OverflowError if a moved coordinate does not fit in int64,
+        with or without NumPy (whose own addition would wrap around).
+        """
+        if use_numpy is None:
+            use_numpy = np is not None
+        if use_numpy:
+            x, y = self.as_numpy()
+            _check_shift(x, dx)
+            _check_shift(y, dy)
+            xs = array("q", (x + dx).tobytes())
+            ys = array("q", (y + dy).tobytes())
+        else:
+            xs = array("q", [x + dx for x in self.xs])
+            ys = array("q", [y + dy for y in self.ys])
+        return Point2DBatch(xs, ys)
 
 
 # =============================================================================
@@ -316,55 +628,106 @@ def safe_get_distance(data):
 # A common pattern is using a "type" or "kind" field to distinguish
 # between different TypedDict variants.
 
-# TODO: Define these TypedDicts for different message types:
-#
-# class TextMessage(TypedDict):
-#     type: Literal["text"]
-#     content: str
-#
-# class ImageMessage(TypedDict):
-#     type: Literal["image"]
-#     url: str
-#     alt_text: NotRequired[str]
-#
-# class VideoMessage(TypedDict):
-#     type: Literal["video"]
-#     url: str
-#     duration: int  # seconds
-#
-# Message = TextMessage | ImageMessage | VideoMessage
 
-from typing import Literal
+class TextMessage(TypedDict):
+    type: Literal["text"]
+    content: str
 
 
-def is_text_message(msg):
-    """
-    Check if a message is a TextMessage.
+class ImageMessage(TypedDict):
+    type: Literal["image"]
+    url: str
+    alt_text: NotRequired[str]
 
-    TODO: Add TypeGuard[TextMessage] return type and implement.
-    """
-    pass  # TODO: Implement
 
+class VideoMessage(TypedDict):
+    type: Literal["video"]
+    url: str
+    duration: int  # seconds
 
-def is_image_message(msg):
-    """
-    Check if a message is an ImageMessage.
 
-    TODO: Add TypeGuard[ImageMessage] return type and implement.
-    """
-    pass  # TODO: Implement
+Message = TextMessage | ImageMessage | VideoMessage
+
+
+_validate_text_message = compile_validator(TextMessage)
+
+
+def is_text_message(msg: object) -> TypeGuard[TextMessage]:
+    """Check if a message is a TextMessage."""
+    return _validate_text_message(msg)
+
+
+_validate_image_message = compile_validator(ImageMessage)
+
+
+def is_image_message(msg: object) -> TypeGuard[ImageMessage]:
+    """Check if a message is an ImageMessage."""
+    return _validate_image_message(msg)
+
+
+_validate_video_message = compile_validator(VideoMessage)
+
+
+def is_video_message(msg: object) -> TypeGuard[VideoMessage]:
+    """Check if a message is a VideoMessage."""
+    return _validate_video_message(msg)
+
+
+# -----------------------------------------------------------------------------
+# Dispatch on the discriminator
+# -----------------------------------------------------------------------------
 
+# Trying is_text_message, is_image_message, ... in turn costs one guard per
+# variant for every message. Every variant has a distinct "type" Literal, so
+# a dict keyed on that tag routes a message to its handler in one lookup.
 
-def is_video_message(msg):
+MessageHandler = Callable[[Any], str]
+
+# Maps each "type" tag to the TypedDict variant that declares it.
+MESSAGE_TYPES: dict[str, type] = {
+    tag: variant
+    for variant in get_args(Message)
+    for tag in get_args(get_type_hints(variant)["type"])
+}
+
+_PREVIEW_HANDLERS: dict[str, MessageHandler] = {}
+
+
+def preview_handler(kind: str) -> Callable[[MessageHandler], MessageHandler]:
     """
-    Check if a message is a VideoMessage.
+    Register the preview formatter for messages whose "type" is `kind`.
 
-    TODO: Add TypeGuard[VideoMessage] return type and implement.
+    Example:
+        @preview_handler("text")
+        def _preview_text(message: TextMessage) -> str: ...
     """
-    pass  # TODO: Implement
+    if kind not in MESSAGE_TYPES:
+        raise ValueError(f"Unknown message type: {kind!r}")
+
+    def register(handler: MessageHandler) -> MessageHandler:
+        _PREVIEW_HANDLERS[kind] = handler
+        return handler
+
+    return register
+
+
+@preview_handler("text")
+def _preview_text(message: TextMessage) -> str:
+    return f"Text: {message['content']}"
+
 
+@preview_handler("image")
+def _preview_image(message: ImageMessage) -> str:
+    return f"Image: {message.get('alt_text', '[no description]')}"
 
-def get_message_preview(message):
+
+@preview_handler("video")
+def _preview_video(message: VideoMessage) -> str:
+    minutes, seconds = divmod(message["duration"], 60)
+    return f"Video: {minutes}:{seconds:02d}"
+
+
+def get_message_preview(message: Message) -> str:
     """
     Get a preview string for any message type.
 
@@ -381,19 +744,31 @@ def get_message_preview(message):
         get_message_preview({"type": "video", "url": "http://...", "duration": 120})
         -> "Video: 2:00"
 
-    TODO:
-    1. Add type hint for message (use the Message union type)
-    2. Implement using the type guards or isinstance checks
-    3. Format duration as M:SS
+    Raises ValueError for a message with an unknown "type".
+    """
+    try:
+        handler = _PREVIEW_HANDLERS[message["type"]]
+    except KeyError:
+        raise ValueError(f"Unknown message type: {message.get('type')!r}") from None
+    return handler(message)
+
+
+def preview_many(messages: Iterable[Message]) -> Iterator[str]:
     """
-    pass  # TODO: Implement
+    Lazily yield the preview of each message.
 
+    Nothing is formatted until the result is iterated, so this works on
+    unbounded streams.
+    """
+    return map(get_message_preview, messages)
 
-def count_messages_by_type(messages):
+
+def count_messages_by_type(messages: Iterable[Message]) -> dict[str, int]:
     """
-    Count how many messages of each type are in a list.
+    Count how many messages of each type are in an iterable.
 
-    Returns a dict with counts for each type.
+    Returns a dict with counts for each type. The messages are consumed one
+    at a time, so generators and other streams are never materialized.
 
     Example:
         count_messages_by_type([
@@ -403,6 +778,16 @@ def count_messages_by_type(messages):
         ])
         -> {"text": 2, "image": 1, "video": 0}
 
-    TODO: Add type hints and implement.
-    """
-    pass  # TODO: Implement
+    Raises ValueError if a message has an unknown or missing "type", as
+    get_message_preview() does.
+    """
+    try:
+        counts = Counter(map(itemgetter("type"), messages))
+    except KeyError as exc:
+        if exc.args != ("type",):
+            raise
+        raise ValueError("Unknown message type: None") from None
+    unknown = counts.keys() - MESSAGE_TYPES.keys()
+    if unknown:
+        raise ValueError(f"Unknown message types: {sorted(unknown, key=repr)}")
+    return {kind: counts[kind] for kind in MESSAGE_TYPES}
@@ -28,7 +28,11 @@ Run tests with: pytest tests/test_ex07.py -v
 Run type checker with: mypy exercises/ex07_classvar_final_self.py
 """
 
-from typing import ClassVar, Final, final, Self
+from typing import AsyncIterator, Callable, ClassVar, Final, Iterator, final, Self
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+import asyncio
+import threading
 
 
 # =============================================================================
@@ -132,17 +136,74 @@ DEFAULT_HOST = "localhost"
 SUPPORTED_PROTOCOLS = ("http", "https", "ws", "wss")
 
 
+class _ThreadWaiter:
+    """A thread blocked in DatabasePool.acquire(), waiting for a handoff."""
+
+    __slots__ = ("event", "conn")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.conn: str | None = None
+
+    def deliver(self, conn: str) -> bool:
+        self.conn = conn
+        self.event.set()
+        return True
+
+
+class _AsyncWaiter:
+    """
+    A coroutine suspended in DatabasePool.acquire_async().
+
+    A connection delivered after the coroutine gave up is passed to
+    `give_back` instead.
+    """
+
+    __slots__ = ("loop", "future", "give_back")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, give_back: Callable[[str], None]) -> None:
+        self.loop = loop
+        self.future: asyncio.Future[str] = loop.create_future()
+        self.give_back = give_back
+
+    def deliver(self, conn: str) -> bool:
+        if self.future.done():
+            return False
+
+        def resolve() -> None:
+            # The waiter may have been cancelled after we chose it.
+            if self.future.done():
+                self.give_back(conn)
+            else:
+                self.future.set_result(conn)
+
+        self.loop.call_soon_threadsafe(resolve)
+        return True
+
+
 class DatabasePool:
     """
     A database connection pool with immutable configuration.
 
     Some values are set once and should never change.
 
+    Released connections go on a free-list and are handed out again before
+    new ones are created; checked-out connections live in a set. Both
+    acquire() and release() are O(1). When the pool is exhausted, callers
+    can wait: a release hands the connection straight to the oldest waiting
+    thread or coroutine.
+
     Example:
         pool = DatabasePool("postgres://localhost/db", max_size=10)
         pool.connection_string  # Can read
         pool.connection_string = "..."  # Should be type error!
 
+        conn = pool.acquire(timeout=1.0)  # None if still exhausted after 1s
+        with pool.connection() as conn:  # released even on error
+            ...
+        async with pool.connection_async(timeout=1.0) as conn:
+            ...
+
     TODO:
     1. Add Final type hints where values shouldn't change after __init__
     2. Consider which attributes are truly immutable
@@ -154,26 +215,120 @@ class DatabasePool:
         self.max_size = max_size  # TODO: Final[int]
 
         # These can change during runtime
-        self.current_size = 0  # Not Final - changes as connections are added
-        self._connections = []  # Not Final - modified by acquire/release
-
-    def acquire(self):
-        """Acquire a connection from the pool."""
-        # TODO: Add return type (str | None)
-        if self.current_size < self.max_size:
-            self.current_size += 1
-            conn = f"conn_{self.current_size}"
-            self._connections.append(conn)
-            return conn
-        return None
-
-    def release(self, conn):
+        self.current_size = 0  # Not Final - number of connections checked out
+        self._created = 0
+        self._free: deque[str] = deque()
+        self._in_use: set[str] = set()
+        # Insertion-ordered, so the oldest waiter is served first, and a waiter
+        # that gives up is removed in O(1).
+        self._waiters: OrderedDict[_ThreadWaiter | _AsyncWaiter, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _try_acquire(self) -> str | None:
+        """Take a free or new connection without waiting. Caller holds the lock."""
+        if self._free:
+            conn = self._free.pop()
+        elif self._created < self.max_size:
+            self._created += 1
+            conn = f"conn_{self._created}"
+        else:
+            return None
+        self._in_use.add(conn)
+        self.current_size += 1
+        return conn
+
+    def acquire(self, timeout: float | None = 0) -> str | None:
+        """
+        Acquire a connection from the pool.
+
+        By default this never waits and returns None if the pool is
+        exhausted. Pass a timeout in seconds to wait for a release, or
+        timeout=None to wait indefinitely.
+        """
+        with self._lock:
+            conn = self._try_acquire()
+            if conn is not None or timeout == 0:
+                return conn
+            waiter = _ThreadWaiter()
+            self._waiters[waiter] = None
+
+        if waiter.event.wait(timeout):
+            return waiter.conn
+        with self._lock:
+            # Timed out, unless a release handed over a connection meanwhile.
+            self._waiters.pop(waiter, None)
+        return waiter.conn
+
+    async def acquire_async(self, timeout: float | None = None) -> str | None:
+        """
+        Acquire a connection without blocking the event loop.
+
+        Waits up to timeout seconds (indefinitely if None) and returns None
+        if no connection was released in time.
+        """
+        with self._lock:
+            conn = self._try_acquire()
+            if conn is not None or timeout == 0:
+                return conn
+            waiter = _AsyncWaiter(asyncio.get_running_loop(), self.release)
+            self._waiters[waiter] = None
+
+        try:
+            return await asyncio.wait_for(waiter.future, timeout)
+        except TimeoutError:
+            # A release may have raced with the timeout; keep what it handed us.
+            if waiter.future.done() and not waiter.future.cancelled():
+                return waiter.future.result()
+            return None
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release(waiter.future.result())
+            raise
+        finally:
+            # Gone already if a release picked it; otherwise it gave up.
+            with self._lock:
+                self._waiters.pop(waiter, None)
+
+    def release(self, conn: str) -> None:
         """Release a connection back to the pool."""
-        # TODO: Add type hints
-        if conn in self._connections:
-            self._connections.remove(conn)
+        with self._lock:
+            if conn not in self._in_use:
+                return
+            while self._waiters:
+                waiter, _ = self._waiters.popitem(last=False)
+                if waiter.deliver(conn):
+                    return
+            self._in_use.remove(conn)
+            self._free.append(conn)
             self.current_size -= 1
 
+    @contextmanager
+    def connection(self, timeout: float | None = None) -> Iterator[str]:
+        """
+        Hold a connection for the duration of a with-block.
+
+        Waits like acquire(timeout) and raises TimeoutError if the pool stays
+        exhausted. The connection is always released on exit.
+        """
+        conn = self.acquire(timeout)
+        if conn is None:
+            raise TimeoutError(f"No connection available from pool of {self.max_size}")
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @asynccontextmanager
+    async def connection_async(self, timeout: float | None = None) -> AsyncIterator[str]:
+        """The async-with counterpart of connection()."""
+        conn = await self.acquire_async(timeout)
+        if conn is None:
+            raise TimeoutError(f"No connection available from pool of {self.max_size}")
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
 
 class AppSettings:
     """
@@ -434,6 +589,8 @@ class Shape:
     TODO: Use Self so subclasses return their own type.
     """
 
+    __slots__ = ("x", "y")
+
     def __init__(self, x, y):
         self.x = x  # TODO: Add type hints
         self.y = y
@@ -470,6 +627,8 @@ class Shape:
 class Circle(Shape):
     """A circle shape."""
 
+    __slots__ = ("radius",)
+
     def __init__(self, x, y, radius=1.0):
         super().__init__(x, y)
         self.radius = radius  # TODO: Add type hint
@@ -492,6 +651,8 @@ class Circle(Shape):
 class Rectangle(Shape):
     """A rectangle shape."""
 
+    __slots__ = ("width", "height")
+
     def __init__(self, x, y, width=1.0, height=1.0):
         super().__init__(x, y)
         self.width = width  # TODO: Add type hints
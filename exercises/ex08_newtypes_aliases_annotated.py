@@ -28,7 +28,9 @@ Run tests with: pytest tests/test_ex08.py -v
 Run type checker with: mypy exercises/ex08_newtypes_aliases_annotated.py
 """
 
-from typing import NewType, TypeAlias, Annotated, cast, Any, get_type_hints
+from typing import NewType, TypeAlias, Annotated, cast, Any, Iterable, Sequence, get_type_hints
+from array import array
+import math
 
 
 # =============================================================================
@@ -177,6 +179,135 @@ def get_layer_polygons(layers, layer_name):
     return layers.get(layer_name, [])
 
 
+# Batch area computation for large polygon sets.
+#
+# Polygons are packed CSR-style: all x coordinates in one contiguous float64
+# array, all y coordinates in another, and an offsets array where polygon i
+# owns vertices offsets[i]:offsets[i + 1]. NumPy is used when installed.
+
+try:
+    import numpy as np  # type: ignore[import-not-found, unused-ignore]
+except ImportError:
+    np = None  # type: ignore[assignment, unused-ignore]
+
+
+class PackedPolygons:
+    """
+    Many polygons stored in contiguous coordinate arrays.
+
+    Example:
+        packed = PackedPolygons.from_polygons([
+            [(0.0, 0.0), (4.0, 0.0), (0.0, 3.0)],
+            [(0.0, 0.0), (2.0, 0.0), (2.0, 2.0), (0.0, 2.0)],
+        ])
+        packed.areas() -> [6.0, 4.0]
+    """
+
+    def __init__(self, xs: array, ys: array, offsets: array):
+        if len(xs) != len(ys):
+            raise ValueError("xs and ys must have the same length")
+        if not offsets or offsets[0] != 0 or offsets[-1] != len(xs):
+            raise ValueError("offsets must start at 0 and end at the vertex count")
+        self.xs = xs
+        self.ys = ys
+        self.offsets = offsets
+
+    @classmethod
+    def from_polygons(cls, polygons: Iterable[Sequence[tuple[float, float]]]) -> "PackedPolygons":
+        xs = array("d")
+        ys = array("d")
+        offsets = array("q", [0])
+        for polygon in polygons:
+            for x, y in polygon:
+                xs.append(x)
+                ys.append(y)
+            offsets.append(len(xs))
+        return cls(xs, ys, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def areas(self, use_numpy: bool | None = None) -> list[float]:
+        """
+        Return the area of every polygon, in packing order.
+
+        use_numpy=None uses NumPy when it is installed. Polygons with fewer
+        than three vertices have area 0.0, as with calculate_area.
+        """
+        if use_numpy is None:
+            use_numpy = np is not None
+        if use_numpy:
+            if np is None:
+                raise RuntimeError("NumPy is not installed")
+            return self._areas_numpy().tolist()
+        return self._areas_python()
+
+    def _areas_numpy(self) -> Any:
+        x = np.frombuffer(self.xs, dtype=np.float64)
+        y = np.frombuffer(self.ys, dtype=np.float64)
+        offsets = np.frombuffer(self.offsets, dtype=np.int64)
+        counts = np.diff(offsets)
+        # Index of each vertex's successor, wrapping at the end of its polygon.
+        successor = np.arange(1, len(x) + 1)
+        nonempty = counts > 0
+        successor[offsets[1:][nonempty] - 1] = offsets[:-1][nonempty]
+        cross = x * y[successor] - x[successor] * y
+        owner = np.repeat(np.arange(len(counts)), counts)
+        sums = np.bincount(owner, weights=cross, minlength=len(counts))
+        # One- and two-vertex polygons cancel out to exactly 0 already.
+        return np.abs(sums) / 2.0
+
+    def _areas_python(self) -> list[float]:
+        # Without NumPy this is about as fast as calling calculate_area per
+        # polygon; the gain is the compact storage, not the arithmetic.
+        xs, ys, offsets = self.xs, self.ys, self.offsets
+        result = []
+        for start, end in zip(offsets, offsets[1:]):
+            if end - start < 3:
+                result.append(0.0)
+                continue
+            px = xs[start:end]
+            py = ys[start:end]
+            area = math.sumprod(px, py[1:] + py[:1]) - math.sumprod(px[1:] + px[:1], py)
+            result.append(abs(area) / 2.0)
+        return result
+
+
+def calculate_layer_areas(layers, use_numpy=None):
+    """
+    Calculate the area of every polygon in every layer in one batch.
+
+    All layers are packed together and computed in a single pass.
+
+    Example:
+        calculate_layer_areas({"bg": [square], "fg": [tri, tri]})
+        -> {"bg": [1.0], "fg": [0.5, 0.5]}
+
+    TODO: Add type hints using the LayeredPolygons alias.
+    """
+    names = list(layers)
+    packed = PackedPolygons.from_polygons(
+        polygon for name in names for polygon in layers[name]
+    )
+    areas = packed.areas(use_numpy)
+    result = {}
+    start = 0
+    for name in names:
+        end = start + len(layers[name])
+        result[name] = areas[start:end]
+        start = end
+    return result
+
+
+def calculate_layer_totals(layers, use_numpy=None):
+    """
+    Calculate the total polygon area of each layer.
+
+    TODO: Add type hints using the LayeredPolygons alias.
+    """
+    return {name: math.fsum(areas) for name, areas in calculate_layer_areas(layers, use_numpy).items()}
+
+
 # =============================================================================
 # PART 3: Annotated - Types with Metadata
 # =============================================================================
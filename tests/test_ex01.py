@@ -8,15 +8,27 @@ The type comments show what mypy should infer - your implementation
 should match these types.
 """
 
+import threading
+import time
+
 import pytest
 from exercises.ex01_generics_basics import (
     first_element,
     identity,
     swap_dict,
+    invert_items,
+    invert_dict,
+    invert_multi,
+    invert_in_place,
     make_pair,
     Box,
     Pair,
+    PairColumns,
     Stack,
+    ArrayStack,
+    make_stack,
+    ConcurrentStack,
+    ConcurrentBox,
 )
 
 
@@ -67,6 +79,68 @@ class TestSwapDict:
         assert result == {}
 
 
+class TestInvert:
+    def test_invert_items_is_lazy(self):
+        def pairs():
+            yield "a", 1
+            raise AssertionError("consumed too far")
+
+        stream = invert_items(pairs())
+        assert next(stream) == (1, "a")
+
+    def test_invert_dict_matches_swap_dict(self):
+        d = {"a": 1, "b": 2, "c": 1}
+        inverse, collisions = invert_dict(d)
+        assert inverse == swap_dict(d) == {1: "c", 2: "b"}
+        assert collisions == 1
+
+    def test_invert_dict_keep_first(self):
+        inverse, collisions = invert_dict({"a": 1, "b": 2, "c": 1}, keep="first")
+        assert inverse == {1: "a", 2: "b"}
+        assert collisions == 1
+
+    @pytest.mark.parametrize("keep", ["first", "last"])
+    def test_invert_dict_from_stream(self, keep):
+        pairs = ((f"k{i}", i % 10) for i in range(100))
+        inverse, collisions = invert_dict(pairs, keep=keep)
+        assert len(inverse) == 10
+        assert collisions == 90
+        assert inverse[3] == ("k3" if keep == "first" else "k93")
+
+    def test_invert_dict_rejects_bad_keep(self):
+        with pytest.raises(ValueError):
+            invert_dict({}, keep="middle")
+
+    def test_invert_multi(self):
+        assert invert_multi({"a": 1, "b": 2, "c": 1}) == {1: ["a", "c"], 2: ["b"]}
+        assert invert_multi(iter([("x", "v"), ("y", "v")])) == {"v": ["x", "y"]}
+
+    def test_invert_in_place(self):
+        d = {"alice": 1, "bob": 2, "carol": 1}
+        same = d
+        assert invert_in_place(d) == 1
+        assert d is same
+        assert d == {1: "carol", 2: "bob"}
+
+    def test_invert_in_place_keep_first(self):
+        d = {"alice": 1, "bob": 2, "carol": 1}
+        assert invert_in_place(d, keep="first") == 1
+        assert d == {1: "alice", 2: "bob"}
+
+    @pytest.mark.parametrize("keep", ["first", "last"])
+    def test_invert_in_place_matches_invert_dict(self, keep):
+        d = {f"k{i}": i % 7 for i in range(100)}
+        expected = invert_dict(d, keep=keep)
+        assert invert_in_place(d, keep=keep) == expected.collisions
+        assert d == expected.inverse
+
+    def test_invert_in_place_overlapping_domains(self):
+        d = {1: 2, 2: 3}
+        with pytest.raises(ValueError):
+            invert_in_place(d)
+        assert d == {1: 2, 2: 3}
+
+
 class TestMakePair:
     def test_mixed_types(self):
         result = make_pair(1, "a")
@@ -119,6 +193,13 @@ class TestPair:
         assert p.first == "a"  # Original unchanged
 
 
+class TestCompactInstances:
+    def test_no_instance_dict(self):
+        assert not hasattr(Box(1), "__dict__")
+        assert not hasattr(Pair("a", 1), "__dict__")
+        assert not hasattr(Pair("a", 1).swap(), "__dict__")
+
+
 class TestStack:
     def test_push_and_pop(self):
         s = Stack()
@@ -154,3 +235,254 @@ class TestStack:
         s.push("a")
         s.push("b")
         assert s.pop() == "b"
+
+
+class TestMakeStack:
+    @pytest.mark.parametrize("item_type, typecode", [(int, "q"), (float, "d")])
+    def test_numeric_types_are_array_backed(self, item_type, typecode):
+        s = make_stack(item_type)
+        assert isinstance(s, ArrayStack)
+        assert s.typecode == typecode
+
+    def test_other_types_fall_back(self):
+        s = make_stack(str)
+        assert type(s) is Stack
+        s.push("a")
+        assert s.pop() == "a"
+
+    def test_array_stack_behaves_like_stack(self):
+        s = make_stack(int)
+        assert s.pop() is None and s.peek() is None and s.is_empty()
+        s.push(1)
+        s.push(2)
+        assert s.peek() == 2
+        assert s.pop() == 2
+        assert len(s) == 1
+
+    def test_rejects_wrong_type(self):
+        s = make_stack(int)
+        with pytest.raises(TypeError):
+            s.push(1.5)
+
+    def test_int_range_is_64_bit(self):
+        s = make_stack(int)
+        s.push(2**63 - 1)
+        s.push(-(2**63))
+        with pytest.raises(OverflowError):
+            s.push(2**63)
+        for bad in ([1, 2, 2**64], (i for i in (1, 2, 2**64)), iter([3, "x"])):
+            with pytest.raises((OverflowError, TypeError)):
+                s.push_many(bad)
+            assert s.pop_many(10) == [-(2**63), 2**63 - 1]
+            s.push_many([2**63 - 1, -(2**63)])
+        big = Stack[int]()
+        big.push(2**100)
+        assert big.pop() == 2**100
+
+    @pytest.mark.parametrize("item_type", [int, str])
+    def test_push_many_pop_many(self, item_type):
+        s = make_stack(item_type)
+        items = [item_type(i) for i in range(10)]
+        s.push_many(items)
+        assert len(s) == 10
+        assert s.pop_many(3) == [item_type(9), item_type(8), item_type(7)]
+        assert s.pop_many(0) == []
+        assert s.pop_many(100) == items[:7][::-1]
+        assert s.is_empty()
+
+    def test_buffer_view(self):
+        s = make_stack(float)
+        s.push_many([1.0, 2.0, 3.0])
+        with s.view() as view:
+            assert view.tolist() == [1.0, 2.0, 3.0]
+            with pytest.raises(BufferError):
+                s.push(4.0)
+        s.push(4.0)
+        assert len(s) == 4
+
+    def test_numpy_zero_copy(self):
+        np = pytest.importorskip("numpy")
+        s = make_stack(int)
+        s.push_many(range(5))
+        values = np.asarray(s)
+        assert values.tolist() == [0, 1, 2, 3, 4]
+        values[0] = 42
+        del values
+        assert s.pop_many(5)[-1] == 42
+
+
+class TestConcurrentStack:
+    def test_behaves_like_stack(self):
+        s = ConcurrentStack()
+        assert s.pop() is None and s.peek() is None
+        s.push_many([1, 2, 3])
+        assert s.peek() == 3
+        assert s.pop_many(2) == [3, 2]
+        assert s.pop_many(5) == [1]
+        assert s.is_empty()
+
+    def test_pop_times_out(self):
+        s = ConcurrentStack()
+        start = time.monotonic()
+        assert s.pop(timeout=0.05) is None
+        assert time.monotonic() - start >= 0.05
+        stats = s.stats()
+        assert stats.waits == 1 and stats.timeouts == 1
+
+    def test_blocking_pop_wakes_on_push(self):
+        s = ConcurrentStack()
+        result = []
+        popper = threading.Thread(target=lambda: result.append(s.pop(timeout=None)))
+        popper.start()
+        time.sleep(0.05)
+        s.push("item")
+        popper.join(timeout=2)
+        assert result == ["item"]
+        assert s.stats().timeouts == 0
+
+    def test_stress_no_lost_items(self):
+        s = ConcurrentStack()
+        producers, consumers, per_producer = 4, 4, 5000
+        received = [[] for _ in range(consumers)]
+
+        def produce(base):
+            for i in range(per_producer):
+                s.push(base + i)
+
+        def consume(out):
+            while (item := s.pop(timeout=0.5)) is not None:
+                out.append(item)
+
+        threads = [threading.Thread(target=consume, args=(out,)) for out in received]
+        threads += [threading.Thread(target=produce, args=(p * per_producer,)) for p in range(producers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=10)
+        items = [item for out in received for item in out]
+        assert sorted(items) == list(range(producers * per_producer))
+
+
+class TestConcurrentBox:
+    def test_compare_and_set(self):
+        box = ConcurrentBox(0)
+        assert box.compare_and_set(0, 1) is True
+        assert box.compare_and_set(0, 2) is False
+        assert box.get() == 1
+        box.set(5)
+        assert box.get() == 5
+        assert box.stats() == (2, 1)
+
+    def test_concurrent_updates(self):
+        box = ConcurrentBox(0)
+        threads, per_thread = 8, 2000
+
+        def work():
+            for _ in range(per_thread):
+                box.update(lambda v: v + 1)
+
+        workers = [threading.Thread(target=work) for _ in range(threads)]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        assert box.get() == threads * per_thread
+        stats = box.stats()
+        assert stats.attempts - stats.failures == threads * per_thread
+
+
+class TestPairColumns:
+    def test_typed_columns(self):
+        from array import array
+
+        pairs = PairColumns([1, 2, 3], [0.5, 1.5, 2.5])
+        assert isinstance(pairs.firsts, array) and pairs.firsts.typecode == "q"
+        assert isinstance(pairs.seconds, array) and pairs.seconds.typecode == "d"
+        mixed = PairColumns([1, "a"], [True, False])
+        assert isinstance(mixed.firsts, list) and isinstance(mixed.seconds, list)
+        huge = PairColumns([2**70], [1])
+        assert huge.firsts == [2**70]
+
+    def test_views_read_like_pairs(self):
+        pairs = PairColumns(["a", "b"], [1, 2])
+        view = pairs[1]
+        assert not isinstance(view, Pair)
+        assert (view.first, view.second) == ("b", 2)
+        assert not hasattr(view, "__dict__")
+        with pytest.raises(AttributeError):
+            view.first = "c"
+        swapped = view.swap()
+        assert isinstance(swapped, Pair)
+        assert (swapped.first, swapped.second) == (2, "b")
+        assert [(p.first, p.second) for p in pairs] == [("a", 1), ("b", 2)]
+        assert pairs[-1].first == "b"
+        with pytest.raises(IndexError):
+            pairs[2]
+
+    def test_swap_shares_storage(self):
+        pairs = PairColumns([1, 2], ["x", "y"])
+        swapped = pairs.swap()
+        assert swapped.firsts is pairs.seconds
+        assert list(swapped.items()) == [("x", 1), ("y", 2)]
+        assert swapped.swap().firsts is pairs.firsts
+        swapped.append("z", 3)
+        assert list(pairs.items())[-1] == (3, "z")
+
+    def test_subclasses_are_kept(self):
+        class Tagged(PairColumns):
+            pass
+
+        pairs = Tagged.from_pairs([(1, "a")])
+        assert type(pairs) is Tagged
+        assert type(pairs.swap()) is Tagged
+        assert list(pairs.swap().items()) == [("a", 1)]
+
+    def test_append_falls_back_to_list(self):
+        pairs = PairColumns([1], [2])
+        pairs.append(3, 4)
+        assert pairs.firsts.typecode == "q"
+        pairs.append("five", 6)
+        assert isinstance(pairs.firsts, list)
+        assert list(pairs.items()) == [(1, 2), (3, 4), ("five", 6)]
+
+    def test_bulk_construction(self):
+        pairs = PairColumns.from_pairs((i, str(i)) for i in range(5))
+        assert len(pairs) == 5
+        assert list(pairs.items())[4] == (4, "4")
+        from_iterables = PairColumns(iter(range(3)), (str(i) for i in range(3)))
+        assert list(from_iterables.items()) == [(0, "0"), (1, "1"), (2, "2")]
+        with pytest.raises(ValueError):
+            PairColumns([1, 2], [1])
+
+    def test_late_mismatch_falls_back_to_list(self):
+        n = 10_000
+        ints = PairColumns(list(range(n)) + [2**70], list(range(n)) + [0.5])
+        assert isinstance(ints.firsts, list) and isinstance(ints.seconds, list)
+        assert ints.firsts[-2:] == [n - 1, 2**70]
+        assert ints.seconds[-2:] == [n - 1, 0.5]
+        assert len(ints) == n + 1
+        pairs = PairColumns.from_pairs([(i, float(i)) for i in range(n)] + [("x", 1.0)])
+        assert isinstance(pairs.firsts, list) and pairs.seconds.typecode == "d"
+        assert list(pairs.items())[-2:] == [(n - 1, float(n - 1)), ("x", 1.0)]
+
+    def test_from_pairs_rejects_bad_pairs(self):
+        with pytest.raises(ValueError):
+            PairColumns.from_pairs([(1, 2), (3, 4, 5)])
+        with pytest.raises(ValueError):
+            PairColumns.from_pairs([(1, 2, 3)])
+        assert len(PairColumns.from_pairs([])) == 0
+
+    def test_streams_into_arrays(self):
+        import tracemalloc
+
+        n = 200_000
+        tracemalloc.start()
+        try:
+            pairs = PairColumns.from_pairs((i, i * 0.5) for i in range(n))
+            column = PairColumns(range(n), range(n))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert pairs.firsts.typecode == "q" and column.seconds.typecode == "q"
+        # Four 8-byte columns; an intermediate list would add ~36 bytes per value.
+        assert peak < 5 * 8 * n
@@ -20,6 +20,9 @@ from exercises.ex02_typevar_constraints import (
     JsonValue,
     XmlValue,
     Cache,
+    LRUPolicy,
+    LFUPolicy,
+    TTLPolicy,
 )
 
 
@@ -126,6 +129,52 @@ class TestSortedContainer:
         sc = SortedContainer()
         assert sc.get_max() is None
 
+    def test_add_many(self):
+        sc = SortedContainer()
+        sc.add(Score(40))
+        sc.add_many([Score(90), Score(10), Score(60)])
+        assert [s.value for s in sc.get_all()] == [10, 40, 60, 90]
+        assert len(sc) == 4
+
+    def test_constructor_items(self):
+        sc = SortedContainer([Name("Bob"), Name("Alice")])
+        assert [n.name for n in sc] == ["Alice", "Bob"]
+
+    def test_many_inserts_across_chunks(self):
+        import random
+
+        rng = random.Random(0)
+        values = [rng.randrange(1000) for _ in range(500)]
+        sc = SortedContainer(load=4)
+        for v in values:
+            sc.add(Score(v))
+        assert [s.value for s in sc.get_all()] == sorted(values)
+        assert sc.get_min().value == min(values)
+        assert sc.get_max().value == max(values)
+
+    def test_equal_items_keep_insertion_order(self):
+        first, second = Score(5), Score(5)
+        sc = SortedContainer(load=2)
+        sc.add(Score(1))
+        sc.add(first)
+        sc.add(Score(9))
+        sc.add(second)
+        assert sc.get_all()[1] is first
+        assert sc.get_all()[2] is second
+
+    def test_irange(self):
+        sc = SortedContainer([Score(v) for v in range(0, 100, 5)], load=3)
+        assert [s.value for s in sc.irange(Score(12), Score(31))] == [15, 20, 25, 30]
+        assert [s.value for s in sc.irange(Score(15), Score(30))] == [15, 20, 25, 30]
+        assert [s.value for s in sc.irange(high=Score(10))] == [0, 5, 10]
+        assert [s.value for s in sc.irange(low=Score(90))] == [90, 95]
+        assert list(sc.irange(Score(200), Score(300))) == []
+        assert list(sc.irange(Score(50), Score(40))) == []
+        assert len(list(sc.irange())) == 20
+
+    def test_irange_empty(self):
+        assert list(SortedContainer().irange(Score(1), Score(2))) == []
+
 
 class TestCache:
     def test_json_cache(self):
@@ -161,3 +210,111 @@ class TestCache:
         cache.put("tag", XmlValue("note", "content"))
         result = cache.get_serialized("tag")
         assert result == "<note>content</note>"
+
+    def test_serialize_is_memoized(self):
+        calls = [0]
+
+        class CountingValue(XmlValue):
+            def serialize(self) -> str:
+                calls[0] += 1
+                return super().serialize()
+
+        cache = Cache()
+        cache.put("tag", CountingValue("note", "a"))
+        assert cache.get_serialized("tag") == "<note>a</note>"
+        assert cache.get_serialized("tag") == "<note>a</note>"
+        assert calls[0] == 1
+
+        cache.put("tag", CountingValue("note", "b"))
+        assert cache.get_serialized("tag") == "<note>b</note>"
+        assert calls[0] == 2
+
+    def test_stats(self):
+        cache = Cache()
+        cache.put("a", XmlValue("a", "1"))
+        cache.get("a")
+        cache.get_serialized("a")
+        cache.get("missing")
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (2, 1, 0, 1)
+
+
+class TestBoundedCache:
+    # Every XmlValue("t", "xx") serializes to "<t>xx</t>" - 9 bytes.
+
+    def test_size_limit_in_bytes(self):
+        cache = Cache(max_bytes=20)
+        cache.put("a", XmlValue("t", "xx"))
+        cache.put("b", XmlValue("t", "yy"))
+        assert cache.stats().size_bytes == 18
+        cache.put("c", XmlValue("t", "zz"))
+        assert len(cache) == 2
+        assert cache.get("a") is None
+        assert cache.stats().evictions == 1
+
+    def test_replacing_key_frees_its_size(self):
+        cache = Cache(max_bytes=20)
+        cache.put("a", XmlValue("t", "xx"))
+        cache.put("a", XmlValue("t", "yy"))
+        assert cache.stats().size_bytes == 9
+        assert cache.get_serialized("a") == "<t>yy</t>"
+
+    def test_oversized_value_rejected(self):
+        cache = Cache(max_bytes=5)
+        with pytest.raises(ValueError, match="larger than max_bytes"):
+            cache.put("a", XmlValue("t", "xx"))
+
+    def test_lru_eviction(self):
+        cache = Cache(max_bytes=20, policy=LRUPolicy())
+        cache.put("a", XmlValue("t", "aa"))
+        cache.put("b", XmlValue("t", "bb"))
+        cache.get("a")
+        cache.put("c", XmlValue("t", "cc"))
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+
+    def test_lfu_eviction(self):
+        cache = Cache(max_bytes=20, policy=LFUPolicy())
+        cache.put("a", XmlValue("t", "aa"))
+        cache.put("b", XmlValue("t", "bb"))
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+        cache.put("c", XmlValue("t", "cc"))
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        cache.get("c")
+        cache.get("c")
+        cache.get("c")
+        cache.put("d", XmlValue("t", "dd"))
+        assert cache.get("a") is None
+        assert cache.get("c") is not None
+
+    def test_ttl_expiry(self):
+        now = [0.0]
+        cache = Cache(policy=TTLPolicy(10, clock=lambda: now[0]))
+        cache.put("a", XmlValue("t", "aa"))
+        now[0] = 5.0
+        cache.put("b", XmlValue("t", "bb"))
+        assert cache.get("a") is not None
+        now[0] = 10.0
+        assert cache.get("a") is None
+        assert cache.get_serialized("b") == "<t>bb</t>"
+        now[0] = 15.0
+        assert cache.get("b") is None
+        stats = cache.stats()
+        assert stats.evictions == 2
+        assert stats.entries == 0
+
+    def test_ttl_purges_on_put(self):
+        now = [0.0]
+        cache = Cache(policy=TTLPolicy(10, clock=lambda: now[0]))
+        for i in range(100):
+            cache.put(f"old{i}", XmlValue("t", "x"))
+        now[0] = 20.0
+        for i in range(60):
+            cache.put(f"new{i}", XmlValue("t", "x"))
+        # Nothing looked the old keys up, yet each put dropped two of them.
+        assert len(cache) == 60
+        assert cache.stats().evictions == 100
+        assert cache.get("new0") is not None
@@ -4,6 +4,16 @@ Tests for Exercise 3: Protocols
 Run with: pytest tests/test_ex03.py -v
 """
 
+import gc
+import random
+import io
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Protocol, runtime_checkable
+
 import pytest
 from exercises.ex03_protocols import (
     Circle,
@@ -13,11 +23,16 @@ from exercises.ex03_protocols import (
     render_all,
     User,
     Product,
+    AnonymousThing,
     greet,
     FileHandle,
     Connection,
     SimpleValue,
     maybe_close,
+    Closeable,
+    conforms_to,
+    is_closeable,
+    close_all,
     IntHolder,
     StringHolder,
     double_container_value,
@@ -29,6 +44,12 @@ from exercises.ex03_protocols import (
     write_content,
     copy_content,
     update_content,
+    iter_chunks,
+    copy_bytes,
+    ChunkList,
+    render_batch,
+    register_batch_template,
+    _BATCH_TEMPLATES,
 )
 
 
@@ -51,6 +72,20 @@ class TestDrawable:
         assert "Rectangle" in results[1]
 
 
+class TestCompactInstances:
+    @pytest.mark.parametrize(
+        "obj",
+        [Circle(1), Rectangle(2, 3), Point(1, 2), User("Alice", "a@example.com"), Product("Widget", 9.99)],
+    )
+    def test_no_instance_dict(self, obj):
+        assert not hasattr(obj, "__dict__")
+
+    def test_protocol_conformance(self):
+        assert conforms_to(Product("Widget", 9.99), HasName)
+        assert conforms_to(User("Alice", "a@example.com"), HasName)
+        assert not conforms_to(Point(1, 2), HasName)
+
+
 class TestNamed:
     def test_greet_user(self):
         user = User("Alice", "alice@example.com")
@@ -84,6 +119,231 @@ class TestCloseable:
         assert result is False
 
 
+@runtime_checkable
+class HasName(Protocol):
+    @property
+    def name(self) -> str: ...
+
+
+class NotRuntime(Protocol):
+    def close(self) -> None: ...
+
+
+@runtime_checkable
+class HasPrivateFlush(Protocol):
+    def _flush(self) -> None: ...
+
+
+@runtime_checkable
+class HasCreate(Protocol):
+    def create(self) -> object: ...
+
+
+class TestConformsTo:
+    @pytest.mark.parametrize(
+        "obj",
+        [FileHandle("/tmp/test"), Connection("localhost"), SimpleValue(1), Product("Widget", 1.0), 42, None],
+    )
+    def test_matches_isinstance(self, obj):
+        assert conforms_to(obj, Closeable) == isinstance(obj, Closeable)
+        assert conforms_to(obj, HasName) == isinstance(obj, HasName)
+
+    def test_instance_attributes(self):
+        assert conforms_to(Product("Widget", 1.0), HasName) is True
+        assert conforms_to(AnonymousThing(1), HasName) is False
+        thing = AnonymousThing(1)
+        thing.name = "named later"
+        assert conforms_to(thing, HasName) is True
+        assert conforms_to(AnonymousThing(1), HasName) is False
+
+    def test_method_set_to_none_is_not_closeable(self):
+        class Blocked:
+            close = None
+
+        assert conforms_to(Blocked(), Closeable) is False
+        assert isinstance(Blocked(), Closeable) is False
+
+    def test_invalidated_when_class_changes(self):
+        class Resource:
+            pass
+
+        obj = Resource()
+        assert is_closeable(obj) is False
+        assert maybe_close(obj) is False
+        Resource.close = lambda self: None
+        assert is_closeable(obj) is True
+        del Resource.close
+        # Like isinstance(), a class that matched keeps matching.
+        assert is_closeable(obj) is isinstance(obj, Closeable)
+
+    def test_invalidated_when_base_changes(self):
+        class Base:
+            pass
+
+        class Child(Base):
+            pass
+
+        assert is_closeable(Child()) is False
+        Base.close = lambda self: None
+        assert is_closeable(Child()) is True
+
+    def test_getattr_proxy_is_not_closeable(self):
+        class Proxy:
+            def __init__(self):
+                self.calls = []
+
+            def __getattr__(self, name):
+                return lambda: self.calls.append(name)
+
+        proxy = Proxy()
+        assert isinstance(proxy, Closeable) is False
+        assert conforms_to(proxy, Closeable) is False
+        assert maybe_close(proxy) is False
+        assert proxy.calls == []
+
+    def test_private_member(self):
+        class Flusher:
+            def flush(self) -> None:
+                pass
+
+        class PrivateFlusher(Flusher):
+            def _flush(self) -> None:
+                pass
+
+        assert isinstance(Flusher(), HasPrivateFlush) is False
+        assert conforms_to(Flusher(), HasPrivateFlush) is False
+        assert conforms_to(PrivateFlusher(), HasPrivateFlush) is True
+
+    def test_classmethod_member(self):
+        class Factory:
+            @classmethod
+            def create(cls) -> "Factory":
+                return cls()
+
+        class NoFactory:
+            pass
+
+        from exercises.ex03_protocols import _MISSES
+
+        assert conforms_to(Factory(), HasCreate) is True
+        assert conforms_to(NoFactory(), HasCreate) is False
+        entries = _MISSES[HasCreate][1]
+        entry = entries[id(NoFactory)]
+        assert conforms_to(NoFactory(), HasCreate) is False
+        # Nothing changed on the class, so the cached miss is reused.
+        assert entries[id(NoFactory)] is entry
+        assert id(Factory) not in entries
+
+    def test_explicit_subclass(self):
+        class Explicit(Closeable):
+            pass
+
+        assert conforms_to(Explicit(), Closeable) is isinstance(Explicit(), Closeable) is True
+
+    def test_instance_can_supply_method_class_blocks(self):
+        class Blocked:
+            close = None
+
+        blocked = Blocked()
+        blocked.close = lambda: None
+        assert conforms_to(blocked, Closeable) is isinstance(blocked, Closeable) is True
+        assert conforms_to(Blocked(), Closeable) is False
+
+    def test_rejects_non_runtime_protocol(self):
+        with pytest.raises(TypeError):
+            conforms_to(FileHandle("/tmp/test"), NotRuntime)
+
+    def test_does_not_keep_classes_alive(self):
+        from exercises.ex03_protocols import _MISSES
+
+        class Temporary:
+            pass
+
+        assert not is_closeable(Temporary())
+        entry = _MISSES[Closeable][1][id(Temporary)]
+        assert entry[0]() is Temporary
+        # isinstance() itself may hold the class for a while, so check that
+        # nothing in the cache refers to it strongly.
+        cached = [entry, *entry, *entry[1]]
+        assert not any(referrer is item for referrer in gc.get_referrers(Temporary) for item in cached)
+
+
+class SlowResource:
+    def __init__(self, delay: float = 0.0, error: Exception | None = None):
+        self.delay = delay
+        self.error = error
+        self.closed = False
+
+    def close(self) -> None:
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        self.closed = True
+
+
+class TestCloseAll:
+    def test_closes_and_skips(self):
+        handles = [FileHandle(f"/tmp/{i}") for i in range(5)]
+        objs = [*handles, SimpleValue(1), Connection("db"), 42]
+        report = close_all(objs)
+        assert report.closed == [*handles, objs[6]]
+        assert report.failed == []
+        assert report.pending == []
+        assert report.skipped == 2
+        assert all(not h.is_open for h in handles)
+        assert report.elapsed >= 0
+
+    def test_empty(self):
+        report = close_all([SimpleValue(1)])
+        assert report.closed == [] and report.skipped == 1
+
+    def test_runs_concurrently(self):
+        resources = [SlowResource(0.05) for _ in range(8)]
+        start = time.perf_counter()
+        report = close_all(resources, max_workers=8)
+        assert time.perf_counter() - start < 0.3
+        assert len(report.closed) == 8
+
+    def test_reports_failures(self):
+        error = OSError("disk gone")
+        bad = SlowResource(error=error)
+        good = SlowResource()
+        report = close_all([bad, good])
+        assert report.failed == [(bad, error)]
+        assert report.closed == [good]
+        assert good.closed
+
+    def test_timeout_bounds_shutdown(self):
+        release = threading.Event()
+
+        class Stuck:
+            def close(self) -> None:
+                release.wait(5)
+
+        stuck = Stuck()
+        fast = SlowResource()
+        start = time.perf_counter()
+        report = close_all([stuck, fast], max_workers=2, timeout=0.1)
+        assert time.perf_counter() - start < 1.0
+        assert report.pending == [stuck]
+        assert report.closed == [fast]
+        release.set()
+
+    def test_hung_close_does_not_delay_exit(self):
+        script = (
+            "import threading\n"
+            "from exercises.ex03_protocols import close_all\n"
+            "class Hung:\n"
+            "    def close(self):\n"
+            "        threading.Event().wait(30)\n"
+            "assert close_all([Hung()], timeout=0.1).pending\n"
+        )
+        start = time.perf_counter()
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        subprocess.run([sys.executable, "-c", script], check=True, timeout=20, cwd=root)
+        assert time.perf_counter() - start < 5
+
+
 class TestContainer:
     def test_double_int_holder(self):
         holder = IntHolder(21)
@@ -145,3 +405,332 @@ class TestReadWritable:
         f.write("world")
         update_content(f, lambda s: f"Hello, {s}!")
         assert f.read() == "Hello, world!"
+
+
+class TestStreaming:
+    def test_chunked_read(self):
+        buf = ReadOnlyBuffer("abcdefg")
+        assert buf.read(3) == "abc"
+        assert buf.read(3) == "def"
+        assert buf.read(3) == "g"
+        assert buf.read(3) == ""
+        assert buf.read() == "abcdefg"
+        buf.seek(0)
+        assert list(iter_chunks(buf, 4)) == ["abcd", "efg"]
+
+    def test_iter_chunks_rejects_bad_size(self):
+        with pytest.raises(ValueError):
+            list(iter_chunks(ReadOnlyBuffer("x"), 0))
+
+    def test_copy_into_in_memory_file(self):
+        dest = InMemoryFile()
+        dest.write("old content")
+        copy_content(ReadOnlyBuffer("x" * 1000 + "end"), dest, 64)
+        assert dest.read() == "x" * 1000 + "end"
+
+    def test_copy_into_stream(self):
+        dest = io.StringIO()
+        copy_content(ReadOnlyBuffer("hello world"), dest, 4)
+        assert dest.getvalue() == "hello world"
+
+    def test_copy_into_log_writes_chunks(self):
+        log = WriteOnlyLog()
+        copy_content(ReadOnlyBuffer("hello world"), log, 4)
+        assert log.get_entries() == ["hell", "o wo", "rld"]
+
+    def test_copy_bytes_uses_memoryviews(self):
+        class Recorder(io.BytesIO):
+            def write(self, data):
+                assert isinstance(data, memoryview)
+                return super().write(data)
+
+        payload = bytes(range(256)) * 100
+        dest = Recorder()
+        assert copy_bytes(io.BytesIO(payload), dest, 1000) == len(payload)
+        assert dest.getvalue() == payload
+
+    def test_streaming_update(self):
+        f = InMemoryFile()
+        f.write("hello streaming world")
+
+        def shout(chunks):
+            for chunk in chunks:
+                yield chunk.upper()
+
+        update_content(f, shout, 5)
+        assert f.read() == "HELLO STREAMING WORLD"
+
+    def test_streaming_update_sees_whole_content(self):
+        f = InMemoryFile()
+        f.write("abcdef")
+        f.read(4)
+        seen = []
+
+        def record(chunks):
+            for chunk in chunks:
+                seen.append(chunk)
+                yield chunk
+
+        update_content(f, record, 4)
+        assert seen == ["abcd", "ef"]
+        assert f.read() == "abcdef"
+
+    def test_streaming_update_keeps_lone_surrogates(self, tmp_path):
+        text = "a\ud800b" * 100
+        f = InMemoryFile(max_memory=64, spill_dir=str(tmp_path))
+        f.write(text)
+
+        def identity(chunks):
+            yield from chunks
+
+        update_content(f, identity, 16, max_memory=32, spill_dir=str(tmp_path))
+        assert f.read() == text
+
+    def test_streaming_update_bounded_memory(self):
+        import tracemalloc
+
+        size = 4 * 1024 * 1024
+        f = InMemoryFile(max_memory=64 * 1024)
+        for _ in range(size // 1024):
+            f.append("x" * 1024)
+
+        def shout(chunks):
+            for chunk in chunks:
+                yield chunk.upper()
+
+        tracemalloc.start()
+        try:
+            update_content(f, shout, 16 * 1024, max_memory=64 * 1024)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        # Neither the source nor the transformed content is ever held whole.
+        assert peak < size // 4
+        assert len(f) == size
+        f.seek(0)
+        assert f.read(5) == "XXXXX"
+
+
+def _pieces(count, seed=0):
+    rng = random.Random(seed)
+    return ["".join(rng.choice("abcé✓ \n") for _ in range(rng.randrange(0, 50))) for _ in range(count)]
+
+
+class TestChunkList:
+    @pytest.mark.parametrize("min_chunk", [0, 64])
+    @pytest.mark.parametrize("max_memory", [None, 100])
+    def test_reads_match_string(self, min_chunk, max_memory):
+        chunks = ChunkList(min_chunk=min_chunk, max_memory=max_memory)
+        pieces = _pieces(200)
+        for piece in pieces:
+            chunks.append(piece)
+        expected = "".join(pieces)
+        assert len(chunks) == len(expected)
+        rng = random.Random(1)
+        for _ in range(300):
+            offset = rng.randrange(0, len(expected) + 5)
+            size = rng.randrange(-1, 120)
+            end = len(expected) if size < 0 else offset + size
+            assert chunks.read(offset, size) == expected[offset:end]
+        assert chunks.getvalue() == expected
+        if max_memory is not None:
+            assert chunks._in_memory <= max_memory
+        chunks.close()
+
+    def test_min_chunk_merges_small_appends(self):
+        chunks = ChunkList(min_chunk=10)
+        for _ in range(10):
+            chunks.append("abc")
+        assert chunks.chunk_count == 3
+        assert ChunkList(min_chunk=0).chunk_count == 0
+
+    def test_materialization_cached_until_append(self):
+        chunks = ChunkList(min_chunk=0)
+        chunks.append("ab")
+        chunks.append("cd")
+        first = chunks.getvalue()
+        assert chunks.getvalue() is first
+        chunks.append("ef")
+        assert chunks.getvalue() == "abcdef"
+
+    def test_clear(self):
+        chunks = ChunkList(max_memory=4)
+        chunks.append("hello world")
+        chunks.clear()
+        assert len(chunks) == 0 and chunks.getvalue() == ""
+        chunks.append("again")
+        assert chunks.read(1, 3) == "gai"
+
+
+class TestChunkedStorage:
+    def test_in_memory_file_append(self):
+        f = InMemoryFile()
+        f.write("hello")
+        f.append(" ")
+        f.append("world")
+        assert f.read() == "hello world"
+        assert len(f) == 11
+        assert f.read(5) == "hello"
+        f.write("reset")
+        assert f.read(3) == "res"
+
+    def test_in_memory_file_spills(self, tmp_path):
+        f = InMemoryFile(max_memory=1000, spill_dir=str(tmp_path))
+        pieces = _pieces(500)
+        for piece in pieces:
+            f.append(piece)
+        expected = "".join(pieces)
+        assert f.read() == expected
+        f.seek(len(expected) // 2)
+        assert f.read(100) == expected[len(expected) // 2:len(expected) // 2 + 100]
+
+    def test_seek_rejects_negative_offsets(self):
+        for buf in (InMemoryFile(), ReadOnlyBuffer("abc")):
+            with pytest.raises(ValueError, match="negative seek position"):
+                buf.seek(-1)
+
+    def test_log_snapshot_is_stable(self):
+        log = WriteOnlyLog()
+        log.write("entry 1")
+        snapshot = log.entries_view()
+        log.write("entry 2")
+        assert snapshot == ["entry 1"]
+        assert log.entries_view() == ["entry 1", "entry 2"]
+        assert log.entries_view()[-1] == "entry 2"
+        assert log.entries_view()[0:1] == ["entry 1"]
+        assert not hasattr(snapshot, "append")
+
+    def test_log_get_entries_returns_list(self):
+        log = WriteOnlyLog()
+        log.write("entry 1")
+        entries = log.get_entries()
+        assert type(entries) is list
+        entries.append("mine")
+        assert log.get_entries() == ["entry 1"]
+
+    def test_log_spills_and_keeps_entries(self):
+        log = WriteOnlyLog(max_memory=50)
+        entries = _pieces(100)
+        for entry in entries:
+            log.write(entry)
+        assert log.get_entries() == entries
+        assert list(log.entries_view()) == entries
+        with pytest.raises(IndexError):
+            log.entries_view()[100]
+
+
+class TestRenderBatch:
+    @pytest.fixture(autouse=True)
+    def _restore_templates(self):
+        saved = dict(_BATCH_TEMPLATES)
+        yield
+        _BATCH_TEMPLATES.clear()
+        _BATCH_TEMPLATES.update(saved)
+
+    def test_matches_render_all_order(self):
+        shapes = (
+            [Circle(i) for i in range(10)]
+            + [Rectangle(i, 2.5) for i in range(10)]
+            + [Circle(i / 2) for i in range(10)]
+        )
+        out = io.StringIO()
+        assert render_batch(shapes, out) == 30
+        assert out.getvalue().splitlines() == render_all(shapes)
+
+    def test_short_runs_keep_order(self):
+        shapes = [Circle(1), Rectangle(2, 3), Rectangle(4.0, 5), Circle(2.5), Circle(3)]
+        out = io.StringIO()
+        assert render_batch(shapes, out) == 5
+        assert out.getvalue().splitlines() == render_all(shapes)
+
+    def test_order_kept_across_batches(self):
+        rng = random.Random(0)
+        shapes = [Circle(i) if rng.random() < 0.5 else Rectangle(i, 2) for i in range(50)]
+        out = io.StringIO()
+        render_batch(shapes, out, batch_size=7)
+        assert out.getvalue().splitlines() == render_all(shapes)
+
+    def test_unregistered_and_subclasses_use_draw(self):
+        class Triangle:
+            def draw(self) -> str:
+                return "Triangle"
+
+        class BigCircle(Circle):
+            def draw(self) -> str:
+                return "BIG " + super().draw()
+
+        out = io.StringIO()
+        render_batch([Triangle(), BigCircle(9)], out)
+        assert out.getvalue() == "Rendering: Triangle\nRendering: BIG Circle(radius=9)\n"
+
+    def test_streams_in_batches(self):
+        shapes = (Circle(i) for i in range(10))
+        log = WriteOnlyLog()
+        assert render_batch(shapes, log, batch_size=4) == 10
+        assert len(log.get_entries()) == 3
+        assert "".join(log.get_entries()).splitlines() == [render(Circle(i)) for i in range(10)]
+
+    def test_appends_to_in_memory_file(self):
+        f = InMemoryFile()
+        f.write("header\n")
+        render_batch([Circle(1), Circle(2)], f, batch_size=1)
+        assert f.read() == "header\nRendering: Circle(radius=1)\nRendering: Circle(radius=2)\n"
+
+    def test_custom_template(self):
+        class Square:
+            def __init__(self, side):
+                self.side = side
+
+            def draw(self) -> str:
+                return f"Square({self.side})"
+
+        register_batch_template(Square, "Square({})", "side")
+        out = io.StringIO()
+        render_batch([Square(2)], out)
+        assert out.getvalue() == render(Square(2)) + "\n"
+
+    def test_template_validation(self):
+        with pytest.raises(ValueError):
+            register_batch_template(Circle, "Circle({})", "radius", "extra")
+        with pytest.raises(ValueError):
+            register_batch_template(Circle, "Circle({radius})", "radius")
+
+    def test_template_escapes(self):
+        class Percent:
+            def __init__(self, value):
+                self.value = value
+
+            def draw(self) -> str:
+                return f"{{{self.value}%}}"
+
+        register_batch_template(Percent, "{{{}%}}", "value")
+        out = io.StringIO()
+        render_batch([Percent(50)], out)
+        assert out.getvalue() == render(Percent(50)) + "\n"
+
+    def test_registered_templates_match_draw(self):
+        class Fancy:
+            def __format__(self, spec: str) -> str:
+                return "fancy"
+
+            def __str__(self) -> str:
+                return "plain"
+
+        values = [0, 1, -2, 2.5, 1e-7, 1e22, float("nan"), True, "5%", Fancy()]
+        samples = {
+            Circle: [Circle(v) for v in values],
+            Rectangle: [Rectangle(a, b) for a in values for b in values],
+        }
+        assert set(samples) == set(_BATCH_TEMPLATES)
+        for shapes in samples.values():
+            out = io.StringIO()
+            # Long enough runs that the templates are used.
+            render_batch(shapes * 8, out)
+            assert out.getvalue().splitlines() == render_all(shapes * 8)
+
+    def test_registrations_do_not_leak(self):
+        assert set(_BATCH_TEMPLATES) == {Circle, Rectangle}
+
+    def test_rejects_bad_batch_size(self):
+        with pytest.raises(ValueError):
+            render_batch([], io.StringIO(), batch_size=0)
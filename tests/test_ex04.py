@@ -4,14 +4,23 @@ Tests for Exercise 4: Callable and Overload
 Run with: pytest tests/test_ex04.py -v
 """
 
+import os
+import subprocess
+import sys
+import threading
+
 import pytest
 from exercises.ex04_callable_and_overload import (
     apply_twice,
     call_with_logging,
     make_repeater,
     map_list,
+    MapItemError,
+    SERIAL_THRESHOLD,
     filter_list,
     compose,
+    Composed,
+    Pipeline,
     EventHandler,
     double,
     parse_value,
@@ -86,6 +95,102 @@ class TestMapList:
         assert result == ["1", "2", "3"]
 
 
+def square(x):
+    return x * x
+
+
+def reciprocal(x):
+    return 1 / x
+
+
+class TestParallelMapList:
+    def test_process_pool_preserves_order(self):
+        items = list(range(SERIAL_THRESHOLD * 3))
+        assert map_list(square, items, workers=2, mode="process") == [x * x for x in items]
+
+    def test_thread_pool_preserves_order(self):
+        items = list(range(SERIAL_THRESHOLD * 3))
+        result = map_list(lambda x: x + 1, items, workers=4, chunk_size=7, mode="thread")
+        assert result == [x + 1 for x in items]
+
+    def test_error_carries_failing_index(self):
+        items = list(range(1, SERIAL_THRESHOLD * 2))
+        items[1500] = 0
+        items[1700] = 0
+        with pytest.raises(MapItemError) as info:
+            map_list(reciprocal, items, workers=2, chunk_size=100, mode="process")
+        assert info.value.index == 1500
+        assert isinstance(info.value.error, ZeroDivisionError)
+
+    def test_thread_error_chains_original(self):
+        items = list(range(1, SERIAL_THRESHOLD * 2))
+        items[42] = 0
+        with pytest.raises(MapItemError) as info:
+            map_list(reciprocal, items, workers=2, mode="thread")
+        assert info.value.index == 42
+        assert isinstance(info.value.__cause__, ZeroDivisionError)
+
+    def test_small_input_runs_serially(self):
+        calls = []
+
+        def record(x):
+            calls.append(x)
+            return x
+
+        # A closure could not be pickled for a process pool.
+        assert map_list(record, [1, 2, 3], workers=4, mode="process") == [1, 2, 3]
+        assert calls == [1, 2, 3]
+
+    def test_serial_fallback_reports_index(self):
+        with pytest.raises(MapItemError) as info:
+            map_list(reciprocal, [1, 2, 0, 4], workers=4)
+        assert info.value.index == 2
+
+    def test_without_workers_raises_original(self):
+        with pytest.raises(ZeroDivisionError):
+            map_list(reciprocal, [1, 0])
+
+    def test_rejects_bad_arguments(self):
+        with pytest.raises(ValueError):
+            map_list(square, [1], workers=0)
+        with pytest.raises(ValueError):
+            map_list(square, [1], workers=2, chunk_size=0)
+
+    def test_default_mode_takes_lambdas(self):
+        items = list(range(SERIAL_THRESHOLD * 2))
+        assert map_list(lambda x: x * 2, items, workers=2) == [x * 2 for x in items]
+
+    def test_reuses_given_executor(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        items = list(range(100))
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for _ in range(3):
+                assert map_list(square, items, chunk_size=10, executor=executor) == [x * x for x in items]
+            items[55] = "x"
+            with pytest.raises(MapItemError) as info:
+                map_list(square, items, chunk_size=10, executor=executor)
+            assert info.value.index == 55
+            # Still running after the calls, including the failed one.
+            assert executor.submit(square, 3).result() == 9
+
+    def test_given_process_pool_runs_small_input_serially(self):
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            assert map_list(lambda x: x + 1, [1, 2, 3], executor=executor) == [2, 3, 4]
+
+    def test_thread_mode_parallelizes_small_inputs(self):
+        # Each call waits for the other, so this only finishes if both run at once.
+        barrier = threading.Barrier(2, timeout=5)
+
+        def meet(x):
+            barrier.wait()
+            return x
+
+        assert map_list(meet, [1, 2], workers=2, mode="thread") == [1, 2]
+
+
 class TestFilterList:
     def test_positive(self):
         result = filter_list(lambda x: x > 0, [-1, 0, 1, 2])
@@ -119,6 +224,130 @@ class TestCompose:
         composed = compose(add_exclaim, to_str)
         assert composed(42) == "42!"
 
+    def test_returns_composed(self):
+        add1 = lambda x: x + 1
+        double = lambda x: x * 2
+        composed = compose(double, add1)
+        assert isinstance(composed, Composed)
+        assert composed.funcs == (add1, double)
+
+    def test_nested_compositions_are_flattened(self):
+        add1 = lambda x: x + 1
+        double = lambda x: x * 2
+        negate = lambda x: -x
+        composed = compose(negate, compose(double, add1))
+        assert composed.funcs == (add1, double, negate)
+        assert composed(5) == -12
+        assert compose(compose(negate, double), add1).funcs == (add1, double, negate)
+
+    def test_deep_chain_beyond_recursion_limit(self):
+        add1 = lambda x: x + 1
+        composed = add1
+        for _ in range(sys.getrecursionlimit() + 100):
+            composed = compose(add1, composed)
+        assert composed(0) == sys.getrecursionlimit() + 101
+        assert composed.map_many([0, 1]) == [sys.getrecursionlimit() + 101, sys.getrecursionlimit() + 102]
+
+    def test_map_many_compiles_bounded_loops(self):
+        from exercises.ex04_callable_and_overload import _FUSE_LIMIT, _FUSED_CACHE_SIZE, _fuse
+
+        add1 = lambda x: x + 1
+        composed = add1
+        _fuse.cache_clear()
+        for depth in range(2, 4 * _FUSE_LIMIT):
+            composed = compose(add1, composed)
+            assert composed.map_many([0]) == [depth]
+        assert _fuse.cache_info().currsize <= _FUSE_LIMIT <= _FUSED_CACHE_SIZE
+
+    def test_map_many(self):
+        composed = compose(str, lambda x: x * 2)
+        assert composed.map_many([1, 2, 3]) == ["2", "4", "6"]
+        assert composed.map_many(iter([])) == []
+
+
+class TestPipeline:
+    def test_map_filter_map(self):
+        result = (
+            Pipeline(range(10))
+            .map(lambda x: x * 3)
+            .filter(lambda x: x % 2 == 0)
+            .map(str)
+            .collect()
+        )
+        assert result == ["0", "6", "12", "18", "24"]
+
+    def test_matches_eager_functions(self):
+        items = list(range(-20, 20))
+        add1 = lambda x: x + 1
+        positive = lambda x: x > 0
+        square = lambda x: x * x
+        expected = map_list(square, filter_list(positive, map_list(add1, items)))
+        assert Pipeline(items).map(add1).filter(positive).map(square).collect() == expected
+
+    def test_consecutive_filters(self):
+        result = Pipeline(range(10)).filter(lambda x: x > 2).filter(lambda x: x < 6).collect()
+        assert result == [3, 4, 5]
+
+    def test_many_stages(self):
+        pipeline = Pipeline(range(3))
+        for _ in range(500):
+            pipeline = pipeline.map(lambda x: x + 1)
+        assert pipeline.filter(lambda x: x > 500).collect() == [501, 502]
+        assert list(pipeline) == [500, 501, 502]
+
+    def test_compiled_loops_are_bounded(self):
+        from exercises.ex04_callable_and_overload import _FUSED_CACHE_SIZE, _fuse
+
+        keep = lambda x: True
+        for shape in range(_FUSED_CACHE_SIZE + 50):
+            pipeline = Pipeline([1, 2])
+            for bit in range(10):
+                pipeline = pipeline.filter(keep) if shape >> bit & 1 else pipeline.map(abs)
+            assert pipeline.collect() == [1, 2]
+        assert _fuse.cache_info().currsize <= _FUSED_CACHE_SIZE
+
+    def test_no_stages(self):
+        assert Pipeline((1, 2, 3)).collect() == [1, 2, 3]
+        assert list(Pipeline([])) == []
+
+    def test_is_lazy(self):
+        calls = []
+
+        def record(x):
+            calls.append(x)
+            return x
+
+        pipeline = Pipeline(range(5)).map(record)
+        assert calls == []
+        results = iter(pipeline)
+        assert next(results) == 0
+        assert calls == [0]
+
+    def test_stages_do_not_modify_parent(self):
+        base = Pipeline([1, 2, 3])
+        doubled = base.map(lambda x: x * 2)
+        assert base.collect() == [1, 2, 3]
+        assert doubled.collect() == [2, 4, 6]
+
+    def test_chunks(self):
+        chunks = list(Pipeline(range(7)).map(lambda x: x * 10).chunks(3))
+        assert chunks == [[0, 10, 20], [30, 40, 50], [60]]
+
+    def test_chunks_is_lazy(self):
+        calls = []
+
+        def record(x):
+            calls.append(x)
+            return x
+
+        chunks = Pipeline(range(100)).map(record).chunks(4)
+        assert next(chunks) == [0, 1, 2, 3]
+        assert len(calls) == 4
+
+    def test_chunks_rejects_non_positive_size(self):
+        with pytest.raises(ValueError):
+            list(Pipeline([1]).chunks(0))
+
 
 class TestEventHandler:
     def test_success_callback(self):
@@ -215,6 +444,38 @@ class TestRetry:
         with pytest.raises(ValueError, match="always"):
             always_fails()
 
+    def test_with_policy(self):
+        from exercises.ex05_paramspec import RetryPolicy
+
+        sleeps = []
+        policy = RetryPolicy(3, base_delay=1.0, jitter=False, sleep=sleeps.append, retry_on=(ValueError,))
+        attempts = [0]
+
+        @retry(policy=policy)
+        def fails_once():
+            attempts[0] += 1
+            if attempts[0] < 2:
+                raise ValueError("not yet")
+            return "done"
+
+        assert fails_once() == "done"
+        assert sleeps == [1.0]
+        assert policy.stats().retries == 1
+
+    def test_rejects_bad_arguments(self):
+        with pytest.raises(ValueError):
+            retry()
+        with pytest.raises(ValueError):
+            retry(0)
+        with pytest.raises(ValueError):
+            retry(3, policy=lambda func: func)
+
+    def test_runs_as_a_script(self):
+        # The exercise must stand alone: run directly, "exercises" is not importable.
+        path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "exercises", "ex04_callable_and_overload.py")
+        subprocess.run([sys.executable, path], check=True, timeout=20, cwd=os.path.dirname(path))
+
 
 class TestHandleResult:
     def test_success(self):
@@ -4,16 +4,27 @@ Tests for Exercise 5: ParamSpec and Concatenate
 Run with: pytest tests/test_ex05.py -v
 """
 
+import asyncio
 import pytest
+import threading
 import time
 from exercises.ex05_paramspec import (
     log_call,
     time_it,
     retry,
+    RetryBudget,
+    RetryPolicy,
+    RetryStats,
+    BreakerStats,
+    CircuitBreaker,
+    CircuitOpenError,
+    circuit_breaker,
     cache_result,
     with_user,
     with_connection,
     Connection,
+    ConnectionPool,
+    get_default_pool,
     validate_args,
     transform_result,
     log_method,
@@ -92,6 +103,441 @@ class TestRetry:
             always_fails()
 
 
+class FakeClock:
+    """A clock that only moves when something sleeps on it."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def failing(times: int, exc: Exception):
+    """Return a function that raises exc for its first `times` calls."""
+    calls = [0]
+
+    def func(x: int) -> int:
+        calls[0] += 1
+        if calls[0] <= times:
+            raise exc
+        return x
+
+    return func
+
+
+class TestRetryPolicy:
+    def policy(self, clock: FakeClock, **options) -> RetryPolicy:
+        options.setdefault("jitter", False)
+        return RetryPolicy(clock=clock, sleep=clock.sleep, **options)
+
+    def test_exponential_backoff(self):
+        clock = FakeClock()
+        policy = self.policy(clock, max_attempts=5, base_delay=1.0, max_delay=5.0)
+        assert policy(failing(4, ValueError()))(7) == 7
+        assert clock.sleeps == [1.0, 2.0, 4.0, 5.0]
+        assert policy.stats() == RetryStats(
+            calls=1, attempts=5, retries=4, give_ups=0, budget_denials=0, sleep_time=12.0
+        )
+
+    def test_full_jitter(self):
+        clock = FakeClock()
+        policy = RetryPolicy(
+            4, base_delay=1.0, jitter=True, clock=clock, sleep=clock.sleep, rng=lambda: 0.25
+        )
+        policy(failing(3, ValueError()))(1)
+        assert clock.sleeps == [0.25, 0.5, 1.0]
+
+    def test_gives_up_after_max_attempts(self):
+        clock = FakeClock()
+        policy = self.policy(clock, max_attempts=3, base_delay=1.0)
+        with pytest.raises(ValueError):
+            policy(failing(10, ValueError()))(1)
+        stats = policy.stats()
+        assert (stats.attempts, stats.retries, stats.give_ups) == (3, 2, 1)
+
+    def test_deadline(self):
+        clock = FakeClock()
+        policy = self.policy(clock, max_attempts=10, base_delay=1.0, deadline=5.0)
+        with pytest.raises(ValueError):
+            policy(failing(10, ValueError()))(1)
+        # Waits of 1 and 2 fit in 5 seconds; another 4 would not.
+        assert clock.sleeps == [1.0, 2.0]
+
+    def test_retry_on_filters_exceptions(self):
+        clock = FakeClock()
+        policy = self.policy(clock, max_attempts=3, retry_on=(ConnectionError,))
+        assert policy(failing(2, ConnectionError()))(1) == 1
+        with pytest.raises(KeyError):
+            policy(failing(1, KeyError("x")))(1)
+        assert policy.stats().attempts == 4
+
+    def test_retry_if_predicate(self):
+        clock = FakeClock()
+        policy = self.policy(clock, retry_if=lambda e: "transient" in str(e))
+        assert policy(failing(1, ValueError("transient")))(1) == 1
+        with pytest.raises(ValueError, match="fatal"):
+            policy(failing(1, ValueError("fatal")))(1)
+
+    def test_budget_caps_retries(self):
+        clock = FakeClock()
+        budget = RetryBudget(ratio=0.5, min_per_second=0.0, max_tokens=1.0, clock=clock)
+        policy = self.policy(clock, max_attempts=2, base_delay=0.0, budget=budget)
+        broken = policy(failing(100, ValueError()))
+        for _ in range(5):
+            with pytest.raises(ValueError):
+                broken(1)
+        # One starting token plus 0.5 per call: retries on calls 1, 3 and 5.
+        stats = policy.stats()
+        assert (stats.calls, stats.retries, stats.budget_denials) == (5, 3, 2)
+
+    def test_budget_refills_over_time(self):
+        clock = FakeClock()
+        budget = RetryBudget(ratio=0.0, min_per_second=1.0, max_tokens=2.0, clock=clock)
+        assert budget.try_spend() and budget.try_spend()
+        assert not budget.try_spend()
+        clock.now += 1.5
+        assert budget.try_spend()
+        assert budget.tokens == pytest.approx(0.5)
+        clock.now += 100
+        assert budget.tokens == 2.0
+
+    def test_budget_shared_between_policies(self):
+        clock = FakeClock()
+        budget = RetryBudget(ratio=0.0, min_per_second=0.0, max_tokens=1.0, clock=clock)
+        first = self.policy(clock, base_delay=0.0, budget=budget)
+        second = self.policy(clock, base_delay=0.0, budget=budget)
+        assert first(failing(1, ValueError()))(1) == 1
+        with pytest.raises(ValueError):
+            second(failing(1, ValueError()))(1)
+        assert second.stats().budget_denials == 1
+
+    def test_preserves_metadata(self):
+        @RetryPolicy(2)
+        def documented(x: int) -> int:
+            """Docs."""
+            return x
+
+        assert documented.__name__ == "documented"
+        assert documented.__doc__ == "Docs."
+
+    def test_async(self):
+        policy = RetryPolicy(3, base_delay=0.001)
+        attempts = [0]
+
+        @policy
+        async def fails_twice(x: int) -> int:
+            attempts[0] += 1
+            if attempts[0] < 3:
+                raise ValueError("not yet")
+            return x
+
+        assert asyncio.run(fails_twice(5)) == 5
+        assert policy.stats().retries == 2
+
+    def test_retry_accepts_policy(self):
+        clock = FakeClock()
+        policy = self.policy(clock, base_delay=1.0)
+        assert retry(policy=policy)(failing(1, ValueError()))(3) == 3
+        assert clock.sleeps == [1.0]
+
+    def test_clock_unused_without_deadline(self):
+        def no_clock() -> float:
+            raise AssertionError("clock read")
+
+        clock = FakeClock()
+        policy = RetryPolicy(3, base_delay=1.0, jitter=False, clock=no_clock, sleep=clock.sleep)
+        assert policy(failing(2, ValueError()))(4) == 4
+        assert clock.sleeps == [1.0, 2.0]
+
+    def test_plain_retry_skips_stats(self):
+        decorate = retry(3)
+        assert decorate(failing(2, ValueError()))(1) == 1
+        with pytest.raises(RuntimeError):
+            decorate.stats()
+
+    def test_last_error_is_raised(self):
+        errors = [ValueError("first"), ValueError("second")]
+
+        def func() -> None:
+            raise errors.pop(0)
+
+        with pytest.raises(ValueError, match="second") as info:
+            RetryPolicy(2, base_delay=0.0)(func)()
+        assert info.value.__context__ is None
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            RetryPolicy(0)
+        with pytest.raises(ValueError):
+            RetryPolicy(deadline=0)
+        with pytest.raises(ValueError):
+            retry()
+        with pytest.raises(ValueError):
+            retry(3, policy=RetryPolicy())
+
+
+class TestCircuitBreaker:
+    def guarded(self, clock: FakeClock, **options):
+        """A breaker-wrapped function that fails while outcome[0] is set."""
+        outcome: list[Exception | None] = [None]
+        calls = [0]
+
+        @circuit_breaker(clock=clock, **options)
+        def dependency(x: int) -> int:
+            calls[0] += 1
+            if outcome[0] is not None:
+                raise outcome[0]
+            return x
+
+        return dependency, outcome, calls
+
+    def trip(self, func, times: int) -> None:
+        for _ in range(times):
+            with pytest.raises(ConnectionError):
+                func(1)
+
+    def test_opens_after_consecutive_failures(self):
+        clock = FakeClock()
+        func, outcome, calls = self.guarded(clock, failure_threshold=3, reset_timeout=10.0)
+        outcome[0] = ConnectionError("down")
+        self.trip(func, 2)
+        assert func.breaker.state == "closed"
+        self.trip(func, 1)
+        assert func.breaker.state == "open"
+        with pytest.raises(CircuitOpenError) as info:
+            func(1)
+        assert info.value.retry_after == 10.0
+        assert calls[0] == 3
+
+    def test_success_resets_failure_count(self):
+        clock = FakeClock()
+        func, outcome, _ = self.guarded(clock, failure_threshold=2)
+        outcome[0] = ConnectionError("down")
+        self.trip(func, 1)
+        outcome[0] = None
+        assert func(5) == 5
+        outcome[0] = ConnectionError("down")
+        self.trip(func, 1)
+        assert func.breaker.state == "closed"
+
+    def test_half_open_probe_closes(self):
+        clock = FakeClock()
+        func, outcome, calls = self.guarded(clock, failure_threshold=1, reset_timeout=10.0)
+        outcome[0] = ConnectionError("down")
+        self.trip(func, 1)
+        clock.now += 9.9
+        with pytest.raises(CircuitOpenError):
+            func(1)
+        clock.now += 0.1
+        assert func.breaker.state == "half_open"
+        outcome[0] = None
+        assert func(7) == 7
+        assert func.breaker.state == "closed"
+        assert func.breaker.stats() == BreakerStats(
+            state="closed", failures=0, calls=2, rejected=1, opened=1, half_opened=1, closed=1
+        )
+
+    def test_half_open_failure_reopens(self):
+        clock = FakeClock()
+        func, outcome, _ = self.guarded(clock, failure_threshold=1, reset_timeout=10.0)
+        outcome[0] = ConnectionError("down")
+        self.trip(func, 1)
+        clock.now += 10
+        self.trip(func, 1)
+        assert func.breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            func(1)
+        assert func.breaker.stats().opened == 2
+
+    def test_half_open_limits_concurrent_probes(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=1.0, half_open_max_calls=2, clock=clock)
+        with pytest.raises(ZeroDivisionError):
+            breaker.call(lambda: 1 / 0)
+        clock.now += 1
+        inside = threading.Barrier(3, timeout=5)
+        leave = threading.Event()
+
+        def probe() -> str:
+            inside.wait()
+            leave.wait(5)
+            return "ok"
+
+        threads = [threading.Thread(target=breaker.call, args=(probe,)) for _ in range(2)]
+        for t in threads:
+            t.start()
+        inside.wait()
+        with pytest.raises(CircuitOpenError):
+            breaker.call(probe)
+        leave.set()
+        for t in threads:
+            t.join()
+        assert breaker.state == "closed"
+        assert breaker.stats().rejected == 1
+
+    def test_failure_on_filters_exceptions(self):
+        clock = FakeClock()
+        func, outcome, _ = self.guarded(clock, failure_threshold=1, failure_on=(ConnectionError,))
+        outcome[0] = KeyError("missing")
+        with pytest.raises(KeyError):
+            func(1)
+        assert func.breaker.state == "closed"
+
+    def test_ignored_exception_keeps_failure_count(self):
+        clock = FakeClock()
+        func, outcome, _ = self.guarded(clock, failure_threshold=2, failure_on=(ConnectionError,))
+        outcome[0] = ConnectionError("down")
+        self.trip(func, 1)
+        outcome[0] = KeyError("missing")
+        with pytest.raises(KeyError):
+            func(1)
+        assert func.breaker.stats().failures == 1
+        outcome[0] = ConnectionError("down")
+        self.trip(func, 1)
+        assert func.breaker.state == "open"
+
+    def test_ignored_exception_does_not_close_half_open(self):
+        clock = FakeClock()
+        func, outcome, _ = self.guarded(
+            clock, failure_threshold=1, reset_timeout=1.0, failure_on=(ConnectionError,)
+        )
+        outcome[0] = ConnectionError("down")
+        self.trip(func, 1)
+        clock.now += 1
+        outcome[0] = KeyError("missing")
+        with pytest.raises(KeyError):
+            func(1)
+        assert func.breaker.state == "half_open"
+        # The probe slot was freed, so the next call probes again.
+        outcome[0] = None
+        assert func(2) == 2
+        assert func.breaker.stats() == BreakerStats(
+            state="closed", failures=0, calls=3, rejected=0, opened=1, half_opened=1, closed=1
+        )
+
+    def test_stats_agree_with_state(self):
+        clock = FakeClock()
+        func, outcome, _ = self.guarded(clock, failure_threshold=1, reset_timeout=1.0)
+        outcome[0] = ConnectionError("down")
+        self.trip(func, 1)
+        clock.now += 1
+        stats = func.breaker.stats()
+        assert (stats.state, stats.half_opened) == ("half_open", 1)
+        assert func.breaker.stats().half_opened == 1
+
+    def test_late_result_from_previous_state_ignored(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, clock=clock)
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_failure() -> None:
+            started.set()
+            release.wait(5)
+            raise ConnectionError("late")
+
+        def run_slow() -> None:
+            with pytest.raises(ConnectionError):
+                breaker.call(slow_failure)
+
+        thread = threading.Thread(target=run_slow)
+        thread.start()
+        started.wait(5)
+        with pytest.raises(ZeroDivisionError):
+            breaker.call(lambda: 1 / 0)
+        breaker.reset()
+        release.set()
+        thread.join()
+        assert breaker.state == "closed"
+
+    def test_reset(self):
+        clock = FakeClock()
+        func, outcome, _ = self.guarded(clock, failure_threshold=1)
+        outcome[0] = ConnectionError("down")
+        self.trip(func, 1)
+        func.breaker.reset()
+        outcome[0] = None
+        assert func(3) == 3
+
+    def test_thread_safe_counts(self):
+        breaker = CircuitBreaker(failure_threshold=10**9)
+        failing_call = breaker(lambda: 1 / 0)
+
+        def hammer() -> None:
+            for _ in range(1000):
+                try:
+                    failing_call()
+                except ZeroDivisionError:
+                    pass
+
+        threads = [threading.Thread(target=hammer) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = breaker.stats()
+        assert (stats.calls, stats.failures) == (8000, 8000)
+
+    def test_async(self):
+        clock = FakeClock()
+        attempts = [0]
+
+        @circuit_breaker(failure_threshold=2, reset_timeout=5.0, clock=clock)
+        async def fetch(x: int) -> int:
+            attempts[0] += 1
+            raise ConnectionError("down")
+
+        async def main() -> None:
+            for _ in range(2):
+                with pytest.raises(ConnectionError):
+                    await fetch(1)
+            with pytest.raises(CircuitOpenError):
+                await fetch(1)
+
+        asyncio.run(main())
+        assert attempts[0] == 2
+        assert fetch.breaker.state == "open"
+
+    def test_async_cancelled_probe_frees_slot(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=1.0, clock=clock)
+        with pytest.raises(ZeroDivisionError):
+            breaker.call(lambda: 1 / 0)
+        clock.now += 1
+
+        @breaker
+        async def slow() -> str:
+            await asyncio.sleep(10)
+            return "late"
+
+        @breaker
+        async def fast() -> str:
+            return "ok"
+
+        async def main() -> str:
+            task = asyncio.ensure_future(slow())
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return await fast()
+
+        assert asyncio.run(main()) == "ok"
+        assert breaker.state == "closed"
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            circuit_breaker(failure_threshold=0)
+        with pytest.raises(ValueError):
+            CircuitBreaker(reset_timeout=-1)
+
+
 class TestCacheResult:
     def test_caches_results(self):
         call_count = [0]
@@ -119,6 +565,137 @@ class TestCacheResult:
         assert expensive(1) == 2
         assert call_count[0] == 2  # Called for each unique arg
 
+    def test_normalizes_keyword_and_default_args(self):
+        call_count = [0]
+
+        @cache_result
+        def add(a: int, b: int = 2) -> int:
+            call_count[0] += 1
+            return a + b
+
+        assert add(1, b=2) == 3
+        assert add(1, 2) == 3
+        assert add(1) == 3
+        assert add(a=1) == 3
+        assert call_count[0] == 1
+
+    def test_keyword_only_args(self):
+        call_count = [0]
+
+        @cache_result
+        def scale(x: int, *, factor: int = 1, offset: int = 0) -> int:
+            call_count[0] += 1
+            return x * factor + offset
+
+        assert scale(2, factor=3, offset=1) == 7
+        assert scale(2, offset=1, factor=3) == 7
+        assert scale(2) == 2
+        assert scale(2, factor=1) == 2
+        assert call_count[0] == 2
+
+    def test_cache_info_and_clear(self):
+        @cache_result
+        def square(n: int) -> int:
+            return n * n
+
+        square(2)
+        square(2)
+        square(3)
+        info = square.cache_info()
+        assert (info.hits, info.misses, info.maxsize, info.currsize) == (1, 2, None, 2)
+        square.cache_clear()
+        assert square.cache_info() == (0, 0, None, 0)
+
+    def test_maxsize_evicts_least_recently_used(self):
+        calls = []
+
+        @cache_result(maxsize=2)
+        def ident(n: int) -> int:
+            calls.append(n)
+            return n
+
+        ident(1)
+        ident(2)
+        ident(1)
+        ident(3)  # evicts 2
+        ident(1)
+        ident(2)
+        assert calls == [1, 2, 3, 2]
+        assert ident.cache_info().currsize == 2
+
+    def test_ttl(self):
+        now = [0.0]
+        calls = [0]
+
+        @cache_result(ttl=10, clock=lambda: now[0])
+        def value() -> int:
+            calls[0] += 1
+            return calls[0]
+
+        assert value() == 1
+        now[0] = 9.9
+        assert value() == 1
+        now[0] = 10.0
+        assert value() == 2
+
+    def test_exceptions_are_not_cached(self):
+        attempts = [0]
+
+        @cache_result
+        def flaky(n: int) -> int:
+            attempts[0] += 1
+            if attempts[0] == 1:
+                raise ValueError("first call fails")
+            return n
+
+        with pytest.raises(ValueError):
+            flaky(1)
+        assert flaky(1) == 1
+        assert flaky(1) == 1
+        assert attempts[0] == 2
+
+    def test_concurrent_misses_compute_once(self):
+        import threading
+
+        callers = 8
+        calls = [0]
+        arrived = threading.Semaphore(0)
+        overlapped = threading.Event()
+
+        @cache_result
+        def slow(n: int) -> int:
+            calls[0] += 1
+            # Block until every caller has started, then give the others time
+            # to reach the in-flight lookup before the result is ready.
+            for _ in range(callers):
+                if not arrived.acquire(timeout=5):
+                    return -1
+            overlapped.set()
+            time.sleep(0.05)
+            return n * 10
+
+        def call() -> None:
+            arrived.release()
+            results.append(slow(7))
+
+        results: list[int] = []
+        threads = [threading.Thread(target=call) for _ in range(callers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+
+        assert overlapped.is_set()
+        assert results == [70] * callers
+        assert calls[0] == 1
+        assert slow.cache_info().misses == 1
+
+    def test_rejects_bad_options(self):
+        with pytest.raises(ValueError):
+            cache_result(maxsize=0)
+        with pytest.raises(ValueError):
+            cache_result(ttl=-1)
+
 
 class TestWithUser:
     def test_valid_user(self, capsys):
@@ -156,6 +733,252 @@ class TestWithConnection:
 
         assert query("users", limit=5) == "SELECT * FROM users LIMIT 5"
 
+    def test_reuses_pooled_connection(self):
+        pool = ConnectionPool(lambda: Connection("fake://db"), max_size=2)
+        seen = []
+
+        @with_connection(pool=pool)
+        def query(conn: Connection) -> None:
+            seen.append(conn)
+
+        query()
+        query()
+        assert seen[0] is seen[1]
+        stats = pool.stats()
+        assert (stats.size, stats.in_use, stats.idle, stats.acquisitions) == (1, 0, 1, 2)
+
+    def test_releases_on_exception(self):
+        pool = ConnectionPool(lambda: Connection("fake://db"), max_size=1)
+
+        @with_connection(pool=pool, timeout=0)
+        def broken(conn: Connection) -> None:
+            raise KeyError("boom")
+
+        with pytest.raises(KeyError):
+            broken()
+        assert pool.stats().in_use == 0
+
+    def test_bare_decorator_uses_default_pool(self):
+        @with_connection
+        def query(conn: Connection) -> Connection:
+            return conn
+
+        assert query() is query()
+        assert get_default_pool().stats().in_use == 0
+
+
+class TestConnectionPool:
+    def make_pool(self, max_size=2, **kwargs):
+        created = []
+
+        def factory() -> Connection:
+            conn = Connection(f"fake://db/{len(created)}")
+            created.append(conn)
+            return conn
+
+        return ConnectionPool(factory, max_size=max_size, **kwargs), created
+
+    def test_bounded(self):
+        pool, created = self.make_pool(max_size=2)
+        a = pool.acquire()
+        b = pool.acquire()
+        assert a is not b
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0)
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.01)
+        pool.release(a)
+        assert pool.acquire(timeout=0) is a
+        assert len(created) == 2
+        stats = pool.stats()
+        assert stats.waits == 1  # timeout=0 fails without waiting
+        assert stats.wait_time >= 0.01
+
+    def test_try_acquire(self):
+        pool, _ = self.make_pool(max_size=1)
+        conn = pool.try_acquire()
+        assert conn is not None
+        assert pool.try_acquire() is None
+        pool.release(conn)
+        assert pool.try_acquire() is conn
+        stats = pool.stats()
+        assert (stats.acquisitions, stats.waits) == (2, 0)
+
+    def test_blocking_acquire_waits_for_release(self):
+        import threading
+
+        pool, _ = self.make_pool(max_size=1)
+        conn = pool.acquire()
+        threading.Timer(0.02, pool.release, args=(conn,)).start()
+        assert pool.acquire(timeout=2) is conn
+        assert pool.stats().waits == 1
+
+    def test_unhealthy_connection_replaced(self):
+        pool, created = self.make_pool(max_size=1)
+        conn = pool.acquire()
+        pool.release(conn)
+        conn.close()
+        fresh = pool.acquire(timeout=0)
+        assert fresh is not conn
+        assert len(created) == 2
+        assert pool.stats().size == 1
+
+    def test_custom_health_check(self):
+        pool, created = self.make_pool(max_size=1, health_check=lambda c: False)
+        pool.release(pool.acquire())
+        pool.acquire()
+        assert len(created) == 2
+
+    def test_health_check_error_frees_slot(self):
+        def check(conn: Connection) -> bool:
+            raise OSError("ping failed")
+
+        pool, created = self.make_pool(max_size=1, health_check=check)
+        conn = pool.acquire()
+        pool.release(conn)
+        with pytest.raises(OSError):
+            pool.acquire(timeout=0)
+        assert conn.closed
+        assert pool.stats().size == 0
+        assert pool.acquire(timeout=0) is not conn
+        assert len(created) == 2
+
+    def test_factory_failure_frees_slot(self):
+        calls = [0]
+
+        def factory() -> Connection:
+            calls[0] += 1
+            if calls[0] == 1:
+                raise OSError("connect failed")
+            return Connection("fake://db")
+
+        pool = ConnectionPool(factory, max_size=1)
+        with pytest.raises(OSError):
+            pool.acquire()
+        assert pool.acquire(timeout=0).url == "fake://db"
+
+    def test_release_foreign_connection(self):
+        pool, _ = self.make_pool()
+        with pytest.raises(ValueError):
+            pool.release(Connection("fake://other"))
+
+    def test_close(self):
+        pool, _ = self.make_pool()
+        idle = pool.acquire()
+        busy = pool.acquire()
+        pool.release(idle)
+        pool.close()
+        assert idle.closed
+        assert not busy.closed
+        pool.release(busy)
+        assert busy.closed
+        assert pool.stats().size == 0
+        with pytest.raises(RuntimeError):
+            pool.acquire()
+
+    def test_shared_across_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        pool, created = self.make_pool(max_size=3)
+
+        @with_connection(pool=pool, timeout=5)
+        def query(conn: Connection, n: int) -> int:
+            time.sleep(0.001)
+            return n
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            assert list(executor.map(query, range(100))) == list(range(100))
+        assert len(created) <= 3
+        stats = pool.stats()
+        assert stats.acquisitions == 100
+        assert stats.in_use == 0
+
+    def test_async_waits_without_blocking_loop(self):
+        pool, _ = self.make_pool(max_size=1)
+
+        @with_connection(pool=pool, timeout=2)
+        async def query(conn: Connection, n: int) -> int:
+            await asyncio.sleep(0.01)
+            return n
+
+        async def main() -> list[int]:
+            return await asyncio.gather(*(query(i) for i in range(4)))
+
+        assert asyncio.run(main()) == [0, 1, 2, 3]
+        assert pool.stats().in_use == 0
+
+    def test_async_wait_counted_once(self):
+        import threading
+
+        pool, _ = self.make_pool(max_size=1)
+        held = pool.acquire()
+
+        @with_connection(pool=pool, timeout=2)
+        async def query(conn: Connection) -> Connection:
+            return conn
+
+        threading.Timer(0.05, pool.release, args=(held,)).start()
+        assert asyncio.run(query()) is held
+        assert pool.stats().waits == 1
+
+    def test_async_opens_connection_off_loop(self):
+        opened_on = []
+
+        def factory() -> Connection:
+            opened_on.append(threading.current_thread())
+            return Connection("fake://db")
+
+        pool = ConnectionPool(factory, max_size=1)
+
+        @with_connection(pool=pool, timeout=0)
+        async def query(conn: Connection) -> Connection:
+            return conn
+
+        async def main() -> None:
+            conn = await query()
+            assert await query() is conn
+
+        asyncio.run(main())
+        assert opened_on and threading.main_thread() not in opened_on
+        pool.close()
+
+    def test_async_waiters_share_bounded_threads(self):
+        pool, _ = self.make_pool(max_size=2)
+        held = [pool.acquire(), pool.acquire()]
+
+        async def main() -> list[Connection]:
+            waiters = [asyncio.ensure_future(pool.acquire_async(timeout=2)) for _ in range(10)]
+            await asyncio.sleep(0.05)
+            workers = [t for t in threading.enumerate() if t.name.startswith("ConnectionPool")]
+            assert len(workers) <= 2
+            for conn in held:
+                pool.release(conn)
+            got = []
+            for waiter in asyncio.as_completed(waiters):
+                conn = await waiter
+                got.append(conn)
+                pool.release(conn)
+            return got
+
+        assert set(asyncio.run(main())) == set(held)
+        assert pool.stats().in_use == 0
+        pool.close()
+
+    def test_async_timeout_releases_late_connection(self):
+        pool, _ = self.make_pool(max_size=1)
+        held = pool.acquire()
+
+        async def main() -> None:
+            with pytest.raises(TimeoutError):
+                await pool.acquire_async(timeout=0.02)
+
+        asyncio.run(main())
+        pool.release(held)
+        time.sleep(0.05)
+        assert pool.stats().in_use == 0
+        assert pool.acquire(timeout=0) is held
+        pool.close()
+
 
 class TestValidateArgs:
     def test_valid_args(self):
@@ -253,3 +1076,180 @@ class TestRequireAuth:
         panel = Panel("bob", {"bob": "user"})
         with pytest.raises(PermissionError, match="does not have admin role"):
             panel.delete(123)
+
+
+class TestAsyncDecorators:
+    def test_log_call(self, capsys):
+        @log_call
+        async def greet(name: str) -> str:
+            return f"Hello, {name}"
+
+        assert asyncio.run(greet("Alice")) == "Hello, Alice"
+        assert "Calling greet" in capsys.readouterr().out
+
+    def test_time_it_measures_awaited_time(self):
+        @time_it
+        async def slow() -> int:
+            await asyncio.sleep(0.05)
+            return 42
+
+        result, elapsed = asyncio.run(slow())
+        assert result == 42
+        assert elapsed >= 0.04
+
+    def test_retry_with_backoff(self):
+        attempts = [0]
+
+        @retry(3, delay=0.01)
+        async def fails_twice(x: int) -> int:
+            attempts[0] += 1
+            if attempts[0] < 3:
+                raise ValueError("not yet")
+            return x
+
+        assert asyncio.run(fails_twice(42)) == 42
+        assert attempts[0] == 3
+
+    def test_retry_exhausts(self):
+        @retry(2)
+        async def always_fails() -> None:
+            raise RuntimeError("always")
+
+        with pytest.raises(RuntimeError, match="always"):
+            asyncio.run(always_fails())
+
+    def test_retry_backoff_does_not_block_loop(self):
+        ticks = []
+
+        @retry(2, delay=0.05)
+        async def fails_once(state: list[int]) -> str:
+            state.append(1)
+            if len(state) == 1:
+                raise ValueError("first")
+            return "ok"
+
+        async def ticker() -> None:
+            for _ in range(3):
+                ticks.append(1)
+                await asyncio.sleep(0.01)
+
+        async def main() -> str:
+            result, _ = await asyncio.gather(fails_once([]), ticker())
+            return result
+
+        assert asyncio.run(main()) == "ok"
+        assert len(ticks) == 3
+
+    def test_cache_result_caches_awaited_value(self):
+        calls = [0]
+
+        @cache_result
+        async def fetch(n: int) -> int:
+            calls[0] += 1
+            await asyncio.sleep(0)
+            return n * 2
+
+        async def main() -> list[int]:
+            return [await fetch(1), await fetch(1), await fetch(n=1)]
+
+        assert asyncio.run(main()) == [2, 2, 2]
+        assert calls[0] == 1
+
+    def test_cache_result_concurrent_awaits_share_computation(self):
+        calls = [0]
+
+        @cache_result
+        async def fetch(n: int) -> int:
+            calls[0] += 1
+            await asyncio.sleep(0.01)
+            return n
+
+        async def main() -> list[int]:
+            return await asyncio.gather(*(fetch(5) for _ in range(10)))
+
+        assert asyncio.run(main()) == [5] * 10
+        assert calls[0] == 1
+        assert fetch.cache_info().currsize == 1
+
+    def test_cache_result_cancelled_waiter_leaves_others(self):
+        calls = [0]
+
+        @cache_result
+        async def fetch(n: int) -> int:
+            calls[0] += 1
+            await asyncio.sleep(0.05)
+            return n
+
+        async def main() -> list[object]:
+            owner = asyncio.create_task(fetch(3))
+            await asyncio.sleep(0)
+            impatient = asyncio.wait_for(fetch(3), timeout=0.01)
+            return await asyncio.gather(owner, impatient, fetch(3), return_exceptions=True)
+
+        owner, impatient, other = asyncio.run(main())
+        assert owner == 3 and other == 3
+        assert isinstance(impatient, asyncio.TimeoutError)
+        assert calls[0] == 1
+
+    def test_cache_result_cancelled_owner_hands_over(self):
+        calls = [0]
+
+        @cache_result
+        async def fetch(n: int) -> int:
+            calls[0] += 1
+            await asyncio.sleep(0.02)
+            return n
+
+        async def main() -> list[object]:
+            owner = asyncio.create_task(fetch(4))
+            await asyncio.sleep(0)
+            waiter = asyncio.create_task(fetch(4))
+            await asyncio.sleep(0.005)
+            owner.cancel()
+            return await asyncio.gather(owner, waiter, return_exceptions=True)
+
+        owner, waiter = asyncio.run(main())
+        assert isinstance(owner, asyncio.CancelledError)
+        assert waiter == 4
+        assert calls[0] == 2
+
+    def test_with_connection(self):
+        @with_connection
+        async def query(conn: Connection, table: str) -> list[str]:
+            await asyncio.sleep(0)
+            return conn.execute(f"SELECT * FROM {table}")
+
+        assert asyncio.run(query("users")) == ["Result for: SELECT * FROM users"]
+
+    def test_validate_args(self):
+        @validate_args(lambda x: x > 0)
+        async def add(a: int, b: int) -> int:
+            return a + b
+
+        assert asyncio.run(add(1, 2)) == 3
+        with pytest.raises(ValueError, match="Validation failed"):
+            asyncio.run(add(-1, 2))
+
+    def test_transform_result(self):
+        @transform_result(str.upper)
+        async def greet(name: str) -> str:
+            return f"hello, {name}"
+
+        assert asyncio.run(greet("world")) == "HELLO, WORLD"
+
+    def test_wrappers_are_coroutine_functions(self):
+        import inspect
+
+        async def handler() -> int:
+            return 1
+
+        for decorated in (
+            log_call(handler),
+            time_it(handler),
+            retry(2)(handler),
+            cache_result(handler),
+            circuit_breaker()(handler),
+            validate_args(bool)(handler),
+            transform_result(str)(handler),
+        ):
+            assert inspect.iscoroutinefunction(decorated)
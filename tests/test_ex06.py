@@ -5,6 +5,7 @@ Run with: pytest tests/test_ex06.py -v
 """
 
 import pytest
+from typing import TypedDict
 from exercises.ex06_typeddict_and_guards import (
     distance_from_origin,
     translate_point,
@@ -23,6 +24,16 @@ from exercises.ex06_typeddict_and_guards import (
     is_video_message,
     get_message_preview,
     count_messages_by_type,
+    preview_many,
+    preview_handler,
+    MESSAGE_TYPES,
+    Point2DBatch,
+    compile_validator,
+    Employee,
+    UserProfile,
+    TextMessage,
+    ImageMessage,
+    VideoMessage,
 )
 
 
@@ -162,6 +173,109 @@ class TestTypeGuards:
         assert is_user_profile({"id": 1, "name": "A", "email": 123}) is False  # email wrong type
         assert is_user_profile({"id": 1, "name": "A", "age": "25"}) is False  # age wrong type
 
+    def test_guards_keep_their_signature(self):
+        assert is_image_message.__name__ == "is_image_message"
+        assert is_image_message.__doc__ == "Check if a message is an ImageMessage."
+        assert is_image_message(msg={"type": "image", "url": "http://x"}) is True
+        assert is_point2d(value={"x": 1, "y": "2"}) is False
+
+
+class Node(TypedDict):
+    value: int
+    children: "list[Node]"
+
+
+class LinkedNode(TypedDict):
+    value: int
+    next: "LinkedNode | None"
+
+
+class TestCompileValidator:
+    def employee(self):
+        return {
+            "id": 1,
+            "name": "Alice",
+            "company": {
+                "name": "Acme",
+                "address": {"street": "1 Main", "city": "Boston", "country": "USA"},
+            },
+        }
+
+    def test_cached_per_type(self):
+        assert compile_validator(UserProfile) is compile_validator(UserProfile)
+
+    def test_nested_typeddicts(self):
+        validate = compile_validator(Employee)
+        emp = self.employee()
+        assert validate(emp) is True
+        assert validate({**emp, "remote": True}) is True
+        assert validate({**emp, "remote": 1}) is False
+        emp["company"]["address"]["city"] = None
+        assert validate(emp) is False
+        del emp["company"]["address"]
+        assert validate(emp) is False
+
+    def test_literal_discriminator(self):
+        validate = compile_validator(TextMessage)
+        assert validate({"type": "text", "content": "hi"}) is True
+        assert validate({"type": "image", "content": "hi"}) is False
+        assert validate({"type": ["text"], "content": "hi"}) is False
+
+    def test_missing_key_that_accepts_none(self):
+        from typing import Any
+
+        class Nullable(TypedDict):
+            parent: int | None
+            data: Any
+
+        validate = compile_validator(Nullable)
+        assert validate({"parent": None, "data": None}) is True
+        assert validate({"data": 1}) is False
+        assert validate({"parent": 1}) is False
+
+    def test_bool_is_not_int(self):
+        assert compile_validator(UserProfile)({"id": True, "name": "A"}) is False
+
+    def test_extra_keys_allowed(self):
+        assert compile_validator(UserProfile)({"id": 1, "name": "A", "extra": object()}) is True
+
+    def test_containers_unions_and_total_false(self):
+        from typing import Literal, Required
+
+        class Tagged(TypedDict, total=False):
+            id: Required[int]
+            tags: list[str]
+            scores: dict[str, float]
+            parent: "int | None"
+            mode: Literal["a", "b", 3]
+
+        validate = compile_validator(Tagged)
+        assert validate({"id": 1}) is True
+        assert validate({"tags": []}) is False
+        assert validate({"id": 1, "tags": ["x", "y"], "scores": {"a": 1, "b": 2.5}}) is True
+        assert validate({"id": 1, "tags": ["x", 2]}) is False
+        assert validate({"id": 1, "scores": {"a": "1"}}) is False
+        assert validate({"id": 1, "parent": None}) is True
+        assert validate({"id": 1, "parent": "p"}) is False
+        assert validate({"id": 1, "mode": "b"}) is True
+        assert validate({"id": 1, "mode": 3}) is True
+        assert validate({"id": 1, "mode": "c"}) is False
+
+    def test_self_referencing_typeddict(self):
+        validate = compile_validator(Node)
+        assert validate({"value": 1, "children": [{"value": 2, "children": []}]}) is True
+        assert validate({"value": 1, "children": [{"value": "2", "children": []}]}) is False
+
+    def test_self_referencing_optional_field(self):
+        validate = compile_validator(LinkedNode)
+        assert validate({"value": 1, "next": {"value": 2, "next": None}}) is True
+        assert validate({"value": 1, "next": {"value": "2", "next": None}}) is False
+        assert validate({"value": 1}) is False
+
+    def test_rejects_non_typeddict(self):
+        with pytest.raises(TypeError):
+            compile_validator(dict)
+
 
 class TestTypeGuardUsage:
     def test_process_points(self):
@@ -192,6 +306,100 @@ class TestTypeGuardUsage:
         assert safe_get_distance([3, 4]) is None
 
 
+BACKENDS = [
+    pytest.param(False, id="python"),
+    pytest.param(True, id="numpy"),
+]
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+class TestPoint2DBatch:
+    @pytest.fixture(autouse=True)
+    def _require_backend(self, use_numpy):
+        if use_numpy:
+            pytest.importorskip("numpy")
+
+    def points(self):
+        import random
+
+        rng = random.Random(0)
+        return [{"x": rng.randint(-10**6, 10**6), "y": rng.randint(-10**6, 10**6)} for _ in range(500)]
+
+    def test_distances_match_per_dict(self, use_numpy):
+        points = self.points()
+        batch = Point2DBatch.from_points(points)
+        assert list(batch.distances(use_numpy)) == [distance_from_origin(p) for p in points]
+
+    def test_translate_matches_per_dict(self, use_numpy):
+        points = self.points()
+        batch = Point2DBatch.from_points(points)
+        moved = batch.translate(10, -20, use_numpy)
+        assert moved.to_points() == [translate_point(p, 10, -20) for p in points]
+        assert batch.to_points() == points  # original unchanged
+
+    def test_translate_overflow_raises(self, use_numpy):
+        batch = Point2DBatch.from_points([{"x": 2**63 - 10, "y": -(2**63) + 10}, {"x": 0, "y": 0}])
+        assert batch.translate(9, -10, use_numpy).to_points()[0] == {"x": 2**63 - 1, "y": -(2**63)}
+        with pytest.raises(OverflowError):
+            batch.translate(10, 0, use_numpy)
+        with pytest.raises(OverflowError):
+            batch.translate(0, -11, use_numpy)
+        with pytest.raises(OverflowError):
+            batch.translate(2**64, 0, use_numpy)
+
+    def test_empty(self, use_numpy):
+        batch = Point2DBatch()
+        assert len(batch.distances(use_numpy)) == 0
+        assert len(batch.translate(1, 1, use_numpy)) == 0
+
+
+class TestPoint2DBatchConversion:
+    def test_round_trip(self):
+        points = [{"x": 1, "y": 2}, {"x": -3, "y": 4}]
+        batch = Point2DBatch.from_points(points)
+        assert len(batch) == 2
+        assert batch[1] == {"x": -3, "y": 4}
+        assert list(batch) == points
+        assert batch.to_points() == points
+
+    def test_invalid_point_rejected(self):
+        with pytest.raises(ValueError, match="index 1"):
+            Point2DBatch.from_points([{"x": 1, "y": 2}, {"x": "1", "y": 2}])
+
+    def test_skip_invalid(self):
+        data = [
+            {"x": 1, "y": 2},
+            {"x": 3},
+            {"x": 4, "y": 5},
+            "not a point",
+            {"x": "6", "y": 7},
+            {"x": True, "y": 1},
+            {"x": 2**63, "y": 1},
+            {"x": 1, "y": -(2**63) - 1},
+        ]
+        batch = Point2DBatch.from_points(data, skip_invalid=True)
+        assert batch.to_points() == [{"x": 1, "y": 2}, {"x": 4, "y": 5}]
+
+    def test_out_of_range_point_rejected(self):
+        with pytest.raises(ValueError, match="index 0"):
+            Point2DBatch.from_points([{"x": 2**63, "y": 0}])
+
+    def test_rejects_mismatched_columns(self):
+        from array import array
+
+        with pytest.raises(ValueError):
+            Point2DBatch(array("q", [1]), array("q"))
+        with pytest.raises(TypeError):
+            Point2DBatch(array("d", [1.0]), array("d", [1.0]))
+
+    def test_as_numpy_is_zero_copy(self):
+        pytest.importorskip("numpy")
+        batch = Point2DBatch.from_points([{"x": 1, "y": 2}])
+        x, _ = batch.as_numpy()
+        batch.xs[0] = 99
+        assert x[0] == 99
+
+
 class TestDiscriminatedUnions:
     def test_is_text_message(self):
         assert is_text_message({"type": "text", "content": "hello"}) is True
@@ -241,3 +449,70 @@ class TestDiscriminatedUnions:
     def test_count_messages_empty(self):
         result = count_messages_by_type([])
         assert result == {"text": 0, "image": 0, "video": 0}
+
+
+class TestMessageDispatch:
+    def test_message_types_registry(self):
+        assert MESSAGE_TYPES == {
+            "text": TextMessage,
+            "image": ImageMessage,
+            "video": VideoMessage,
+        }
+
+    def test_unknown_type_preview(self):
+        with pytest.raises(ValueError, match="audio"):
+            get_message_preview({"type": "audio", "url": "http://..."})
+
+    def test_unknown_type_handler(self):
+        with pytest.raises(ValueError, match="audio"):
+            preview_handler("audio")
+
+    def test_count_streams_generator(self):
+        consumed = 0
+
+        def messages():
+            nonlocal consumed
+            for i in range(1000):
+                consumed += 1
+                yield {"type": ("text", "image", "video")[i % 3], "url": "u", "content": "c", "duration": 1}
+
+        result = count_messages_by_type(messages())
+        assert consumed == 1000
+        assert result == {"text": 334, "image": 333, "video": 333}
+
+    def test_count_unknown_type(self):
+        with pytest.raises(ValueError, match="audio"):
+            count_messages_by_type([{"type": "text", "content": "hi"}, {"type": "audio"}])
+
+    def test_missing_type_raises_value_error(self):
+        message = {"content": "no type"}
+        with pytest.raises(ValueError, match="None"):
+            get_message_preview(message)
+        with pytest.raises(ValueError, match="None"):
+            count_messages_by_type([{"type": "text", "content": "hi"}, message])
+
+    def test_count_keeps_errors_from_the_stream(self):
+        def broken():
+            yield {"type": "text", "content": "hi"}
+            raise KeyError("upstream")
+
+        with pytest.raises(KeyError, match="upstream"):
+            count_messages_by_type(broken())
+
+    def test_preview_many_is_lazy(self):
+        def messages():
+            yield {"type": "text", "content": "first"}
+            yield {"type": "audio"}
+
+        previews = preview_many(messages())
+        assert next(previews) == "Text: first"
+        with pytest.raises(ValueError):
+            next(previews)
+
+    def test_preview_many_matches_single(self):
+        messages = [
+            {"type": "text", "content": "hi"},
+            {"type": "image", "url": "http://..."},
+            {"type": "video", "url": "http://...", "duration": 61},
+        ]
+        assert list(preview_many(messages)) == [get_message_preview(m) for m in messages]
@@ -106,6 +106,140 @@ class TestDatabasePool:
         pool.release(conn)
         assert pool.current_size == 0
 
+    def test_released_connections_are_reused(self):
+        pool = DatabasePool("postgres://localhost/db", max_size=2)
+        conn1 = pool.acquire()
+        conn2 = pool.acquire()
+        pool.release(conn1)
+        conn3 = pool.acquire()
+        assert conn3 == conn1
+        assert {conn2, conn3} == {"conn_1", "conn_2"}
+
+    def test_release_unknown_connection_ignored(self):
+        pool = DatabasePool("postgres://localhost/db", max_size=2)
+        pool.acquire()
+        pool.release("conn_99")
+        assert pool.current_size == 1
+
+    def test_acquire_timeout_expires(self):
+        pool = DatabasePool("postgres://localhost/db", max_size=1)
+        pool.acquire()
+        assert pool.acquire(timeout=0.01) is None
+        assert pool.current_size == 1
+
+    def test_blocking_acquire_gets_released_connection(self):
+        import threading
+
+        pool = DatabasePool("postgres://localhost/db", max_size=1)
+        conn = pool.acquire()
+        threading.Timer(0.02, pool.release, args=(conn,)).start()
+        assert pool.acquire(timeout=2) == conn
+        assert pool.current_size == 1
+
+    def test_threads_share_pool(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        pool = DatabasePool("postgres://localhost/db", max_size=3)
+        in_use = set()
+
+        def work(_: int) -> bool:
+            with pool.connection(timeout=5) as conn:
+                assert conn not in in_use
+                in_use.add(conn)
+                in_use.discard(conn)
+            return True
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            assert all(executor.map(work, range(200)))
+        assert pool.current_size == 0
+
+    def test_context_manager_releases_on_error(self):
+        pool = DatabasePool("postgres://localhost/db", max_size=1)
+        with pytest.raises(KeyError):
+            with pool.connection() as conn:
+                assert conn == "conn_1"
+                raise KeyError("boom")
+        assert pool.current_size == 0
+
+    def test_context_manager_timeout(self):
+        pool = DatabasePool("postgres://localhost/db", max_size=1)
+        pool.acquire()
+        with pytest.raises(TimeoutError):
+            with pool.connection(timeout=0):
+                pass
+
+    def test_async_acquire(self):
+        import asyncio
+
+        pool = DatabasePool("postgres://localhost/db", max_size=2)
+        order = []
+
+        async def work(n: int) -> None:
+            async with pool.connection_async(timeout=2) as conn:
+                order.append(conn)
+                await asyncio.sleep(0.01)
+
+        async def main() -> None:
+            await asyncio.gather(*(work(n) for n in range(6)))
+
+        asyncio.run(main())
+        assert len(order) == 6
+        assert set(order) == {"conn_1", "conn_2"}
+        assert pool.current_size == 0
+
+    def test_async_acquire_timeout(self):
+        import asyncio
+
+        pool = DatabasePool("postgres://localhost/db", max_size=1)
+        pool.acquire()
+        assert asyncio.run(pool.acquire_async(timeout=0.01)) is None
+
+    def test_cancelled_async_waiter_is_skipped(self):
+        import asyncio
+
+        pool = DatabasePool("postgres://localhost/db", max_size=1)
+
+        async def main() -> str | None:
+            held = await pool.acquire_async()
+            doomed = asyncio.ensure_future(pool.acquire_async())
+            await asyncio.sleep(0)
+            doomed.cancel()
+            await asyncio.sleep(0)
+            pool.release(held)
+            return await pool.acquire_async(timeout=0)
+
+        assert asyncio.run(main()) == "conn_1"
+        assert pool.current_size == 1
+
+    def test_timed_out_waiters_are_removed(self):
+        pool = DatabasePool("postgres://localhost/db", max_size=1)
+        held = pool.acquire()
+        for _ in range(20):
+            assert pool.acquire(timeout=0.001) is None
+        assert len(pool._waiters) == 0
+        pool.release(held)
+        assert pool.current_size == 0
+        assert pool.acquire(timeout=0) == held
+
+    def test_abandoned_async_waiters_are_removed(self):
+        import asyncio
+
+        pool = DatabasePool("postgres://localhost/db", max_size=1)
+
+        async def main() -> str | None:
+            held = await pool.acquire_async()
+            assert await pool.acquire_async(timeout=0.001) is None
+            doomed = asyncio.ensure_future(pool.acquire_async())
+            await asyncio.sleep(0)
+            doomed.cancel()
+            await asyncio.gather(doomed, return_exceptions=True)
+            assert len(pool._waiters) == 0
+            pool.release(held)
+            return await pool.acquire_async(timeout=0)
+
+        assert asyncio.run(main()) == "conn_1"
+        assert pool.current_size == 1
+
 
 class TestAppSettings:
     def test_settings_created(self):
@@ -250,6 +384,10 @@ class TestQueryBuilder:
 
 
 class TestShapeHierarchy:
+    def test_no_instance_dict(self):
+        for shape in (Shape(0, 0), Circle(0, 0, radius=2), Rectangle(0, 0, width=1, height=2)):
+            assert not hasattr(shape, "__dict__")
+
     def test_shape_at_origin(self):
         shape = Shape.at_origin()
         assert shape.x == 0
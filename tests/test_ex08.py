@@ -16,6 +16,9 @@ from exercises.ex08_newtypes_aliases_annotated import (
     register_callback,
     calculate_area,
     get_layer_polygons,
+    PackedPolygons,
+    calculate_layer_areas,
+    calculate_layer_totals,
     set_age,
     set_username,
     set_discount,
@@ -136,6 +139,74 @@ class TestTypeAlias:
         assert missing == []
 
 
+def _random_polygons(count, seed=0):
+    import random
+
+    rng = random.Random(seed)
+    return [
+        [(rng.uniform(-100, 100), rng.uniform(-100, 100)) for _ in range(rng.randrange(0, 12))]
+        for _ in range(count)
+    ]
+
+
+BACKENDS = [
+    pytest.param(False, id="python"),
+    pytest.param(True, id="numpy"),
+]
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+class TestPackedPolygons:
+    @pytest.fixture(autouse=True)
+    def _require_backend(self, use_numpy):
+        if use_numpy:
+            pytest.importorskip("numpy")
+
+    def test_matches_scalar_area(self, use_numpy):
+        polygons = _random_polygons(300)
+        packed = PackedPolygons.from_polygons(polygons)
+        expected = [calculate_area(p) for p in polygons]
+        assert packed.areas(use_numpy) == pytest.approx(expected, rel=1e-9, abs=1e-9)
+
+    def test_known_shapes(self, use_numpy):
+        packed = PackedPolygons.from_polygons([
+            [(0.0, 0.0), (4.0, 0.0), (0.0, 3.0)],
+            [],
+            [(1.0, 1.0)],
+            [(0.0, 0.0), (1.0, 1.0)],
+            [(0.0, 0.0), (2.0, 0.0), (2.0, 2.0), (0.0, 2.0)],
+        ])
+        assert len(packed) == 5
+        assert packed.areas(use_numpy) == pytest.approx([6.0, 0.0, 0.0, 0.0, 4.0])
+
+    def test_empty(self, use_numpy):
+        assert PackedPolygons.from_polygons([]).areas(use_numpy) == []
+
+    def test_layer_areas_and_totals(self, use_numpy):
+        layers = {
+            "foreground": [[(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)], [(0.0, 0.0), (4.0, 0.0), (0.0, 3.0)]],
+            "empty": [],
+            "background": [[(0.0, 0.0), (10.0, 0.0), (10.0, 10.0), (0.0, 10.0)]],
+        }
+        areas = calculate_layer_areas(layers, use_numpy)
+        assert areas["foreground"] == pytest.approx([0.5, 6.0])
+        assert areas["empty"] == []
+        assert areas["background"] == pytest.approx([100.0])
+
+        totals = calculate_layer_totals(layers, use_numpy)
+        assert totals == pytest.approx({"foreground": 6.5, "empty": 0.0, "background": 100.0})
+
+
+class TestPackedPolygonsValidation:
+    def test_rejects_bad_offsets(self):
+        from array import array
+
+        with pytest.raises(ValueError):
+            PackedPolygons(array("d", [0.0]), array("d", [0.0]), array("q", [0, 2]))
+        with pytest.raises(ValueError):
+            PackedPolygons(array("d", [0.0]), array("d", []), array("q", [0, 1]))
+
+
 class TestAnnotated:
     def test_set_age_valid(self):
         assert set_age(25) == 25